@@ -1 +0,0 @@
-from . import server as server
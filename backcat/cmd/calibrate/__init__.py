@@ -0,0 +1 @@
+from . import passwords as passwords
@@ -0,0 +1,3 @@
+from backcat.cmd.calibrate import passwords
+
+passwords.main()
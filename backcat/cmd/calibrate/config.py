@@ -0,0 +1,41 @@
+from typing import ClassVar, override
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict, TomlConfigSettingsSource
+
+from backcat import configs
+
+
+class CalibrateConfig(BaseSettings):
+    """Sections of the server config the calibration needs, read from the same env, .env and config.toml"""
+
+    passwords: configs.Passwords = Field(default_factory=configs.Passwords)
+
+    # config loading options, same as the server ones
+    model_config: ClassVar[SettingsConfigDict] = SettingsConfigDict(
+        env_prefix="backcat_",
+        case_sensitive=False,
+        env_nested_delimiter="__",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        toml_file="config.toml",
+    )
+
+    @classmethod
+    @override
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,  # passed from code
+            env_settings,  # loaded from active env variable
+            dotenv_settings,  # loaded from .env file
+            TomlConfigSettingsSource(settings_cls),  # loaded from toml config
+            file_secret_settings,  # other file sources
+        )
@@ -0,0 +1,89 @@
+"""Pick argon2 parameters that make one password hash take about `--target` milliseconds on this machine.
+
+Memory is what makes argon2 expensive to crack on GPUs, so it starts at `--max-memory` and is halved only while a
+single iteration already takes longer than the target, iterations fill the rest of the budget. Run it on the
+production hardware and put the printed section into config.toml. Hashes made with the previous parameters are
+upgraded on the next sign-in of their users (`passwords.rehash`), nobody has to reset their password.
+The current parameters come from the `passwords` section of config.toml / BACKCAT_PASSWORDS__* env, nothing else
+of the server config is needed, so it runs on a bare box as well:
+
+    uv run python -m backcat.cmd.calibrate --target 50 --max-memory 65536 --parallelism 4
+"""
+
+import argparse
+import statistics
+import time
+
+from argon2 import PasswordHasher
+
+from backcat import configs
+from backcat.cmd.calibrate.config import CalibrateConfig
+
+MIN_MEMORY = 8192
+"""memory is not halved below this many KiB, weaker hashes should rather take longer"""
+
+PASSWORD = "calibration-password"
+
+config = CalibrateConfig()
+
+
+def measure(params: configs.passwords.Argon2, rounds: int) -> float:
+    """Median time of one hash in seconds"""
+    hasher = PasswordHasher(**params.model_dump())
+    hasher.hash(PASSWORD)  # warm up, the first hash maps the memory in
+
+    timings: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append(time.perf_counter() - started)
+
+    return statistics.median(timings)
+
+
+def calibrate(target: float, max_memory: int, parallelism: int, rounds: int) -> tuple[configs.passwords.Argon2, float]:
+    """Strongest parameters within `target` seconds and the time they take"""
+    params = config.passwords.argon2.model_copy(
+        update={"time_cost": 1, "memory_cost": max_memory, "parallelism": parallelism}
+    )
+    elapsed = measure(params, rounds)
+    while elapsed > target and params.memory_cost // 2 >= max(MIN_MEMORY, 8 * parallelism):
+        params.memory_cost //= 2
+        elapsed = measure(params, rounds)
+
+    # hashing time grows about linearly with the iterations, the estimate is checked below
+    params.time_cost = max(1, int(target / elapsed))
+    elapsed = measure(params, rounds)
+    while elapsed > target and params.time_cost > 1:
+        params.time_cost -= 1
+        elapsed = measure(params, rounds)
+
+    return params, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", type=float, default=50.0, help="target time of one hash in milliseconds")
+    parser.add_argument("--max-memory", type=int, default=65536, help="most memory one hash may use in KiB")
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=config.passwords.argon2.parallelism,
+        help="argon2 lanes, threads used by one hash",
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="hashes measured per candidate")
+    args = parser.parse_args()
+
+    current = measure(config.passwords.argon2, args.rounds)
+    params, elapsed = calibrate(args.target / 1000, args.max_memory, args.parallelism, args.rounds)
+
+    print(f"configured: {config.passwords.argon2.model_dump()} takes {current * 1000:.1f} ms")
+    print(f"calibrated: {params.model_dump()} takes {elapsed * 1000:.1f} ms")
+    print(
+        f"a worker computes up to {config.passwords.workers} hashes at once "
+        f"(passwords.workers), about {config.passwords.workers / elapsed:.0f} sign-ins/s if the cores allow it"
+    )
+    print()
+    print("[passwords.argon2]")
+    for name, value in params.model_dump().items():
+        print(f"{name} = {value}")
@@ -1 +1,2 @@
+from . import extra as extra
 from . import v1 as v1
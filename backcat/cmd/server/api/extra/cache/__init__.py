@@ -0,0 +1 @@
+from .ctrl import Controller as Controller
@@ -0,0 +1,134 @@
+import os
+from datetime import UTC, datetime
+from typing import Annotated
+
+import litestar
+from dishka.integrations.litestar import FromDishka, inject
+from litestar.exceptions import NotFoundException
+from litestar.params import Parameter
+
+from backcat import services
+from backcat.cmd.server.api.extra.cache import dto
+from backcat.services.cache import codec, core, registry
+
+
+class Controller(litestar.Controller):
+    path = "/cache"
+    tags = ["cache"]
+
+    @litestar.get("/hot-keys")
+    @inject
+    async def hot_keys(self, cache: FromDishka[services.Cache]) -> dto.HotKeysDTO:
+        # counters are kept per worker, so the answer covers the worker that served the request only
+        return dto.HotKeysDTO(
+            worker=os.getpid(),
+            keyspaces={
+                keyspace: [dto.HotKeyDTO(key=key, reads=reads) for key, reads in top]
+                for keyspace, top in cache.hot_keys().items()
+            },
+        )
+
+    @litestar.get("/local")
+    @inject
+    async def local(self, cache: FromDishka[services.Cache]) -> dto.LocalDTO:
+        # same as hot keys, the in-process tier belongs to the worker that served the request
+        hot_keys = cache.hot_keys()
+        return dto.LocalDTO(
+            worker=os.getpid(),
+            keyspaces={
+                keyspace: dto.LocalKeyspaceDTO(
+                    entries=stats.entries,
+                    bytes=stats.bytes,
+                    max_size=stats.max_size,
+                    ttl=stats.ttl,
+                    promoted=stats.promoted,
+                    hot_keys=[dto.HotKeyDTO(key=key, reads=reads) for key, reads in hot_keys.get(keyspace, [])],
+                )
+                for keyspace, stats in cache.local_stats().items()
+            },
+        )
+
+    @litestar.get("/keyspaces")
+    @inject
+    async def keyspaces(
+        self,
+        cache: FromDishka[services.Cache],
+        sample: Annotated[int, Parameter(ge=1, le=10_000)] = 100,
+    ) -> dto.KeyspacesDTO:
+        usage = await cache.usage(sample=sample)
+        for name in registry.KEYSPACES:
+            usage.setdefault(name, core.Usage())
+
+        keyspaces = []
+        for name, stats in sorted(usage.items()):
+            ks = registry.KEYSPACES.get(name)
+            keyspaces.append(
+                dto.KeyspaceDTO(
+                    name=name,
+                    registered=ks is not None,
+                    type=ks.t.__name__ if ks is not None and ks.t is not None else None,
+                    generation=cache.generation(ks) if ks is not None else None,
+                    keys=stats.keys,
+                    sampled=stats.sampled,
+                    memory=stats.memory,
+                )
+            )
+
+        return dto.KeyspacesDTO(keyspaces=keyspaces)
+
+    @litestar.get("/keyspaces/{keyspace:str}/keys/{key:str}")
+    @inject
+    async def read_key(self, keyspace: str, key: str, cache: FromDishka[services.Cache]) -> dto.EntryDTO:
+        cache_key = self._key(keyspace, key)
+        (data,) = await cache.peek_many([cache_key])
+        if data is None:
+            raise NotFoundException(detail="key not found")
+
+        ttl = await cache.ttl(cache_key)
+        entry = dto.EntryDTO(
+            key=cache_key.as_str(),
+            size=len(data),
+            ttl=ttl.total_seconds() if ttl is not None else None,
+            tombstone=codec.is_tombstone(data),
+            codec=None,
+            compressed=False,
+            fresh_until=None,
+            value=None,
+            error=None,
+        )
+        if entry.tombstone:
+            return entry
+
+        try:
+            envelope = codec.Envelope.unpack(data)
+            entry.codec = codec.CODECS[envelope.codec].name if envelope.codec in codec.CODECS else None
+            entry.compressed = envelope.flags & codec.Envelope.FLAG_COMPRESSED != 0
+            if envelope.fresh_until is not None:
+                entry.fresh_until = datetime.fromtimestamp(envelope.fresh_until, UTC)
+            entry.value = codec.decode(data, None)
+        except Exception as e:
+            entry.error = str(e)
+
+        return entry
+
+    @litestar.delete("/keyspaces/{keyspace:str}/keys/{key:str}")
+    @inject
+    async def evict_key(self, keyspace: str, key: str, cache: FromDishka[services.Cache]) -> None:
+        await cache.invalidate(self._key(keyspace, key), silent=False)
+
+    @litestar.post("/keyspaces/{keyspace:str}/bump", status_code=200)
+    @inject
+    async def bump(self, keyspace: str, cache: FromDishka[services.Cache]) -> dto.GenerationDTO:
+        ks = registry.KEYSPACES.get(keyspace)
+        if ks is None:
+            raise NotFoundException(detail="keyspace not found")
+
+        return dto.GenerationDTO(keyspace=ks.name, generation=await cache.bump(ks))
+
+    def _key(self, keyspace: str, key: str) -> services.Key:
+        # keys are addressed by their path within the keyspace, segments are separated by colons as in redis
+        ks = registry.KEYSPACES.get(keyspace)
+        if ks is None:
+            raise NotFoundException(detail="keyspace not found")
+
+        return ks.key(*key.split(":"))
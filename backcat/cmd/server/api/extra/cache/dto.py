@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class HotKeyDTO(BaseModel):
+    key: str
+    reads: int
+
+
+class HotKeysDTO(BaseModel):
+    worker: int
+    keyspaces: dict[str, list[HotKeyDTO]]
+
+
+class KeyspaceDTO(BaseModel):
+    name: str
+    registered: bool
+    type: str | None
+    generation: int | None
+    keys: int
+    sampled: int
+    memory: int
+
+
+class KeyspacesDTO(BaseModel):
+    keyspaces: list[KeyspaceDTO]
+
+
+class EntryDTO(BaseModel):
+    key: str
+    size: int
+    ttl: float | None
+    tombstone: bool
+    codec: str | None
+    compressed: bool
+    fresh_until: datetime | None
+    value: dict[str, Any] | None
+    error: str | None
+
+
+class GenerationDTO(BaseModel):
+    keyspace: str
+    generation: int
+
+
+class LocalKeyspaceDTO(BaseModel):
+    entries: int
+    bytes: int
+    max_size: int
+    ttl: float
+    promoted: bool
+    hot_keys: list[HotKeyDTO]
+
+
+class LocalDTO(BaseModel):
+    worker: int
+    keyspaces: dict[str, LocalKeyspaceDTO]
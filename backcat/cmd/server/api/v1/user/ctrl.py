@@ -24,6 +24,7 @@ class Controller(litestar.Controller):
         data: Annotated[DTOData[domain.User], Body(media_type=RequestEncodingType.URL_ENCODED)],
         oauth2: FromDishka[OAuth2PasswordBearerAuth[domain.User]],
         user_repo: FromDishka[services.UserRepo],
+        principals: FromDishka[services.Principals],
     ) -> litestar.Response[OAuth2Login]:
         """OAuth2 compliant /login endpoint"""
         signin = data.as_builtins()
@@ -32,6 +33,7 @@ class Controller(litestar.Controller):
             identifier=user.id.hex,
             token_issuer="backcat",
             token_audience="backcat",
+            token_extras=await principals.claims(user),
         )
 
     @litestar.post("/oauth2/refresh", dto=dto.Oauth2TokenRequest, return_dto=None)
@@ -41,6 +43,7 @@ class Controller(litestar.Controller):
         request: litestar.Request[domain.User, Any, Any],
         oauth2: FromDishka[OAuth2PasswordBearerAuth[domain.User]],
         user_repo: FromDishka[services.UserRepo],
+        principals: FromDishka[services.Principals],
     ) -> litestar.Response[Token]:
         """OAuth2 compliant /refresh endpoint"""
         user = await user_repo.read_user(request.user.id)
@@ -50,6 +53,7 @@ class Controller(litestar.Controller):
             identifier=user.id.hex,
             token_issuer="backcat",
             token_audience="backcat",
+            token_extras=await principals.claims(user),
         )
 
     @litestar.post("/sign-up", dto=dto.SignUpUserRequest, return_dto=dto.SignUpUserResponse)
@@ -59,6 +63,7 @@ class Controller(litestar.Controller):
         data: DTOData[domain.User],
         oauth2: FromDishka[OAuth2PasswordBearerAuth[domain.User]],
         user_repo: FromDishka[services.UserRepo],
+        principals: FromDishka[services.Principals],
     ) -> litestar.Response[domain.User]:
         """Custom /sign-up endpoint"""
         user = await user_repo.create_user(data.create_instance(**domain.User.new_defaults_kwargs()))
@@ -67,6 +72,7 @@ class Controller(litestar.Controller):
             response_body=user,
             token_issuer="backcat",
             token_audience="backcat",
+            token_extras=await principals.claims(user),
         )
 
     @litestar.post("/sign-in", dto=dto.SignInUserRequest, return_dto=dto.SignInUserResponse)
@@ -76,6 +82,7 @@ class Controller(litestar.Controller):
         data: DTOData[domain.User],
         oauth2: FromDishka[OAuth2PasswordBearerAuth[domain.User]],
         user_repo: FromDishka[services.UserRepo],
+        principals: FromDishka[services.Principals],
     ) -> litestar.Response[domain.User]:
         """Custom /sign-in endpoint"""
         signin = data.as_builtins()
@@ -85,6 +92,7 @@ class Controller(litestar.Controller):
             response_body=user,
             token_issuer="backcat",
             token_audience="backcat",
+            token_extras=await principals.claims(user),
         )
 
     @litestar.post("/refresh", return_dto=dto.SignInUserResponse)
@@ -95,6 +103,7 @@ class Controller(litestar.Controller):
         oauth2: FromDishka[OAuth2PasswordBearerAuth[domain.User]],
         user_repo: FromDishka[services.UserRepo],
         token_repo: FromDishka[services.TokenRepo],
+        principals: FromDishka[services.Principals],
     ) -> litestar.Response[domain.User]:
         """Custom /refresh endpoint"""
         user = await user_repo.read_user(request.user.id)
@@ -107,6 +116,7 @@ class Controller(litestar.Controller):
             response_body=user,
             token_issuer="backcat",
             token_audience="backcat",
+            token_extras=await principals.claims(user),
             token_unique_jwt_id=uuid4().hex,
         )
 
@@ -120,13 +130,21 @@ class Controller(litestar.Controller):
     ) -> litestar.Response[None]:
         """Custom /sign-out endpoint"""
         if request.auth.jti is not None:
-            await token_repo.ban(request.auth.jti)
+            await token_repo.ban(request.auth.jti, request.auth.exp)
         return litestar.Response(headers={"Authorization": ""}, content=None)
 
     @litestar.get("/me", return_dto=dto.UserProfileResponse)
     @inject
-    async def profile(self, *, request: litestar.Request[Any, Token, Any]) -> domain.User:
-        return request.user
+    async def profile(
+        self,
+        *,
+        request: litestar.Request[domain.User | services.Principal, Token, Any],
+        principals: FromDishka[services.Principals],
+    ) -> domain.User:
+        user = await principals.user(request.user)
+        if user is None:
+            raise NotAuthorizedException(detail="user no longer exists")
+        return user
 
     @litestar.patch("/me", dto=dto.UpdateUserRequest, return_dto=dto.UpdateUserResponse)
     @inject
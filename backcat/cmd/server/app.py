@@ -24,12 +24,18 @@ config = ServerConfig()  # type: ignore
 
 provider = Provider(scope=Scope.APP)
 provider.provide(lambda: config, provides=ServerConfig)
+provider.provide(lambda: config.cache, provides=configs.Cache)
 provider.provide(lambda: config.cors, provides=configs.CORS)
 provider.provide(lambda: config.csrf, provides=configs.CSRF)
 provider.provide(lambda: config.jwt, provides=configs.JWT)
+provider.provide(lambda: config.passwords, provides=configs.Passwords)
 provider.provide(lambda: config.redis, provides=configs.Redis)
 provider.provide(lambda: config.s3, provides=configs.S3)
 provider.provide(services.Cache, provides=services.Cache)
+provider.provide(services.WarmUp, provides=services.WarmUp)
+provider.provide(services.Auditor, provides=services.Auditor)
+provider.provide(services.Principals, provides=services.Principals)
+provider.provide(services.Passwords, provides=services.Passwords)
 provider.provide(services.AreaRepoImpl, provides=services.AreaRepo)
 provider.provide(services.BookingRepoImpl, provides=services.BookingRepo)
 provider.provide(services.CampingRepoImpl, provides=services.CampingRepo)
@@ -70,8 +76,29 @@ async def lifespan(app: Litestar):
 
     await piccolo.apps.migrations.commands.forwards.forwards("all")
 
+    cache = await app.state.dishka_container.get(services.Cache)
+    await cache.start()
+
+    warmup = await app.state.dishka_container.get(services.WarmUp)
+    await warmup.run()
+
+    auditor = await app.state.dishka_container.get(services.Auditor)
+    await auditor.start()
+
+    principals = await app.state.dishka_container.get(services.Principals)
+    await principals.start()
+
+    token_repo = await app.state.dishka_container.get(services.TokenRepo)
+    await token_repo.start()
+
+    passwords = await app.state.dishka_container.get(services.Passwords)
+
     yield
 
+    await token_repo.close()
+    await auditor.close()
+    await passwords.close()
+    await cache.close()
     await engine.close_connection_pool()
     await app.state.dishka_container.close()
 
@@ -106,7 +133,13 @@ app = Litestar(
             "/api/extra",
             include_in_schema=False,
             route_handlers=[
+                # exports the default registry, so services.cache.metrics are served along the http ones
                 PrometheusController,
+                Router(
+                    "/",
+                    guards=[authorization.extra_guard_factory(config.extra)],
+                    route_handlers=[api.extra.cache.Controller],
+                ),
             ],
         ),
     ],
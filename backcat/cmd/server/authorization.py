@@ -1,30 +1,37 @@
+import hmac
 from collections.abc import Awaitable, Callable
 from typing import Any
 from uuid import UUID
 
 from dishka import AsyncContainer
 from litestar.connection import ASGIConnection
+from litestar.exceptions import NotAuthorizedException, PermissionDeniedException
+from litestar.handlers.base import BaseRouteHandler
 from litestar.security.jwt import Token
 
-from backcat import domain, services
+from backcat import configs, domain, services
 
-RetrieveF = Callable[[Token, ASGIConnection[Any, Any, Any, Any]], Awaitable[domain.User | None]]
+RetrieveF = Callable[[Token, ASGIConnection[Any, Any, Any, Any]], Awaitable[domain.User | services.Principal | None]]
 RevokedF = Callable[[Token, ASGIConnection[Any, Any, Any, Any]], Awaitable[bool]]
+GuardF = Callable[[ASGIConnection[Any, Any, Any, Any], BaseRouteHandler], Awaitable[None]]
 
 
 def retrieve_user_factory(container: AsyncContainer) -> RetrieveF:
     # Unfortunately, we can not use `inject` here, because this function is called as simple callback
     # from oauth2 middleware, so we can not inject the container. Therefore, we have to manually
     # provide IoC using factory pattern.
-    async def retrieve_user(token: Token, connection: ASGIConnection[Any, Any, Any, Any]) -> domain.User | None:
-        user_repo = await container.get(services.UserRepo)
+    async def retrieve_user(
+        token: Token,
+        connection: ASGIConnection[Any, Any, Any, Any],
+    ) -> domain.User | services.Principal | None:
+        principals = await container.get(services.Principals)
 
         try:
             user_id = UUID(token.sub, version=4)
         except ValueError:
             return None
 
-        return await user_repo.read_user(user_id)
+        return await principals.authenticate(user_id, token.extras)
 
     return retrieve_user
 
@@ -42,3 +49,16 @@ def revoked_token_factory(container: AsyncContainer) -> RevokedF:
             return False
 
     return revoked_token
+
+
+def extra_guard_factory(cfg: configs.Extra) -> GuardF:
+    # /api/extra is excluded from oauth2, maintenance endpoints there are guarded by a static bearer token instead
+    async def extra_guard(connection: ASGIConnection[Any, Any, Any, Any], handler: BaseRouteHandler) -> None:
+        if cfg.token is None:
+            raise PermissionDeniedException(detail="maintenance endpoints are disabled")
+
+        scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), cfg.token.encode()):
+            raise NotAuthorizedException(detail="invalid maintenance token")
+
+    return extra_guard
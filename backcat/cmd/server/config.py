@@ -1,6 +1,7 @@
 import importlib.metadata
 from typing import ClassVar, override
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict, TomlConfigSettingsSource
 
 from backcat import configs
@@ -13,6 +14,9 @@ class ServerConfig(BaseSettings):
     jwt: configs.JWT
     redis: configs.Redis
     s3: configs.S3
+    cache: configs.Cache = Field(default_factory=configs.Cache)
+    extra: configs.Extra = Field(default_factory=configs.Extra)
+    passwords: configs.Passwords = Field(default_factory=configs.Passwords)
 
     # config loading options
     model_config: ClassVar[SettingsConfigDict] = SettingsConfigDict(
@@ -1,12 +1,18 @@
+from . import cache as cache
 from . import cors as cors
 from . import csrf as csrf
+from . import extra as extra
 from . import jwt as jwt
 from . import log as log
+from . import passwords as passwords
 from . import redis as redis
 from . import s3 as s3
+from .cache import Cache as Cache
 from .cors import CORS as CORS
 from .csrf import CSRF as CSRF
+from .extra import Extra as Extra
 from .jwt import JWT as JWT
 from .log import Log as Log
+from .passwords import Passwords as Passwords
 from .redis import Redis as Redis
 from .s3 import S3 as S3
@@ -0,0 +1,128 @@
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class Local(BaseModel):
+    enabled: bool = Field(default=False, description="keep a per-worker in-process copy of cached values")
+    max_size: int = Field(default=1024, description="maximum number of entries per keyspace", ge=0)
+    ttl: float = Field(default=2.0, description="maximum staleness of in-process entries in seconds", gt=0)
+
+
+class Stale(BaseModel):
+    enabled: bool = Field(default=False, description="serve expired values while a background refresh runs")
+    grace: float = Field(
+        default=1.0,
+        description="how long a value may be served stale, as a fraction of its ttl (the soft ttl)",
+        gt=0,
+    )
+
+
+class Expiry(BaseModel):
+    jitter: float = Field(
+        default=0.1,
+        description="ttls are shortened by a random fraction up to this, so values stored together expire apart",
+        ge=0,
+        lt=1,
+    )
+    beta: float = Field(
+        default=1.0,
+        description="xfetch early recomputation aggressiveness, values above 1 favour earlier refreshes, 0 disables",
+        ge=0,
+    )
+
+
+class Compression(BaseModel):
+    enabled: bool = Field(default=False, description="compress large values with zstd before storing them")
+    threshold: int = Field(default=1024, description="values smaller than this many bytes are stored as is", ge=0)
+    level: int = Field(default=3, description="zstd compression level", ge=1, le=22)
+    dictionary: Path | None = Field(
+        default=None,
+        description="zstd dictionary trained by tools/train_cache_dictionary.py, improves ratio on small values",
+    )
+
+
+class Adaptive(BaseModel):
+    enabled: bool = Field(default=False, description="derive ttls from how often each key is written")
+    factor: float = Field(
+        default=0.5,
+        description="ttl as a fraction of the expected time until the next write",
+        gt=0,
+    )
+    min: float = Field(default=10.0, description="shortest ttl in seconds, for keys written all the time", gt=0)
+    max: float = Field(default=21600.0, description="longest ttl in seconds, for keys that never change", gt=0)
+    alpha: float = Field(default=0.3, description="weight of the latest write interval in the average", gt=0, le=1)
+    history: float = Field(default=2592000.0, description="how long write statistics are kept in seconds", gt=0)
+
+
+class HotKeys(BaseModel):
+    enabled: bool = Field(default=False, description="track the most read keys of every keyspace in each worker")
+    width: int = Field(default=2048, description="count-min sketch counters per row", ge=1)
+    depth: int = Field(default=4, description="count-min sketch rows, more rows mean fewer overestimates", ge=1)
+    window: float = Field(default=60.0, description="counters are halved every this many seconds", gt=0)
+    top: int = Field(default=32, description="how many of the most read keys to keep per keyspace", ge=1)
+    threshold: int = Field(default=100, description="reads per window that make a top key hot", ge=1)
+    extend: float = Field(default=2.0, description="ttls of hot keys are multiplied by this when stored", ge=1)
+    promote: bool = Field(default=True, description="keep hot keys in-process even where the local tier is off")
+    local_ttl: float = Field(default=1.0, description="staleness bound of promoted entries in seconds", gt=0)
+
+
+class WarmUp(BaseModel):
+    enabled: bool = Field(default=False, description="preload recently updated entities on startup")
+    budget: float = Field(default=10.0, description="maximum time the warm-up may delay startup, in seconds", gt=0)
+    limit: int = Field(default=1000, description="how many entities to preload per keyspace", ge=0)
+    batch: int = Field(default=100, description="how many entities to load with one query", ge=1)
+    window: float = Field(
+        default=300.0,
+        description="workers starting within this many seconds of a warm-up reuse it instead of warming up again",
+        gt=0,
+    )
+
+
+class Audit(BaseModel):
+    enabled: bool = Field(default=False, description="periodically compare cached entities with the database")
+    interval: float = Field(default=60.0, description="seconds between audit rounds, one worker audits per round", gt=0)
+    sample: int = Field(default=100, description="how many cached entities to check per keyspace and round", ge=1)
+
+
+class Principals(BaseModel):
+    enabled: bool = Field(default=False, description="keep authenticated users in-process in each worker")
+    max_size: int = Field(default=10000, description="maximum number of users kept per worker", ge=1)
+    ttl: float = Field(default=5.0, description="maximum staleness of a kept user in seconds", gt=0)
+
+
+class Revocations(BaseModel):
+    enabled: bool = Field(default=False, description="check tokens against a per-worker set of revoked ones")
+    stream: str = Field(default="revoked:tokens", description="redis stream revocations are published on")
+
+
+class Keyspace(BaseModel):
+    local: Local | None = Field(default=None, description="in-process tier settings, overrides the default ones")
+    stale: Stale | None = Field(default=None, description="stale-while-revalidate settings, overrides the default ones")
+    expiry: Expiry | None = Field(default=None, description="ttl jitter and early refresh settings, overrides defaults")
+    adaptive: Adaptive | None = Field(default=None, description="adaptive ttl settings, overrides the default ones")
+
+
+class Cache(BaseModel):
+    local: Local = Field(default_factory=Local, description="default in-process tier settings")
+    stale: Stale = Field(default_factory=Stale, description="default stale-while-revalidate settings")
+    expiry: Expiry = Field(default_factory=Expiry, description="default ttl jitter and early refresh settings")
+    adaptive: Adaptive = Field(default_factory=Adaptive, description="default adaptive ttl settings")
+    hotkeys: HotKeys = Field(default_factory=HotKeys, description="hot key detection and promotion settings")
+    audit: Audit = Field(default_factory=Audit, description="cache-vs-database consistency audit settings")
+    warmup: WarmUp = Field(default_factory=WarmUp, description="startup warm-up settings")
+    principals: Principals = Field(default_factory=Principals, description="per-worker cache of authenticated users")
+    revocations: Revocations = Field(default_factory=Revocations, description="per-worker set of revoked tokens")
+    keyspaces: dict[str, Keyspace] = Field(default_factory=dict, description="per keyspace overrides")
+    codec: Literal["json", "msgpack"] = Field(default="msgpack", description="codec used to encode new values")
+    compression: Compression = Field(default_factory=Compression, description="compression of large values")
+    channel: str = Field(default="backcat:cache:invalidate", description="redis pub/sub channel for invalidations")
+    tracking: bool = Field(
+        default=False,
+        description="let redis invalidate in-process entries on any write or expiry (CLIENT TRACKING) instead of "
+        "broadcasting invalidations over the channel, so local ttls can be raised safely",
+    )
+
+    def keyspace(self, name: str) -> Keyspace:
+        return self.keyspaces.get(name) or Keyspace()
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class Extra(BaseModel):
+    token: str | None = Field(
+        default=None,
+        description="bearer token of the cache maintenance endpoints under /api/extra, they are disabled when unset",
+        min_length=32,
+        max_length=128,
+    )
@@ -7,3 +7,9 @@ class JWT(BaseModel):
     secret: str = Field(description="secret key for JWT", min_length=32, max_length=128)
     algorithm: Literal["HS256", "HS384", "HS512"] = Field(description="algorithm for JWT", default="HS256")
     token_expires: int = Field(description="access token expiration time in seconds", default=300, ge=60)
+    fat_tokens: bool = Field(
+        default=False,
+        description="carry the principal (name, email, token version) in token claims, so requests skip the user "
+        "lookup, name and email in the claims are refreshed with the token, revoked tokens are checked in process "
+        "as with `cache.revocations.enabled`",
+    )
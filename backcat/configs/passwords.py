@@ -0,0 +1,33 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class Argon2(BaseModel):
+    time_cost: int = Field(default=3, description="argon2 iterations", ge=1)
+    memory_cost: int = Field(default=65536, description="argon2 memory in KiB", ge=8)
+    parallelism: int = Field(default=4, description="argon2 lanes, threads used by one hash", ge=1)
+    hash_len: int = Field(default=32, description="length of the hash in bytes", ge=16)
+    salt_len: int = Field(default=16, description="length of the random salt in bytes", ge=16)
+
+
+class Passwords(BaseModel):
+    argon2: Argon2 = Field(
+        default_factory=Argon2,
+        description="hash parameters, pick them with `python -m backcat.cmd.calibrate` on the production hardware",
+    )
+    rehash: bool = Field(
+        default=True,
+        description="upgrade hashes made with other parameters in the background after a successful sign-in",
+    )
+    executor: Literal["thread", "process", "inline"] = Field(
+        default="thread",
+        description="where argon2 hashes are computed: a thread pool (argon2 releases the GIL), a process pool, or "
+        "inline on the event loop, which stalls every other request of the worker",
+    )
+    workers: int = Field(default=4, description="how many hashes a worker computes at the same time", ge=1)
+    max_pending: int = Field(
+        default=256,
+        description="how many hashes may wait for a free slot, further sign-ins are rejected with 503",
+        ge=0,
+    )
@@ -1,5 +1,23 @@
+from typing import Annotated
+
 from pydantic import BaseModel, Field, RedisDsn
 
 
 class Redis(BaseModel):
-    dsn: RedisDsn = Field(description="Redis DSN")
+    dsn: RedisDsn | Annotated[list[RedisDsn], Field(min_length=1)] = Field(
+        description="Redis DSN, or a list of them to spread the cache over several nodes by key, redis 7.0 or newer",
+    )
+    max_connections: int = Field(default=64, description="maximum number of pooled connections per worker", ge=1)
+    pool_timeout: float = Field(default=1.0, description="how long to wait for a free pooled connection", gt=0)
+    socket_timeout: float | None = Field(default=1.0, description="read and write timeout in seconds", gt=0)
+    socket_connect_timeout: float | None = Field(default=1.0, description="connect timeout in seconds", gt=0)
+    socket_keepalive: bool = Field(default=True, description="enable TCP keepalive on redis connections")
+    health_check_interval: int = Field(
+        default=30,
+        description="ping connections idle for longer than this many seconds before reusing them, 0 disables",
+        ge=0,
+    )
+
+    @property
+    def dsns(self) -> list[RedisDsn]:
+        return self.dsn if isinstance(self.dsn, list) else [self.dsn]
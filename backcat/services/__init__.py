@@ -1,15 +1,21 @@
 from . import area_repo as area_repo
+from . import audit as audit
 from . import booking_repo as booking_repo
 from . import cache as cache
 from . import camping_repo as camping_repo
 from . import dataloader as dataloader
+from . import entities as entities
 from . import errors as errors
 from . import filestorage as filestorage
+from . import passwords as passwords
 from . import poi_repo as poi_repo
+from . import principals as principals
 from . import review_repo as review_repo
 from . import token as token
 from . import user_repo as user_repo
+from . import warmup as warmup
 from .area_repo import AreaRepo, AreaRepoImpl
+from .audit import Auditor as Auditor
 from .booking_repo import BookingRepo, BookingRepoImpl
 from .cache import Cache as Cache
 from .cache import Key as Key
@@ -18,8 +24,12 @@ from .camping_repo import CampingRepo, CampingRepoImpl
 from .errors import ConflictError, ConversionError, InternalServerError, NotFoundError, ValidationError
 from .filestorage import FileStorage as FileStorage
 from .filestorage import FileStorageImpl as FileStorageImpl
+from .passwords import Passwords as Passwords
 from .poi_repo import POIRepo, POIRepoImpl
+from .principals import Principal as Principal
+from .principals import Principals as Principals
 from .token import TokenRepo as TokenRepo
 from .token import TokenRepoImpl as TokenRepoImpl
 from .user_repo import UserRepo, UserRepoImpl
+from .warmup import WarmUp as WarmUp
 from .review_repo import ReviewRepo, ReviewRepoImpl
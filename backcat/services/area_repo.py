@@ -1,5 +1,6 @@
 from datetime import UTC, datetime
 from typing import Any, Protocol
+from uuid import UUID
 
 from asyncpg import DataError, UniqueViolationError
 from piccolo.columns import Column
@@ -7,8 +8,8 @@ from pydantic import BaseModel, Field
 
 from backcat import database, domain
 from backcat.database.projector import ProjectionError, projection
-from backcat.services import errors
-from backcat.services.cache import Cache, Keyspace
+from backcat.services import entities, errors
+from backcat.services.cache import Cache, IDList
 
 
 class UpdateArea(BaseModel):
@@ -58,7 +59,7 @@ class AreaRepo(Protocol):
 
 class AreaRepoImpl(AreaRepo):
     def __init__(self, cache: Cache):
-        self._ks = Keyspace("area")
+        self._ks = entities.AREA.ks
         self._cache = cache
 
     async def create_area(self, actor: domain.UserID, area: domain.Area, camping_id: domain.CampingID) -> domain.Area:
@@ -75,9 +76,10 @@ class AreaRepoImpl(AreaRepo):
                 db_area = (await database.Area.insert(db_area).returning(*database.Area.all_columns()).run())[0]
                 domain_area = projection(db_area, cast_to=domain.Area)
 
-                await self._cache.set(self._ks.key(domain_area.id.hex), domain_area, expire=self._cache.HOT_FEAT)
+            await self._cache.set(self._ks.key(domain_area.id.hex), domain_area, expire=self._cache.HOT_FEAT)
+            await self._cache.invalidate_tag(f"camping:{camping_id.hex}:areas", self._ks.tag("lists"))
 
-                return domain_area
+            return domain_area
         except UniqueViolationError as e:
             # unique violation error means that the area already exists
             raise errors.ConflictError("area already exists") from e
@@ -94,11 +96,7 @@ class AreaRepoImpl(AreaRepo):
             raise errors.InternalServerError("failed to insert area") from e
 
     async def read_area(self, actor: domain.UserID, area_id: domain.AreaID) -> domain.Area | None:
-        try:
-            domain_area = await self._cache.get(self._ks.key(area_id.hex), t=domain.Area)
-            if domain_area is not None:
-                return domain_area
-
+        async def load() -> domain.Area | None:
             async with database.Area._meta.db.transaction():
                 db_area = (
                     await database.Area.objects()
@@ -112,11 +110,12 @@ class AreaRepoImpl(AreaRepo):
                 if db_area is None:
                     return None
 
-                domain_area = projection(db_area)
+                return projection(db_area)
 
-                await self._cache.set(self._ks.key(area_id.hex), domain_area, expire=self._cache.HOT_FEAT)
-
-            return domain_area
+        try:
+            return await self._cache.get_or_load(
+                self._ks.key(area_id.hex), load, t=domain.Area, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             # projection error means that the db data was read but it was not converted to domain model
             raise errors.InternalServerError("failed to read area") from e
@@ -151,7 +150,8 @@ class AreaRepoImpl(AreaRepo):
 
                 domain_area = projection(db_area, cast_to=domain.Area)
 
-                await self._cache.set(self._ks.key(domain_area.id.hex), domain_area, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_area.id.hex))
+            await self._cache.set(self._ks.key(domain_area.id.hex), domain_area, expire=self._cache.HOT_FEAT)
 
             return domain_area
         except DataError as e:
@@ -184,6 +184,26 @@ class AreaRepoImpl(AreaRepo):
 
                 domain_area = projection(db_area, cast_to=domain.Area)
 
+                bookers = (
+                    await database.Booking.select(database.Booking.user)
+                    .where(database.Booking.area == area_id, database.Booking.deleted_at.is_null())
+                    .distinct()
+                    .run()
+                )
+
+            await self._cache.record_write(self._ks.key(area_id.hex))
+            await self._cache.tombstone(
+                self._ks.key(area_id.hex), expire=self._cache.lifetime(self._ks, self._cache.HOT_FEAT)
+            )
+            # bookings of a deleted area no longer count, nor do the campings their users booked through it
+            await self._cache.invalidate_tag(
+                f"camping:{db_area['camping'].hex}:areas",
+                self._ks.tag("lists"),
+                f"area:{area_id.hex}:bookings",
+                entities.BOOKING.ks.tag("lists"),
+                *(f"user:{booker['user'].hex}:booked" for booker in bookers),
+            )
+
             return domain_area
         except IndexError as e:
             # index error means that no row was updated
@@ -202,14 +222,46 @@ class AreaRepoImpl(AreaRepo):
         actor: domain.UserID,
         filter: FilterArea,
     ) -> list[domain.Area]:
-        try:
+        async def load_ids() -> IDList:
             query = database.Area.objects().where(database.Area.deleted_at.is_null())
 
             if filter.camping_id is not None:
                 query = query.where(database.Area.camping._.id == filter.camping_id)
 
             db_areas = await query.run()
+            domain_areas = [projection(db_area) for db_area in db_areas]
+
+            await self._cache.set_many([
+                (self._ks.key(domain_area.id.hex), domain_area, self._cache.HOT_FEAT) for domain_area in domain_areas
+            ])
+
+            return IDList(ids=[domain_area.id.hex for domain_area in domain_areas])
+
+        async def load_areas(ids: list[str]) -> list[domain.Area]:
+            db_areas = (
+                await database.Area.objects()
+                .where(
+                    database.Area.id.is_in([UUID(id) for id in ids]),
+                    database.Area.deleted_at.is_null(),
+                )
+                .run()
+            )
             return [projection(db_area) for db_area in db_areas]
+
+        query_tags = [self._ks.tag("lists")]
+        if filter.camping_id is not None:
+            query_tags = [f"camping:{filter.camping_id.hex}:areas"]
+
+        try:
+            areas = await self._cache.get_or_load(
+                self._ks.query(filter), load_ids, t=IDList, expire=self._cache.HOT_FEAT, tags=query_tags
+            )
+            if areas is None:
+                return []
+
+            return await self._cache.hydrate(
+                self._ks, areas.ids, load_areas, t=domain.Area, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             # projection error means that the db data was read but it was not converted to domain model
             raise errors.InternalServerError("failed to read area") from e
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import structlog
+
+from backcat import configs
+from backcat.services.cache import Cache, Key, codec, metrics
+from backcat.services.entities import ENTITIES, Entity
+
+logger = structlog.get_logger(__name__)
+
+
+class Auditor:
+    """Background check of cached entities against the database.
+
+    Every `interval` one worker (whichever takes the lock first) samples up to `sample` entity keys per keyspace,
+    fetches the matching rows in one query and compares them on updated_at and deleted_at. Keys are sampled
+    by a SCAN that resumes where the previous round stopped, so the whole keyspace is covered over time.
+    Results go to backcat_cache_audit_* metrics, divergent keys are logged.
+    """
+
+    def __init__(self, cache: Cache, cache_cfg: configs.Cache):
+        self._cache = cache
+        self._cfg = cache_cfg.audit
+        self._cursors: dict[str, int] = {}
+        self._leftovers: dict[str, list[Key]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self):
+        if self._cfg.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        interval = timedelta(seconds=self._cfg.interval)
+        while True:
+            await asyncio.sleep(interval.total_seconds())
+
+            try:
+                # never released, it expires with the round so that one worker audits per interval
+                if not await self._cache.lock("audit", timeout=interval).acquire():
+                    continue
+
+                for entity in ENTITIES:
+                    await self.audit(entity)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("cache audit failed", exc_info=e)
+
+    async def audit(self, entity: Entity):
+        keys = await self._sample(entity)
+        if len(keys) == 0:
+            return
+
+        values = await self._cache.peek_many(keys)
+
+        table = entity.table
+        rows = await table.raw(
+            f"select id, updated_at, deleted_at from {table._meta.tablename} where id = any({{}})",
+            [UUID(key.path[0]) for key in keys],
+        ).run()
+        by_id: dict[str, dict[str, Any]] = {row["id"].hex: row for row in rows}
+
+        now = datetime.now(UTC)
+        for key, value in zip(keys, values, strict=True):
+            if value is None:
+                continue  # expired since the scan
+
+            result, since = self._compare(entity, value, by_id.get(key.path[0]))
+            metrics.AUDIT_CHECKS.labels(entity.ks.name, result).inc()
+            if result == "consistent":
+                continue
+
+            if since is not None:
+                metrics.AUDIT_STALENESS.labels(entity.ks.name).observe((now - since).total_seconds())
+            logger.warning("cached entity diverges from the database", key=key.as_str(), result=result, since=since)
+
+    async def _sample(self, entity: Entity) -> list[Key]:
+        cursor = self._cursors.get(entity.ks.name, 0)
+        # SCAN may return more keys than asked for, the ones left over by the previous round go first
+        keys = self._leftovers.pop(entity.ks.name, [])
+        seen = {key.as_str() for key in keys}
+        while len(keys) < self._cfg.sample:
+            cursor, found = await self._cache.scan(entity.ks, cursor=cursor, count=self._cfg.sample)
+            for key in found:
+                # entities are stored under <keyspace>:<id hex>, anything longer is a list or another derived value
+                if len(key.path) == 1 and _is_id(key.path[0]) and key.as_str() not in seen:
+                    keys.append(key)
+                    seen.add(key.as_str())
+            if cursor == 0:
+                break
+
+        self._cursors[entity.ks.name] = cursor
+        self._leftovers[entity.ks.name] = keys[self._cfg.sample :]
+        return keys[: self._cfg.sample]
+
+    def _compare(self, entity: Entity, value: bytes, row: dict[str, Any] | None) -> tuple[str, datetime | None]:
+        """Returns the result and since when the database differs from the cache, when known"""
+        alive = row is not None and row["deleted_at"] is None
+
+        if codec.is_tombstone(value):
+            if alive:
+                assert row is not None
+                return "tombstoned", row["updated_at"]
+            return "consistent", None
+
+        try:
+            cached = codec.decode(value, entity.t)
+        except Exception:
+            return "undecodable", None
+
+        if row is None:
+            return "deleted", None
+        if row["deleted_at"] is not None:
+            return "deleted", row["deleted_at"]
+        if cached.updated_at != row["updated_at"]:
+            return "outdated", row["updated_at"]
+
+        return "consistent", None
+
+
+def _is_id(value: str) -> bool:
+    try:
+        UUID(hex=value)
+    except ValueError:
+        return False
+
+    return True
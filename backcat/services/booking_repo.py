@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
 from typing import Any
 from typing import Protocol
+from uuid import UUID
 
 from asyncpg import DataError, UniqueViolationError
 from piccolo.columns import Column
@@ -9,8 +10,8 @@ from pydantic import BaseModel
 from backcat import database
 from backcat import domain
 from backcat.database.projector import ProjectionError, projection
-from backcat.services import errors
-from backcat.services.cache import Cache, Keyspace
+from backcat.services import entities, errors
+from backcat.services.cache import Cache, IDList
 from backcat.services.errors import ServiceError
 
 
@@ -59,7 +60,7 @@ class BookingRepo(Protocol):
 
 class BookingRepoImpl(BookingRepo):
     def __init__(self, cache: Cache):
-        self._ks = Keyspace("booking")
+        self._ks = entities.BOOKING.ks
         self._cache = cache
 
     async def create_booking(
@@ -101,9 +102,12 @@ class BookingRepoImpl(BookingRepo):
                 )[0]
                 domain_booking = projection(db_booking, cast_to=domain.Booking)
 
-                await self._cache.set(self._ks.key(domain_booking.id.hex), domain_booking, expire=self._cache.HOT_FEAT)
+            await self._cache.set(self._ks.key(domain_booking.id.hex), domain_booking, expire=self._cache.HOT_FEAT)
+            await self._cache.invalidate_tag(
+                f"area:{area_id.hex}:bookings", self._ks.tag("lists"), f"user:{actor.hex}:booked"
+            )
 
-                return domain_booking
+            return domain_booking
         except UniqueViolationError as e:
             raise errors.ConflictError("booking already exists") from e
         except DataError as e:
@@ -122,11 +126,7 @@ class BookingRepoImpl(BookingRepo):
         actor: domain.UserID,
         booking_id: domain.BookingID,
     ) -> domain.Booking | None:
-        try:
-            domain_booking = await self._cache.get(self._ks.key(booking_id.hex), t=domain.Booking)
-            if domain_booking is not None:
-                return domain_booking
-
+        async def load() -> domain.Booking | None:
             async with database.Booking._meta.db.transaction():
                 db_booking = (
                     await database.Booking.objects()
@@ -139,11 +139,12 @@ class BookingRepoImpl(BookingRepo):
                 if db_booking is None:
                     return None
 
-                domain_booking = projection(db_booking)
-
-                await self._cache.set(self._ks.key(booking_id.hex), domain_booking, expire=self._cache.HOT_FEAT)
+                return projection(db_booking)
 
-            return domain_booking
+        try:
+            return await self._cache.get_or_load(
+                self._ks.key(booking_id.hex), load, t=domain.Booking, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             raise errors.InternalServerError("failed to read booking") from e
         except Exception as e:
@@ -213,7 +214,8 @@ class BookingRepoImpl(BookingRepo):
 
                 domain_booking = projection(db_booking, cast_to=domain.Booking)
 
-                await self._cache.set(self._ks.key(domain_booking.id.hex), domain_booking, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_booking.id.hex))
+            await self._cache.set(self._ks.key(domain_booking.id.hex), domain_booking, expire=self._cache.HOT_FEAT)
 
             return domain_booking
         except DataError as e:
@@ -249,6 +251,14 @@ class BookingRepoImpl(BookingRepo):
 
                 domain_booking = projection(db_booking, cast_to=domain.Booking)
 
+            await self._cache.record_write(self._ks.key(booking_id.hex))
+            await self._cache.tombstone(
+                self._ks.key(booking_id.hex), expire=self._cache.lifetime(self._ks, self._cache.HOT_FEAT)
+            )
+            await self._cache.invalidate_tag(
+                f"area:{db_booking['area'].hex}:bookings", self._ks.tag("lists"), f"user:{actor.hex}:booked"
+            )
+
             return domain_booking
         except IndexError as e:
             raise errors.NotFoundError("no such booking found") from e
@@ -264,14 +274,47 @@ class BookingRepoImpl(BookingRepo):
         actor: domain.UserID,
         filter: FilterBooking,
     ) -> list[domain.Booking]:
-        try:
+        async def load_ids() -> IDList:
             query = database.Booking.objects().where(database.Booking.deleted_at.is_null())
 
             if filter.area_id is not None:
                 query = query.where(database.Booking.area._.id == filter.area_id)
 
             db_bookings = await query.run()
+            domain_bookings = [projection(db_booking) for db_booking in db_bookings]
+
+            await self._cache.set_many([
+                (self._ks.key(domain_booking.id.hex), domain_booking, self._cache.HOT_FEAT)
+                for domain_booking in domain_bookings
+            ])
+
+            return IDList(ids=[domain_booking.id.hex for domain_booking in domain_bookings])
+
+        async def load_bookings(ids: list[str]) -> list[domain.Booking]:
+            db_bookings = (
+                await database.Booking.objects()
+                .where(
+                    database.Booking.id.is_in([UUID(id) for id in ids]),
+                    database.Booking.deleted_at.is_null(),
+                )
+                .run()
+            )
             return [projection(db_booking) for db_booking in db_bookings]
+
+        query_tags = [self._ks.tag("lists")]
+        if filter.area_id is not None:
+            query_tags = [f"area:{filter.area_id.hex}:bookings"]
+
+        try:
+            bookings = await self._cache.get_or_load(
+                self._ks.query(filter), load_ids, t=IDList, expire=self._cache.HOT_FEAT, tags=query_tags
+            )
+            if bookings is None:
+                return []
+
+            return await self._cache.hydrate(
+                self._ks, bookings.ids, load_bookings, t=domain.Booking, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             raise errors.InternalServerError("failed to read bookings") from e
         except Exception as e:
@@ -0,0 +1,20 @@
+from . import codec as codec
+from . import compression as compression
+from . import core as core
+from . import hotkeys as hotkeys
+from . import local as local
+from . import metrics as metrics
+from . import registry as registry
+from . import sharding as sharding
+from . import singleflight as singleflight
+from .codec import Codec as Codec
+from .compression import Compressor as Compressor
+from .core import Cache as Cache
+from .core import IDList as IDList
+from .core import Key as Key
+from .core import Keyspace as Keyspace
+from .hotkeys import HotKeys as HotKeys
+from .local import LocalCache as LocalCache
+from .registry import RegistryError as RegistryError
+from .registry import register as register
+from .singleflight import SingleFlight as SingleFlight
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any, ClassVar, Literal, Protocol, TypeVar, overload
+
+import msgspec
+import pydantic
+
+from backcat.services.cache import compression
+
+T = TypeVar("T", bound=pydantic.BaseModel)
+
+type CodecName = Literal["json", "msgpack"]
+
+
+class CodecError(Exception): ...
+
+
+class Codec(Protocol):
+    id: ClassVar[int]
+    name: ClassVar[CodecName]
+
+    def encode(self, value: pydantic.BaseModel | dict) -> bytes: ...
+
+    def decode(self, data: bytes, t: type[T] | None) -> T | dict[str, Any]: ...
+
+
+class JsonCodec(Codec):
+    """Legacy codec, every value written before the envelope was introduced is json"""
+
+    id = 1
+    name = "json"
+
+    def encode(self, value: pydantic.BaseModel | dict) -> bytes:
+        if isinstance(value, dict):
+            return json.dumps(value).encode()
+
+        return value.model_dump_json().encode()
+
+    def decode(self, data: bytes, t: type[T] | None) -> T | dict[str, Any]:
+        if t is None:
+            return json.loads(data)
+
+        return t.model_validate_json(data)
+
+
+class MsgpackCodec(Codec):
+    """Binary codec, models are dumped to plain data once and validated back on decode"""
+
+    id = 2
+    name = "msgpack"
+
+    def __init__(self):
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def encode(self, value: pydantic.BaseModel | dict) -> bytes:
+        if isinstance(value, dict):
+            return self._encoder.encode(value)
+
+        # pydantic-core dumps the whole model in one call, json mode leaves only types msgpack has
+        return self._encoder.encode(value.model_dump(mode="json"))
+
+    def decode(self, data: bytes, t: type[T] | None) -> T | dict[str, Any]:
+        if t is None:
+            return self._decoder.decode(data)
+
+        return t.model_validate(self._decoder.decode(data))
+
+
+CODECS: dict[int, Codec] = {codec.id: codec for codec in (JsonCodec(), MsgpackCodec())}
+
+
+def codec_by_name(name: CodecName) -> Codec:
+    for codec in CODECS.values():
+        if codec.name == name:
+            return codec
+
+    raise CodecError(f"unknown codec: {name}")
+
+
+@dataclass
+class Envelope:
+    """Header prepended to every cached value.
+
+    Layout (version 1): magic byte, envelope version, codec id, flags, optional fields, then the encoded payload.
+    Optional fields are present when their flag is set and follow the header in the order of the flags.
+    Values without the magic byte are legacy json documents written before the envelope existed.
+    """
+
+    MAGIC: ClassVar[int] = 0xBC
+    VERSION: ClassVar[int] = 1
+    HEADER: ClassVar[struct.Struct] = struct.Struct("!BBBB")
+
+    FLAG_TOMBSTONE: ClassVar[int] = 0x01
+    """the key is known to have no value, payload is empty"""
+    FLAG_FRESH_UNTIL: ClassVar[int] = 0x02
+    """header is followed by the unix time (double) the value turns stale at"""
+    FRESH_UNTIL: ClassVar[struct.Struct] = struct.Struct("!d")
+    FLAG_RECOMPUTE: ClassVar[int] = 0x04
+    """followed by how long the value took to compute in seconds (float), used for early recomputation"""
+    RECOMPUTE: ClassVar[struct.Struct] = struct.Struct("!f")
+    FLAG_COMPRESSED: ClassVar[int] = 0x08
+    """payload is a zstd frame, see `compression`"""
+
+    codec: int
+    payload: bytes
+    flags: int = 0
+    fresh_until: float | None = None
+    recompute: float | None = None
+
+    def pack(self) -> bytes:
+        flags = self.flags & ~(self.FLAG_FRESH_UNTIL | self.FLAG_RECOMPUTE)
+        fields = b""
+        if self.fresh_until is not None:
+            flags |= self.FLAG_FRESH_UNTIL
+            fields += self.FRESH_UNTIL.pack(self.fresh_until)
+        if self.recompute is not None:
+            flags |= self.FLAG_RECOMPUTE
+            fields += self.RECOMPUTE.pack(self.recompute)
+
+        return self.HEADER.pack(self.MAGIC, self.VERSION, self.codec, flags) + fields + self.payload
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Envelope:
+        if len(data) < cls.HEADER.size or data[0] != cls.MAGIC:
+            return cls(codec=JsonCodec.id, payload=data)
+
+        _, version, codec, flags = cls.HEADER.unpack_from(data)
+        if version != cls.VERSION:
+            raise CodecError(f"unsupported envelope version: {version}")
+
+        fresh_until, recompute, offset = cls._fields(data, flags)
+        return cls(codec=codec, payload=data[offset:], flags=flags, fresh_until=fresh_until, recompute=recompute)
+
+    @classmethod
+    def _fields(cls, data: bytes, flags: int) -> tuple[float | None, float | None, int]:
+        offset = cls.HEADER.size
+
+        fresh_until = None
+        if flags & cls.FLAG_FRESH_UNTIL:
+            (fresh_until,) = cls.FRESH_UNTIL.unpack_from(data, offset)
+            offset += cls.FRESH_UNTIL.size
+
+        recompute = None
+        if flags & cls.FLAG_RECOMPUTE:
+            (recompute,) = cls.RECOMPUTE.unpack_from(data, offset)
+            offset += cls.RECOMPUTE.size
+
+        return fresh_until, recompute, offset
+
+
+def encode(
+    value: pydantic.BaseModel | dict,
+    codec: Codec,
+    *,
+    fresh_until: float | None = None,
+    recompute: float | None = None,
+    compressor: compression.Compressor | None = None,
+) -> bytes:
+    payload = codec.encode(value)
+    flags = 0
+
+    compressed = compressor.compress(payload) if compressor is not None else None
+    if compressed is not None:
+        payload = compressed
+        flags |= Envelope.FLAG_COMPRESSED
+
+    envelope = Envelope(codec=codec.id, payload=payload, flags=flags, fresh_until=fresh_until, recompute=recompute)
+    return envelope.pack()
+
+
+def tombstone() -> bytes:
+    return Envelope(codec=0, payload=b"", flags=Envelope.FLAG_TOMBSTONE).pack()
+
+
+def is_tombstone(data: bytes) -> bool:
+    # looks at the header only, unpacking would copy the payload
+    if len(data) < Envelope.HEADER.size or data[0] != Envelope.MAGIC:
+        return False
+
+    _, _, _, flags = Envelope.HEADER.unpack_from(data)
+    return flags & Envelope.FLAG_TOMBSTONE != 0
+
+
+def timing(data: bytes) -> tuple[float | None, float | None]:
+    """Returns (fresh_until, recompute) of the value, either is None when it was not recorded"""
+    if len(data) < Envelope.HEADER.size or data[0] != Envelope.MAGIC:
+        return None, None
+
+    _, _, _, flags = Envelope.HEADER.unpack_from(data)
+    fresh_until, recompute, _ = Envelope._fields(data, flags)
+    return fresh_until, recompute
+
+
+@overload
+def decode(data: bytes, t: None) -> dict[str, Any]: ...
+
+
+@overload
+def decode[M: pydantic.BaseModel](data: bytes, t: type[M]) -> M: ...
+
+
+def decode[M: pydantic.BaseModel](data: bytes, t: type[M] | None) -> M | dict[str, Any]:
+    envelope = Envelope.unpack(data)
+    if envelope.flags & Envelope.FLAG_TOMBSTONE:
+        raise CodecError("tombstone has no value")
+
+    codec = CODECS.get(envelope.codec)
+    if codec is None:
+        raise CodecError(f"unknown codec id: {envelope.codec}")
+
+    payload = envelope.payload
+    if envelope.flags & Envelope.FLAG_COMPRESSED:
+        payload = compression.decompress(payload)
+
+    return codec.decode(payload, t)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import zstandard
+
+from backcat import configs
+
+
+class CompressionError(Exception): ...
+
+
+# decompressors by zstd dictionary id, 0 is for frames compressed without a dictionary
+_decompressors: dict[int, zstandard.ZstdDecompressor] = {0: zstandard.ZstdDecompressor()}
+
+
+def load_dictionary(path: Path) -> zstandard.ZstdCompressionDict:
+    """Load a dictionary trained by tools/train_cache_dictionary.py and make its frames decompressible"""
+    dictionary = zstandard.ZstdCompressionDict(path.read_bytes())
+    if dictionary.dict_id() == 0:
+        # frames only reference trained dictionaries by id, without it they could not be told apart
+        raise CompressionError(f"{path} is not a trained zstd dictionary")
+
+    _decompressors[dictionary.dict_id()] = zstandard.ZstdDecompressor(dict_data=dictionary)
+    return dictionary
+
+
+class Compressor:
+    """zstd compression of payloads above a size threshold.
+
+    The dictionary id is written into every frame, so values compressed with a dictionary stay readable
+    as long as that dictionary is loaded, even after the configured one changes.
+    """
+
+    def __init__(self, cfg: configs.cache.Compression):
+        self._threshold = cfg.threshold
+        dictionary = load_dictionary(cfg.dictionary) if cfg.dictionary is not None else None
+        self._compressor = zstandard.ZstdCompressor(level=cfg.level, dict_data=dictionary)
+
+    def compress(self, payload: bytes) -> bytes | None:
+        """Returns the compressed payload, None when it is below the threshold or does not shrink"""
+        if len(payload) < self._threshold:
+            return None
+
+        compressed = self._compressor.compress(payload)
+        if len(compressed) >= len(payload):
+            return None
+
+        return compressed
+
+
+def decompress(data: bytes) -> bytes:
+    dict_id = zstandard.get_frame_parameters(data).dict_id
+    decompressor = _decompressors.get(dict_id)
+    if decompressor is None:
+        raise CompressionError(f"zstd dictionary {dict_id} is not loaded")
+
+    return decompressor.decompress(data)
@@ -0,0 +1,1471 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import math
+import random
+import re
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Coroutine, Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Literal, TypeVar, overload
+from uuid import uuid4
+
+import pydantic
+import structlog
+from pydantic import RedisDsn
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline, PubSub
+from redis.asyncio.connection import AbstractConnection
+from redis.asyncio.lock import Lock
+from redis.exceptions import ResponseError
+from redis.typing import EncodableT, FieldT
+
+from backcat import configs
+from backcat.domain.base import DomainBaseModel
+from backcat.services.cache import codec, compression, metrics
+from backcat.services.cache.codec import CodecName
+from backcat.services.cache.hotkeys import HotKeys
+from backcat.services.cache.local import LocalCache
+from backcat.services.cache.sharding import Ring
+from backcat.services.cache.singleflight import SingleFlight
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Keyspace:
+    """Namespace of cache keys, use `registry.register` to create one bound to the type of its values"""
+
+    name: str
+    t: type[pydantic.BaseModel] | None = None
+    codec: CodecName | None = None
+    fingerprint: str | None = None
+
+    @property
+    def prefix(self) -> str:
+        """What keys of the keyspace start with: the name and the schema fingerprint when typed.
+
+        Stored keys also carry the generation of the keyspace, which is kept by each `Cache`, see `Cache.bump`.
+        """
+        if self.fingerprint is None:
+            return self.name
+
+        return f"{self.name}@{self.fingerprint}"
+
+    def key(self, *path: str) -> Key:
+        return Key(self, list(path))
+
+    def tag(self, *path: str) -> str:
+        return ":".join([self.name, *path])
+
+    def query(self, filter: pydantic.BaseModel, *path: str) -> Key:
+        """Deterministic key of a list query, built from the filter fields sorted by name.
+
+        `path` is appended as is, use it for inputs that affect the result but are not part of the filter.
+        """
+        fields = filter.model_dump(mode="json")
+        return self.key("query", *path, *(f"{name}={_canonical(fields[name])}" for name in sorted(fields)))
+
+
+@dataclass
+class Key:
+    ks: Keyspace
+    path: list[str]
+
+    def as_str(self):
+        return f"{self.ks.prefix}:{':'.join(self.path)}"
+
+
+def keyspace_name(key_str: str) -> str:
+    """Name of the keyspace a stored key belongs to"""
+    match = _KEYSPACE_NAME.match(key_str)
+    assert match is not None
+    return match.group()
+
+
+_KEYSPACE_NAME = re.compile(r"[^:@#]*")
+
+_GENERATION = re.compile(r"#\d+(?=:)")
+
+
+def _canonical(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def connect(
+    cfg: configs.Redis,
+    dsn: RedisDsn,
+    *,
+    pool_class: type[BlockingConnectionPool] = BlockingConnectionPool,
+    **overrides: Any,
+) -> Redis:
+    """Redis client over a bounded pool, callers wait up to `pool_timeout` for a free connection"""
+    options: dict[str, Any] = {
+        "max_connections": cfg.max_connections,
+        "timeout": cfg.pool_timeout,
+        "socket_timeout": cfg.socket_timeout,
+        "socket_connect_timeout": cfg.socket_connect_timeout,
+        "socket_keepalive": cfg.socket_keepalive,
+        "health_check_interval": cfg.health_check_interval,
+    }
+    pool = pool_class.from_url(dsn.unicode_string(), **(options | overrides))
+    return Redis.from_pool(pool)
+
+
+class TrackingPool(BlockingConnectionPool):
+    """Pool of a shard with key tracking.
+
+    Connections that redirect invalidations to a previous subscriber of the shard, or were connected before it had
+    one, are reconnected when they are next checked out, `Cache._on_connect` redirects them to the current one.
+    Connections that are in use when the subscriber changes finish their commands first.
+    """
+
+    shard: Shard
+
+    async def get_connection(self, command_name: Any, *keys: Any, **options: Any) -> AbstractConnection:
+        connection = await super().get_connection(command_name, *keys, **options)
+        tracking_id = self.shard.tracking_id
+        if tracking_id is None or self.shard.redirects.get(connection) == tracking_id:
+            return connection
+
+        try:
+            await connection.disconnect()
+            await connection.connect()
+        except BaseException:
+            await self.release(connection)
+            raise
+        return connection
+
+
+class Shard:
+    """One redis node of the cache and the subscriber connection its invalidations arrive on"""
+
+    def __init__(
+        self,
+        cfg: configs.Redis,
+        dsn: RedisDsn,
+        *,
+        on_connect: Callable[[Shard, AbstractConnection], Awaitable[None]] | None = None,
+    ):
+        # placement on the ring, the password is left out so that rotating it does not move the keys
+        self.name = f"{dsn.host}:{dsn.port}{dsn.path or ''}"
+        self.redis = connect(
+            cfg,
+            dsn,
+            pool_class=TrackingPool if on_connect else BlockingConnectionPool,
+            redis_connect_func=functools.partial(on_connect, self) if on_connect else None,
+        )
+        if isinstance(self.redis.connection_pool, TrackingPool):
+            self.redis.connection_pool.shard = self
+        # subscriptions sit idle between messages, so they must not be cut by the socket timeout
+        self.subscriber = connect(cfg, dsn, socket_timeout=None)
+        self.subscribed = asyncio.Event()
+        # client id of the subscriber connection tracking invalidations are redirected to
+        self.tracking_id: int | None = None
+        # pooled connection -> subscriber client id it redirects to
+        self.redirects: weakref.WeakKeyDictionary[AbstractConnection, int] = weakref.WeakKeyDictionary()
+
+    async def close(self):
+        await self.subscriber.aclose()
+        await self.redis.aclose()
+
+
+_RECORD_WRITE = """
+-- KEYS[1]: write statistics of a cache key, ARGV: now in seconds, ewma weight, how long to keep them in ms
+local now = tonumber(ARGV[1])
+local last = tonumber(redis.call("HGET", KEYS[1], "at"))
+if last then
+    local observed = math.max(now - last, 0)
+    local interval = tonumber(redis.call("HGET", KEYS[1], "interval"))
+    if interval then
+        local alpha = tonumber(ARGV[2])
+        interval = alpha * observed + (1 - alpha) * interval
+    else
+        interval = observed
+    end
+    redis.call("HSET", KEYS[1], "interval", tostring(interval))
+end
+redis.call("HSET", KEYS[1], "at", ARGV[1])
+redis.call("PEXPIRE", KEYS[1], ARGV[3])
+"""
+
+_EXTEND_TTL = """
+-- KEYS[1]: a tag set, ARGV[1]: ttl in ms it has to live at least, a longer one is kept
+local ttl = redis.call("PTTL", KEYS[1])
+if ttl == -1 or ttl < tonumber(ARGV[1]) then
+    redis.call("PEXPIRE", KEYS[1], ARGV[1])
+end
+"""
+
+
+T = TypeVar("T", bound=pydantic.BaseModel)
+E = TypeVar("E", bound=DomainBaseModel)
+
+
+type Freshness = Literal["fresh", "stale", "early"]
+"""stale values are past their soft ttl, early ones are picked for probabilistic early recomputation"""
+
+
+@dataclass
+class Usage:
+    """Stored keys of a keyspace across every shard, memory is estimated from `sampled` of them"""
+
+    keys: int = 0
+    sampled: int = 0
+    memory: int = 0
+
+
+@dataclass
+class LocalStats:
+    """In-process tier of a keyspace in this worker"""
+
+    entries: int
+    bytes: int
+    max_size: int
+    ttl: float
+    promoted: bool
+
+
+class IDList(pydantic.BaseModel):
+    """Cached result of a list query, entities themselves are stored under their own keys"""
+
+    ids: list[str]
+
+
+class Cache:
+    LIVE_FEAT = timedelta(seconds=10)
+    HOT_FEAT = timedelta(minutes=5)
+    COLD_FEAT = timedelta(minutes=30)
+
+    NEGATIVE_FEAT = timedelta(seconds=30)
+    """default lifetime of tombstones for keys that have no value"""
+
+    LOAD_LOCK_TIMEOUT = timedelta(seconds=5)
+    """how long a worker may hold the cross-worker load lock"""
+    LOAD_POLL_INTERVAL = timedelta(milliseconds=25)
+    """how often workers waiting for the lock holder check for the loaded value"""
+
+    SUBSCRIBE_TIMEOUT = timedelta(seconds=5)
+    """how long `start` waits for the invalidation listener to subscribe"""
+
+    TRACKING_CHANNEL = b"__redis__:invalidate"
+    """channel redis publishes tracked keys on when they change, see `configs.Cache.tracking`"""
+
+    GENERATION_TTL = timedelta(seconds=1)
+    """how long a worker uses its copy of a keyspace generation before reading it from redis again"""
+    GENERATION_PREFIX = "gen:"
+
+    def __init__(self, cfg: configs.Redis, cache_cfg: configs.Cache):
+        self._cfg = cfg
+        self._cache_cfg = cache_cfg
+        self._shards = [
+            Shard(cfg, dsn, on_connect=self._on_connect if cache_cfg.tracking else None) for dsn in cfg.dsns
+        ]
+        self._ring = Ring([shard.name for shard in self._shards])
+        # run through per-shard pipelines, which load the script on their node when it is missing
+        self._record_write = self._shards[0].redis.register_script(_RECORD_WRITE)
+        self._extend_ttl = self._shards[0].redis.register_script(_EXTEND_TTL)
+        self._codec = codec.codec_by_name(cache_cfg.codec)
+        self._codecs = {c.name: c for c in codec.CODECS.values()}
+        self._compressor = compression.Compressor(cache_cfg.compression) if cache_cfg.compression.enabled else None
+
+        # in-process tier, one LocalCache per keyspace, None when disabled for the keyspace
+        self._origin = uuid4().hex
+        self._locals: dict[str, LocalCache[bytes] | None] = {}
+        # keyspaces without a local tier of their own, their LocalCache only holds hot keys
+        self._promoted: set[str] = set()
+        self._hotkeys: dict[str, HotKeys] = {}
+        self._listeners: list[asyncio.Task[None]] = []
+
+        # keyspace name -> generation its keys are stored under, missing ones are in generation 0
+        self._generations: dict[str, int] = {}
+        # keyspace name -> when its generation was read from redis (monotonic)
+        self._synced: dict[str, float] = {}
+        # keyspace name -> callbacks told about changed keys of the keyspace, see `watch`
+        self._watchers: dict[str, list[Callable[[str | None], None]]] = {}
+
+        self._flights = SingleFlight()
+        self._refreshes: dict[str, asyncio.Task[Any]] = {}
+
+    async def start(self):
+        """Subscribe to invalidations broadcast by other workers, no-op when in-process tier is not used"""
+        local_enabled = (
+            self._cache_cfg.local.enabled
+            or any(ks.local is not None and ks.local.enabled for ks in self._cache_cfg.keyspaces.values())
+            or (self._cache_cfg.hotkeys.enabled and self._cache_cfg.hotkeys.promote)
+        )
+        if local_enabled:
+            await self._subscribe()
+
+    async def watch(self, ks: Keyspace, on_change: Callable[[str | None], None]):
+        """Call `on_change` with every key of `ks` that is written, invalidated or deleted by any worker.
+
+        Meant for per-worker copies of cached values kept outside of the cache. None stands for every key of
+        the keyspace, e.g. after a bump or when invalidations could have been missed.
+        """
+        self._watchers.setdefault(ks.name, []).append(on_change)
+        await self._subscribe()
+
+    async def _subscribe(self):
+        if len(self._listeners) == 0:
+            self._listeners = [asyncio.create_task(self._listen(shard)) for shard in self._shards]
+
+            # the listeners clear the in-process tier once subscribed, anything stored before that would be lost
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(shard.subscribed.wait() for shard in self._shards)),
+                    timeout=self.SUBSCRIBE_TIMEOUT.total_seconds(),
+                )
+            except TimeoutError:
+                logger.warning("cache invalidation listener did not subscribe in time")
+
+    async def close(self):
+        for listener in self._listeners:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+        self._listeners = []
+
+        for task in set(self._refreshes.values()):
+            task.cancel()
+        self._refreshes.clear()
+
+        for shard in self._shards:
+            await shard.close()
+
+    def lock(self, name: str, *, timeout: timedelta) -> Lock:
+        """Cross-worker lock that expires after `timeout`, `acquire` does not block"""
+        lock_key = f"lock:{name}"
+        return self._shard(lock_key).redis.lock(lock_key, timeout=timeout.total_seconds(), blocking=False)
+
+    def has_local(self, ks: Keyspace) -> bool:
+        """Whether the keyspace has an in-process tier in this worker"""
+        return self._local(ks) is not None and ks.name not in self._promoted
+
+    def hot_keys(self) -> dict[str, list[tuple[str, int]]]:
+        """Most read keys of every keyspace in this worker with their estimated reads, hottest first"""
+        return {ks_name: hotkeys.top() for ks_name, hotkeys in self._hotkeys.items()}
+
+    def local_stats(self) -> dict[str, LocalStats]:
+        """In-process tiers of this worker by keyspace, keyspaces that were not used yet are left out"""
+        return {
+            ks_name: LocalStats(
+                entries=len(local),
+                bytes=local.nbytes(),
+                max_size=local.max_size,
+                ttl=local.ttl,
+                promoted=ks_name in self._promoted,
+            )
+            for ks_name, local in self._locals.items()
+            if local is not None
+        }
+
+    async def usage(self, *, sample: int = 100, count: int = 1000) -> dict[str, Usage]:
+        """Number of stored keys and their estimated memory by keyspace name.
+
+        Walks the whole key space of every shard with SCAN (`count` keys per step), meant for maintenance only.
+        Memory is the MEMORY USAGE of the first `sample` keys of a keyspace on each shard scaled to its key count.
+        Internal keys show up under their prefix (tag, lock, writes, gen, counter).
+        """
+        usage: dict[str, Usage] = {}
+
+        async def walk(shard: Shard):
+            keys: dict[str, int] = {}
+            sampled: dict[str, list[bytes]] = {}
+            async for key in shard.redis.scan_iter(count=count):
+                ks_name = keyspace_name(key.decode())
+                keys[ks_name] = keys.get(ks_name, 0) + 1
+                if len(sampled.setdefault(ks_name, [])) < sample:
+                    sampled[ks_name].append(key)
+
+            async with shard.redis.pipeline(transaction=False) as pipe:
+                for ks_keys in sampled.values():
+                    for key in ks_keys:
+                        pipe.memory_usage(key)
+                sizes = iter(await pipe.execute())
+
+            for ks_name, ks_keys in sampled.items():
+                # keys may expire between the scan and MEMORY USAGE
+                found = [size for size in (next(sizes) for _ in ks_keys) if size is not None]
+                total = usage.setdefault(ks_name, Usage())
+                total.keys += keys[ks_name]
+                total.sampled += len(found)
+                if len(found) != 0:
+                    total.memory += sum(found) * keys[ks_name] // len(found)
+
+        await asyncio.gather(*(walk(shard) for shard in self._shards))
+        return usage
+
+    async def bump(self, ks: Keyspace) -> int:
+        """Invalidate every key of the keyspace at once, returns the new generation.
+
+        Stored keys include the generation of their keyspace, so bumping it makes all of them unreachable without
+        touching them, they age out under their ttl. Other workers switch to the new generation once they get
+        the invalidation or, when they do not listen to invalidations, within `GENERATION_TTL`.
+        """
+        generation_key = self._generation_key(ks.name)
+        with metrics.observe(ks.name, "bump"):
+            async with self._shard(generation_key).redis.pipeline(transaction=False) as pipe:
+                pipe.incr(generation_key)
+                self._broadcast(pipe, [generation_key])
+                generation, *_ = await pipe.execute()
+
+        self._synced[ks.name] = time.monotonic()
+        self._set_generation(ks, generation)
+        return generation
+
+    def generation(self, ks: Keyspace) -> int:
+        """Generation of the keyspace as this worker last read it from redis"""
+        return self._generations.get(ks.name, 0)
+
+    @overload
+    async def get(self, key: Key, *, silent: bool = True) -> dict[str, Any] | None: ...
+
+    @overload
+    async def get(self, key: Key, *, t: type[T], silent: bool = True) -> T | None: ...
+
+    async def get(self, key: Key, *, t: type[T] | None = None, silent: bool = True) -> T | dict[str, Any] | None:
+        """Read a value, stale ones included, use `get_or_load` to have them refreshed"""
+        await self._sync(key.ks)
+        try:
+            value = await self._fetch(key)
+        except Exception as e:
+            if not silent:
+                raise e
+            return None
+
+        if value is None or codec.is_tombstone(value):
+            return None
+
+        try:
+            return codec.decode(value, t)
+        except Exception as e:
+            metrics.ERRORS.labels(key.ks.name, "decode").inc()
+            if not silent:
+                raise e
+
+    async def get_many(self, keys: Sequence[Key], *, t: type[T], silent: bool = True) -> list[T | None]:
+        """Read several keys with a single MGET per shard, values that are missing or fail to decode are None"""
+        await self._sync(*(key.ks for key in keys))
+        try:
+            values = await self._fetch_many(keys)
+        except Exception as e:
+            if not silent:
+                raise e
+            return [None] * len(keys)
+
+        return [self._decode(key.ks, value, t=t, silent=silent) for key, value in zip(keys, values, strict=True)]
+
+    async def scan(self, ks: Keyspace, *, cursor: int = 0, count: int = 100) -> tuple[int, list[Key]]:
+        """One SCAN step over the keys of a keyspace, returns the next cursor (0 once done) and the keys found.
+
+        Shards are scanned one after another, the cursor holds both the shard and the position in it.
+        """
+        await self._sync(ks)
+        index, shard_cursor = cursor % len(self._shards), cursor // len(self._shards)
+        shard_cursor, found = await self._shards[index].redis.scan(
+            shard_cursor, match=f"{self._prefix(ks)}:*", count=count
+        )
+        if shard_cursor == 0:
+            index += 1
+            if index == len(self._shards):
+                index = 0  # done, the next call starts over
+
+        keys = [ks.key(*key.decode().split(":")[1:]) for key in found]
+        return shard_cursor * len(self._shards) + index, keys
+
+    async def ttl(self, key: Key) -> timedelta | None:
+        """How long redis keeps `key`, None when it is missing or stored without a ttl"""
+        await self._sync(key.ks)
+        key_str = self._key_str(key)
+        ttl = await self._shard(key_str).redis.pttl(key_str)
+        return timedelta(milliseconds=ttl) if ttl >= 0 else None
+
+    async def peek_many(self, keys: Sequence[Key]) -> list[bytes | None]:
+        """Raw stored values, read from redis directly bypassing the in-process tier and metrics.
+
+        Meant for inspecting the cache, use `codec` to tell tombstones apart and decode the values.
+        """
+        if len(keys) == 0:
+            return []
+
+        await self._sync(*(key.ks for key in keys))
+        return await self._mget([self._key_str(key) for key in keys])
+
+    async def set(
+        self,
+        key: Key,
+        value: pydantic.BaseModel | dict,
+        *,
+        expire: timedelta | None = None,
+        tags: Sequence[str] = (),
+        recompute: float | None = None,
+        exact: bool = False,
+        silent: bool = True,
+    ):
+        await self.set_many([(key, value, expire)], tags=tags, recompute=recompute, exact=exact, silent=silent)
+
+    async def set_many(
+        self,
+        items: Sequence[tuple[Key, pydantic.BaseModel | dict, timedelta | None]],
+        *,
+        tags: Sequence[str] = (),
+        recompute: float | None = None,
+        exact: bool = False,
+        silent: bool = True,
+    ):
+        """Store several (key, value, expire) items in one pipelined round trip.
+
+        Every item is added to each of `tags`, see `invalidate_tag`. `expire` is shortened by a random jitter,
+        in keyspaces with stale-while-revalidate it is the soft ttl and the value is kept for `grace` longer.
+        `recompute` is how long the values took to load in seconds, it drives early recomputation.
+        With `exact` the values are kept for `expire` as is, for values that must expire neither early nor late.
+        """
+        await self._sync(*(key.ks for key, _, _ in items))
+        expires = [expire for _, _, expire in items] if exact else await self._adapt(items)
+
+        try:
+            encoded: list[tuple[Key, bytes, timedelta | None]] = []
+            for (key, value, _), expire in zip(items, expires, strict=True):
+                self._check(key.ks, value)
+                if exact:
+                    fresh_until = time.time() + expire.total_seconds() if expire is not None else None
+                else:
+                    fresh_until, expire = self._expiry(key.ks, self._extend(key, expire))
+                data = codec.encode(
+                    value,
+                    self._codec if key.ks.codec is None else self._codecs[key.ks.codec],
+                    fresh_until=fresh_until,
+                    recompute=recompute,
+                    compressor=self._compressor,
+                )
+                encoded.append((key, data, expire))
+        except Exception as e:
+            metrics.ERRORS.labels(items[0][0].ks.name, "encode").inc()
+            if not silent:
+                raise e
+            return
+
+        await self._store_many(encoded, tags=tags, silent=silent)
+
+    async def counter(self, name: str) -> int:
+        """Value of a counter, see `incr`"""
+        counter_key = f"counter:{name}"
+        return int(await self._shard(counter_key).redis.get(counter_key) or 0)
+
+    async def incr(self, name: str) -> int:
+        """Increment a counter kept outside of every keyspace and without a ttl, returns its new value"""
+        counter_key = f"counter:{name}"
+        with metrics.observe("counter", "incr"):
+            return await self._shard(counter_key).redis.incr(counter_key)
+
+    async def append(self, stream: str, fields: dict[str, str], *, keep: timedelta):
+        """Add an entry to a redis stream, entries older than `keep` are trimmed and an idle stream expires"""
+        shard = self._shard(stream)
+        min_id = int((time.time() - keep.total_seconds()) * 1000)
+        entry: dict[FieldT, EncodableT] = {**fields}
+        with metrics.observe(keyspace_name(stream), "append"):
+            async with shard.redis.pipeline(transaction=False) as pipe:
+                pipe.xadd(stream, entry, minid=min_id, approximate=True)
+                pipe.pexpire(stream, keep)
+                await pipe.execute()
+
+    async def read(
+        self,
+        stream: str,
+        after: str,
+        *,
+        count: int = 1000,
+        block: timedelta | None = None,
+    ) -> list[tuple[str, dict[str, str]]]:
+        """Up to `count` entries of a redis stream that follow the entry id `after` ("0" for the oldest kept one).
+
+        With `block` waits that long for new entries when there are none, an empty list means none came.
+        Blocking reads go through the subscriber connections, which are not cut by the socket timeout.
+        """
+        shard = self._shard(stream)
+        client = shard.redis if block is None else shard.subscriber
+        block_ms = int(block.total_seconds() * 1000) if block is not None else None
+        # [[stream, [(entry id, {field: value})]]], or nothing when no entries came
+        response: list[tuple[bytes, list[tuple[bytes, dict[bytes, bytes]]]]] = await client.xread(
+            {stream: after}, count=count, block=block_ms
+        )
+        if not response:
+            return []
+
+        _, entries = response[0]
+        return [
+            (entry_id.decode(), {field.decode(): value.decode() for field, value in fields.items()})
+            for entry_id, fields in entries
+        ]
+
+    async def record_write(self, *keys: Key, silent: bool = True):
+        """Note that the entities behind `keys` were just changed, call it from update and delete paths.
+
+        Keyspaces with adaptive ttls (see `configs.cache.Adaptive`) use the intervals between writes to pick
+        longer ttls for rarely changing keys and shorter ones for volatile keys.
+        """
+        keys = tuple(key for key in keys if self._adaptive_cfg(key.ks).enabled)
+        if len(keys) == 0:
+            return
+
+        try:
+            writes_keys = [self._writes_key(self._key_str(key)) for key in keys]
+
+            async def record(shard: Shard, positions: list[int]):
+                async with shard.redis.pipeline(transaction=False) as pipe:
+                    for i in positions:
+                        cfg = self._adaptive_cfg(keys[i].ks)
+                        args = [time.time(), cfg.alpha, int(cfg.history * 1000)]
+                        await self._record_write(keys=[writes_keys[i]], args=args, client=pipe)
+                    await pipe.execute()
+
+            with metrics.observe(keys[0].ks.name, "record_write"):
+                await self._each_shard(writes_keys, record)
+        except Exception as e:
+            if not silent:
+                raise e
+
+    async def tombstone(self, key: Key, *, expire: timedelta | None = None, silent: bool = True):
+        """Remember that `key` has no value, reads return None without calling the loader until it expires"""
+        await self._sync(key.ks)
+        await self._store_many([(key, codec.tombstone(), expire or self.NEGATIVE_FEAT)], silent=silent)
+
+    def lifetime(self, ks: Keyspace, expire: timedelta) -> timedelta:
+        """Longest time redis may keep a value of `ks` stored with `expire`.
+
+        Adaptive ttls, hot keys and stale grace all keep values longer than asked. Tombstones of deleted entities
+        last this long, so they are not outlived by copies of the entity stored before the delete.
+        """
+        adaptive = self._adaptive_cfg(ks)
+        if adaptive.enabled:
+            expire = max(expire, timedelta(seconds=adaptive.max))
+        if self._cache_cfg.hotkeys.enabled:
+            expire *= self._cache_cfg.hotkeys.extend
+
+        stale = self._cache_cfg.keyspace(ks.name).stale or self._cache_cfg.stale
+        if stale.enabled:
+            expire *= 1 + stale.grace
+        return expire
+
+    async def _store_many(
+        self,
+        items: Sequence[tuple[Key, bytes, timedelta | None]],
+        *,
+        tags: Sequence[str] = (),
+        silent: bool = True,
+    ):
+        if len(items) == 0:
+            return
+
+        try:
+            with metrics.observe(items[0][0].ks.name, "set"):
+                await self._store(items, tags)
+        except Exception as e:
+            if not silent:
+                raise e
+
+    async def _store(self, items: Sequence[tuple[Key, bytes, timedelta | None]], tags: Sequence[str]):
+        key_strs = [self._key_str(key) for key, _, _ in items]
+        written: list[tuple[LocalCache[bytes], str, bytes, timedelta | None]] = []
+
+        async def store(shard: Shard, positions: list[int]):
+            broadcast: list[str] = []
+            async with shard.redis.pipeline(transaction=False) as pipe:
+                for i in positions:
+                    # tag sets are routed along with the keys, they follow them in the positions
+                    if i >= len(items):
+                        await self._tag(pipe, tags[i - len(items)], items)
+                        continue
+
+                    key, data, expire = items[i]
+                    pipe.set(key_strs[i], data, px=expire)  # ms precision, jittered ttls are fractional
+                    metrics.PAYLOAD_SIZE.labels(key.ks.name, "write").observe(len(data))
+
+                    local = self._local(key.ks)
+                    if local is not None:
+                        local.evict(key_strs[i])
+                        broadcast.append(key_strs[i])
+                        # redis tracks the keys a connection reads, not the ones it writes, so with tracking a
+                        # written value is left to the next read, which tracks it
+                        if not self._cache_cfg.tracking and self._admit(key.ks, key_strs[i]):
+                            written.append((local, key_strs[i], data, expire))
+                    elif key.ks.name in self._watchers:
+                        broadcast.append(key_strs[i])
+                    self._notify(key.ks.name, key_strs[i])
+
+                if len(broadcast) != 0:
+                    self._broadcast(pipe, broadcast)
+
+                await pipe.execute()
+
+        await self._each_shard([*key_strs, *(self._tag_key(tag) for tag in tags)], store)
+
+        for local, key_str, data, expire in written:
+            local.put(key_str, data, ttl=expire.total_seconds() if expire is not None else None)
+
+    async def invalidate(self, key: Key, silent: bool = True):
+        await self.invalidate_many([key], silent=silent)
+
+    async def invalidate_many(self, keys: Sequence[Key], silent: bool = True):
+        """Delete several keys with a single DEL per shard"""
+        if len(keys) == 0:
+            return
+
+        await self._sync(*(key.ks for key in keys))
+        try:
+            with metrics.observe(keys[0].ks.name, "invalidate"):
+                key_strs = [self._key_str(key) for key in keys]
+                await self._delete(key_strs)
+        except Exception as e:
+            if not silent:
+                raise e
+
+    async def invalidate_tag(self, *tags: str, silent: bool = True):
+        """Delete every key stored with any of `tags`.
+
+        Tag sets are read and dropped atomically, members are deleted with a single DEL afterwards.
+        A member stored after the snapshot is tracked by a fresh tag set, so it is not lost.
+        """
+        if len(tags) == 0:
+            return
+
+        try:
+            key_strs: set[str] = set()
+
+            async def pop(shard: Shard, positions: list[int]):
+                async with shard.redis.pipeline(transaction=True) as pipe:
+                    for i in positions:
+                        pipe.smembers(tag_keys[i])
+                        pipe.delete(tag_keys[i])
+                    results = await pipe.execute()
+
+                for members in results[::2]:
+                    key_strs.update(member.decode() for member in members)
+
+            with metrics.observe(tags[0].split(":", 1)[0], "invalidate_tag"):
+                tag_keys = [self._tag_key(tag) for tag in tags]
+                await self._each_shard(tag_keys, pop)
+
+                if len(key_strs) != 0:
+                    await self._delete(list(key_strs))
+        except Exception as e:
+            if not silent:
+                raise e
+
+    async def _delete(self, key_strs: list[str]):
+        async def delete(shard: Shard, positions: list[int]):
+            broadcast: list[str] = []
+            for i in positions:
+                ks_name = keyspace_name(key_strs[i])
+                local = self._local(Keyspace(ks_name))
+                if local is not None:
+                    self._evict_local(local, ks_name, key_strs[i])
+                    broadcast.append(key_strs[i])
+                elif ks_name in self._watchers:
+                    broadcast.append(key_strs[i])
+                self._notify(ks_name, key_strs[i])
+
+            async with shard.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*(key_strs[i] for i in positions))
+                if len(broadcast) != 0:
+                    self._broadcast(pipe, broadcast)
+                await pipe.execute()
+
+        await self._each_shard(key_strs, delete)
+
+    async def get_or_load(
+        self,
+        key: Key,
+        loader: Callable[[], Awaitable[T | None]],
+        *,
+        t: type[T],
+        expire: timedelta | None = None,
+        tags: Sequence[str] = (),
+    ) -> T | None:
+        """Read-through get: on miss call `loader` once per key across concurrent callers and store the result.
+
+        Concurrent misses inside the worker await the same loader call, and a short redis lock makes
+        misses in other workers wait for the stored value instead of running their own loader.
+        Errors raised by `loader` are propagated to every waiting caller.
+
+        A stale value (see `configs.cache.Stale`) is returned at once and refreshed by `loader` in the background.
+        """
+        await self._sync(key.ks)
+        hit, value, freshness = await self._lookup(key, t=t)
+        if hit:
+            if freshness != "fresh":
+                self._count_refresh_due(key.ks, freshness)
+                self._revalidate(
+                    key.ks, [self._key_str(key)], lambda: self._refresh(key, loader, expire=expire, tags=tags)
+                )
+            return value
+
+        return await self._flights.do(
+            self._key_str(key), lambda: self._load(key, loader, t=t, expire=expire, tags=tags)
+        )
+
+    async def _load(
+        self,
+        key: Key,
+        loader: Callable[[], Awaitable[T | None]],
+        *,
+        t: type[T],
+        expire: timedelta | None,
+        tags: Sequence[str],
+    ) -> T | None:
+        lock = self.lock(self._key_str(key), timeout=self.LOAD_LOCK_TIMEOUT)
+
+        try:
+            acquired = await lock.acquire()
+        except Exception:
+            # redis is unavailable, load without coordination
+            acquired = False
+        else:
+            if not acquired:
+                hit, value = await self._wait_for_load(key, lock, t=t)
+                if hit:
+                    return value
+
+        try:
+            if acquired:
+                # the value could have been stored between our miss and acquiring the lock
+                hit, value, _ = await self._lookup(key, t=t)
+                if hit:
+                    return value
+
+            started = time.perf_counter()
+            value = await loader()
+            if value is not None:
+                await self.set(key, value, expire=expire, tags=tags, recompute=time.perf_counter() - started)
+            else:
+                await self.tombstone(key)
+
+            return value
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except Exception:
+                    pass  # the lock expired, nothing to release
+
+    async def _wait_for_load(self, key: Key, lock: Lock, *, t: type[T]) -> tuple[bool, T | None]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.LOAD_LOCK_TIMEOUT.total_seconds()
+
+        while loop.time() < deadline:
+            await asyncio.sleep(self.LOAD_POLL_INTERVAL.total_seconds())
+
+            hit, value, _ = await self._lookup(key, t=t)
+            if hit:
+                return hit, value
+
+            try:
+                if not await lock.locked():
+                    # the holder finished without storing anything (e.g. redis write failed), load on our own
+                    return False, None
+            except Exception:
+                return False, None
+
+        return False, None
+
+    async def _refresh(
+        self,
+        key: Key,
+        loader: Callable[[], Awaitable[T | None]],
+        *,
+        expire: timedelta | None,
+        tags: Sequence[str],
+    ) -> bool:
+        # shares the lock with _load, so a stale key is refreshed by one worker at a time
+        lock = self.lock(self._key_str(key), timeout=self.LOAD_LOCK_TIMEOUT)
+        if not await lock.acquire():
+            return False
+
+        try:
+            started = time.perf_counter()
+            value = await loader()
+            if value is not None:
+                await self.set(key, value, expire=expire, tags=tags, recompute=time.perf_counter() - started)
+            else:
+                await self.tombstone(key)
+
+            return True
+        finally:
+            try:
+                await lock.release()
+            except Exception:
+                pass  # the lock expired, nothing to release
+
+    async def _refresh_many(
+        self,
+        ks: Keyspace,
+        ids: list[str],
+        loader: Callable[[list[str]], Awaitable[list[E]]],
+        *,
+        expire: timedelta | None,
+    ) -> bool:
+        # batches are refreshed without the lock, at worst every worker reloads the same batch once
+        started = time.perf_counter()
+        loaded = {value.id.hex: value for value in await loader(ids)}
+        await self.set_many(
+            [(ks.key(id), value, expire) for id, value in loaded.items()],
+            recompute=time.perf_counter() - started,
+        )
+
+        gone = [(ks.key(id), codec.tombstone(), self.NEGATIVE_FEAT) for id in ids if id not in loaded]
+        await self._store_many(gone)
+
+        return True
+
+    def _revalidate_many(
+        self,
+        ks: Keyspace,
+        due: list[tuple[str, Freshness]],
+        loader: Callable[[list[str]], Awaitable[list[E]]],
+        *,
+        expire: timedelta | None,
+    ):
+        for _, freshness in due:
+            self._count_refresh_due(ks, freshness)
+
+        ids = [id for id, _ in due if self._key_str(ks.key(id)) not in self._refreshes]
+        if len(ids) != 0:
+            self._revalidate(
+                ks,
+                [self._key_str(ks.key(id)) for id in ids],
+                lambda: self._refresh_many(ks, ids, loader, expire=expire),
+            )
+
+    def _revalidate(self, ks: Keyspace, key_strs: list[str], refresh: Callable[[], Coroutine[Any, Any, bool]]):
+        """Run `refresh` in the background unless one of `key_strs` is already being refreshed by this worker"""
+        if any(key_str in self._refreshes for key_str in key_strs):
+            return
+
+        task = asyncio.create_task(refresh())
+        for key_str in key_strs:
+            self._refreshes[key_str] = task
+        task.add_done_callback(lambda done: self._on_refreshed(ks, key_strs, done))
+
+    def _count_refresh_due(self, ks: Keyspace, freshness: Freshness):
+        if freshness == "stale":
+            metrics.STALE_SERVED.labels(ks.name).inc()
+        elif freshness == "early":
+            metrics.EARLY_REFRESHES.labels(ks.name).inc()
+
+    def _on_refreshed(self, ks: Keyspace, key_strs: list[str], task: asyncio.Task[bool]):
+        for key_str in key_strs:
+            if self._refreshes.get(key_str) is task:
+                del self._refreshes[key_str]
+
+        if task.cancelled():
+            return
+
+        e = task.exception()
+        if e is not None:
+            metrics.REFRESHES.labels(ks.name, "error").inc()
+            logger.warning("failed to refresh stale cache value", keys=key_strs, exc_info=e)
+        else:
+            metrics.REFRESHES.labels(ks.name, "ok" if task.result() else "skipped").inc()
+
+    async def _lookup(self, key: Key, *, t: type[T]) -> tuple[bool, T | None, Freshness]:
+        """Returns (hit, value, freshness): a tombstone is a hit with None, a miss or cache failure is not a hit"""
+        try:
+            value = await self._fetch(key)
+        except Exception:
+            return False, None, "fresh"
+
+        if value is None:
+            return False, None, "fresh"
+
+        if codec.is_tombstone(value):
+            return True, None, "fresh"
+
+        decoded = self._decode(key.ks, value, t=t)
+        if decoded is None:
+            return False, None, "fresh"
+
+        return True, decoded, self._freshness(key.ks, value)
+
+    def _freshness(self, ks: Keyspace, value: bytes) -> Freshness:
+        fresh_until, recompute = codec.timing(value)
+        if fresh_until is None:
+            return "fresh"
+
+        now = time.time()
+        if fresh_until <= now:
+            return "stale"
+
+        # XFetch: the closer to expiry and the slower the value is to compute, the likelier an early refresh
+        beta = (self._cache_cfg.keyspace(ks.name).expiry or self._cache_cfg.expiry).beta
+        if recompute is not None and beta > 0:
+            if now - recompute * beta * math.log(1 - random.random()) >= fresh_until:
+                return "early"
+
+        return "fresh"
+
+    async def _adapt(self, items: Sequence[tuple[Key, Any, timedelta | None]]) -> list[timedelta | None]:
+        """Replace the ttls of adaptive keyspaces with ones derived from the write statistics of each key"""
+        expires = [expire for _, _, expire in items]
+        adaptive = [
+            i for i, (key, _, expire) in enumerate(items) if expire is not None and self._adaptive_cfg(key.ks).enabled
+        ]
+        if len(adaptive) == 0:
+            return expires
+
+        writes_keys = [self._writes_key(self._key_str(items[i][0])) for i in adaptive]
+        stats: list[list[bytes | None]] = [[None, None]] * len(adaptive)
+
+        async def read(shard: Shard, positions: list[int]):
+            async with shard.redis.pipeline(transaction=False) as pipe:
+                for i in positions:
+                    pipe.hmget(writes_keys[i], ["at", "interval"])
+                for i, found in zip(positions, await pipe.execute(), strict=True):
+                    stats[i] = found
+
+        try:
+            with metrics.observe(items[adaptive[0]][0].ks.name, "adapt"):
+                await self._each_shard(writes_keys, read)
+        except Exception:
+            return expires  # keep the ttls chosen by the caller
+
+        now = time.time()
+        for i, (at, interval) in zip(adaptive, stats, strict=True):
+            base = expires[i]
+            if at is None or base is None:
+                continue  # no writes recorded yet, nothing to go by
+
+            cfg = self._adaptive_cfg(items[i][0].ks)
+            quiet = now - float(at)
+            if interval is None:
+                # a single write says nothing about how often the key changes, it starts at the ttl chosen by the
+                # caller and only a long quiet time extends it
+                seconds = max(quiet * cfg.factor, base.total_seconds())
+            else:
+                # a key quiet for longer than its usual interval is likely to stay quiet
+                seconds = max(quiet, float(interval)) * cfg.factor
+            expires[i] = timedelta(seconds=min(max(seconds, cfg.min), cfg.max))
+
+        return expires
+
+    def _adaptive_cfg(self, ks: Keyspace) -> configs.cache.Adaptive:
+        return self._cache_cfg.keyspace(ks.name).adaptive or self._cache_cfg.adaptive
+
+    def _writes_key(self, key_str: str) -> str:
+        return f"writes:{key_str}"
+
+    def _expiry(self, ks: Keyspace, expire: timedelta | None) -> tuple[float | None, timedelta | None]:
+        """Returns the time the value turns stale at and how long redis should keep it, both jittered"""
+        if expire is None:
+            return None, None
+
+        ks_cfg = self._cache_cfg.keyspace(ks.name)
+        expire = expire * (1 - random.uniform(0, (ks_cfg.expiry or self._cache_cfg.expiry).jitter))
+        fresh_until = time.time() + expire.total_seconds()
+
+        stale = ks_cfg.stale or self._cache_cfg.stale
+        if not stale.enabled:
+            return fresh_until, expire
+
+        return fresh_until, expire * (1 + stale.grace)
+
+    def _check(self, ks: Keyspace, value: pydantic.BaseModel | dict):
+        # list queries are stored next to the entities they list
+        if ks.t is not None and not isinstance(value, ks.t | IDList):
+            raise codec.CodecError(f"{type(value).__name__} does not belong to keyspace {ks.name} of {ks.t.__name__}")
+
+    def _decode(self, ks: Keyspace, value: bytes | None, *, t: type[T], silent: bool = True) -> T | None:
+        if value is None or codec.is_tombstone(value):
+            return None
+
+        try:
+            return codec.decode(value, t)
+        except Exception as e:
+            metrics.ERRORS.labels(ks.name, "decode").inc()
+            if not silent:
+                raise e
+            return None
+
+    async def hydrate(
+        self,
+        ks: Keyspace,
+        ids: list[str],
+        loader: Callable[[list[str]], Awaitable[list[E]]],
+        *,
+        t: type[E],
+        expire: timedelta | None = None,
+    ) -> list[E]:
+        """Resolve entity ids (hex) through the per-entity keys, loading and storing the missing ones.
+
+        Order of `ids` is preserved, ids the loader did not return (e.g. deleted meanwhile) are skipped.
+        """
+        await self._sync(ks)
+        try:
+            values = await self._fetch_many([ks.key(id) for id in ids])
+        except Exception:
+            values = [None] * len(ids)
+
+        cached: list[E | None] = []
+        missing: list[str] = []
+        due: list[tuple[str, Freshness]] = []
+        for id, value in zip(ids, values, strict=True):
+            if value is not None and codec.is_tombstone(value):
+                cached.append(None)  # known to be gone, no need to ask the loader
+                continue
+
+            decoded = self._decode(ks, value, t=t)
+            if decoded is None:
+                missing.append(id)
+            elif value is not None and (freshness := self._freshness(ks, value)) != "fresh":
+                due.append((id, freshness))
+            cached.append(decoded)
+
+        self._revalidate_many(ks, due, loader, expire=expire)
+
+        loaded: dict[str, E] = {}
+        if len(missing) != 0:
+            started = time.perf_counter()
+            for value in await loader(missing):
+                loaded[value.id.hex] = value
+            await self.set_many(
+                [(ks.key(id), value, expire) for id, value in loaded.items()],
+                recompute=time.perf_counter() - started,
+            )
+
+        result: list[E] = []
+        for id, value in zip(ids, cached, strict=True):
+            value = value if value is not None else loaded.get(id)
+            if value is not None:
+                result.append(value)
+
+        return result
+
+    async def _fetch(self, key: Key) -> bytes | None:
+        key_str = self._key_str(key)
+
+        with metrics.observe(key.ks.name, "get"):
+            self._record(key.ks, key_str)
+
+            local = self._local(key.ks)
+            if local is None:
+                value = await self._shard(key_str).redis.get(key_str)
+                self._count_read(key.ks, value)
+                return value
+
+            value = local.get(key_str)
+            if value is not None:
+                metrics.HITS.labels(key.ks.name, "local").inc()
+                return value
+
+            epoch = local.epoch
+            value = await self._shard(key_str).redis.get(key_str)
+            self._count_read(key.ks, value)
+            if value is not None and self._admit(key.ks, key_str):
+                local.put(key_str, value, epoch=epoch)
+
+            return value
+
+    async def _fetch_many(self, keys: Sequence[Key]) -> list[bytes | None]:
+        values: list[bytes | None] = [None] * len(keys)
+        if len(keys) == 0:
+            return values
+
+        with metrics.observe(keys[0].ks.name, "get_many"):
+            key_strs = [self._key_str(key) for key in keys]
+
+            # serve what we can from the in-process tier, the rest goes into a single MGET per shard
+            remote: list[int] = []
+            epochs: dict[int, int] = {}
+            for i, key in enumerate(keys):
+                self._record(key.ks, key_strs[i])
+
+                local = self._local(key.ks)
+                if local is not None:
+                    values[i] = local.get(key_strs[i])
+                    epochs[i] = local.epoch
+
+                if values[i] is None:
+                    remote.append(i)
+                else:
+                    metrics.HITS.labels(key.ks.name, "local").inc()
+
+            if len(remote) == 0:
+                return values
+
+            for i, value in zip(remote, await self._mget([key_strs[i] for i in remote]), strict=True):
+                values[i] = value
+                self._count_read(keys[i].ks, value)
+
+                local = self._local(keys[i].ks)
+                if value is not None and local is not None and self._admit(keys[i].ks, key_strs[i]):
+                    local.put(key_strs[i], value, epoch=epochs[i])
+
+            return values
+
+    def _count_read(self, ks: Keyspace, value: bytes | None):
+        if value is None:
+            metrics.MISSES.labels(ks.name).inc()
+            return
+
+        metrics.HITS.labels(ks.name, "redis").inc()
+        metrics.PAYLOAD_SIZE.labels(ks.name, "read").observe(len(value))
+
+    def _shard(self, key_str: str) -> Shard:
+        return self._shards[self._ring.node(key_str)]
+
+    async def _each_shard(self, key_strs: Sequence[str], run: Callable[[Shard, list[int]], Awaitable[None]]):
+        """Call `run` with every shard owning some of `key_strs` and the positions of its keys, concurrently"""
+        if len(self._shards) == 1:
+            await run(self._shards[0], list(range(len(key_strs))))
+            return
+
+        positions: dict[int, list[int]] = {}
+        for i, key_str in enumerate(key_strs):
+            positions.setdefault(self._ring.node(key_str), []).append(i)
+
+        await asyncio.gather(*(run(self._shards[index], owned) for index, owned in positions.items()))
+
+    async def _mget(self, key_strs: Sequence[str]) -> list[bytes | None]:
+        """MGET across shards, one per shard, all of them at once"""
+        values: list[bytes | None] = [None] * len(key_strs)
+
+        async def mget(shard: Shard, positions: list[int]):
+            for i, value in zip(positions, await shard.redis.mget([key_strs[i] for i in positions]), strict=True):
+                values[i] = value
+
+        await self._each_shard(key_strs, mget)
+        return values
+
+    def _tag_key(self, tag: str) -> str:
+        return f"tag:{tag}"
+
+    async def _tag(self, pipe: Pipeline, tag: str, items: Sequence[tuple[Key, Any, timedelta | None]]):
+        tag_key = self._tag_key(tag)
+        pipe.sadd(tag_key, *(self._key_str(key) for key, _, _ in items))
+
+        # the tag set has to outlive every member, otherwise invalidate_tag would miss them
+        expires = [expire for _, _, expire in items]
+        if any(expire is None for expire in expires):
+            pipe.persist(tag_key)
+        else:
+            # PEXPIRE NX / GT would do, but they need redis 7 and a failed pipeline silently drops the whole write
+            ttl = max(expires)  # type: ignore
+            await self._extend_ttl(keys=[tag_key], args=[math.ceil(ttl / timedelta(milliseconds=1))], client=pipe)
+
+    def _local(self, ks: Keyspace) -> LocalCache[bytes] | None:
+        if ks.name not in self._locals:
+            cfg = self._cache_cfg.keyspace(ks.name).local or self._cache_cfg.local
+            hot = self._cache_cfg.hotkeys
+            on_evict = functools.partial(self._count_eviction, ks.name)
+            if cfg.enabled:
+                self._locals[ks.name] = LocalCache(cfg.max_size, cfg.ttl, on_evict=on_evict)
+            elif hot.enabled and hot.promote:
+                self._locals[ks.name] = LocalCache(hot.top, hot.local_ttl, on_evict=on_evict)
+                self._promoted.add(ks.name)
+            else:
+                self._locals[ks.name] = None
+
+        return self._locals[ks.name]
+
+    def _admit(self, ks: Keyspace, key_str: str) -> bool:
+        """Whether a value may be stored in the keyspace's in-process tier"""
+        if ks.name not in self._promoted:
+            return True
+
+        hotkeys = self._hotkeys.get(ks.name)
+        return hotkeys is not None and hotkeys.is_hot(key_str)
+
+    def _record(self, ks: Keyspace, key_str: str):
+        if not self._cache_cfg.hotkeys.enabled:
+            return
+
+        hotkeys = self._hotkeys.get(ks.name)
+        if hotkeys is None:
+            hotkeys = self._hotkeys[ks.name] = HotKeys(self._cache_cfg.hotkeys)
+        hotkeys.record(key_str)
+
+    def _extend(self, key: Key, expire: timedelta | None) -> timedelta | None:
+        """Hot keys are kept longer, they would be reloaded soon anyway"""
+        if expire is None:
+            return None
+
+        hotkeys = self._hotkeys.get(key.ks.name)
+        if hotkeys is None or not hotkeys.is_hot(self._key_str(key)):
+            return expire
+
+        return expire * self._cache_cfg.hotkeys.extend
+
+    def _evict_local(self, local: LocalCache[bytes], ks_name: str, key_str: str):
+        if local.evict(key_str):
+            self._count_eviction(ks_name, "invalidated")
+
+    def _count_eviction(self, ks_name: str, reason: str):
+        metrics.EVICTIONS.labels(ks_name, reason).inc()
+
+    async def _sync(self, *keyspaces: Keyspace):
+        """Read the generations of `keyspaces` from redis when our copies are older than `GENERATION_TTL`"""
+        now = time.monotonic()
+        due: dict[str, Keyspace] = {}
+        for ks in keyspaces:
+            if now - self._synced.get(ks.name, -math.inf) >= self.GENERATION_TTL.total_seconds():
+                due[ks.name] = ks
+        if len(due) == 0:
+            return
+
+        # marked before the round trip, so concurrent callers do not read them too
+        for name in due:
+            self._synced[name] = now
+
+        try:
+            generations = await self._mget([self._generation_key(name) for name in due])
+        except Exception:
+            return  # keep the generations we have, the operation itself reports the redis error
+
+        for ks, generation in zip(due.values(), generations, strict=True):
+            self._set_generation(ks, int(generation or 0))
+
+    def _set_generation(self, ks: Keyspace, generation: int):
+        if generation == self.generation(ks):
+            return
+
+        self._generations[ks.name] = generation
+        # entries of the previous generation can not be read anymore, do not let them take up the space
+        local = self._locals.get(ks.name)
+        if local is not None:
+            local.clear()
+        self._notify(ks.name, None)
+
+    def _prefix(self, ks: Keyspace) -> str:
+        generation = self.generation(ks)
+        return f"{ks.prefix}#{generation}" if generation != 0 else ks.prefix
+
+    def _key_str(self, key: Key) -> str:
+        """The key as stored, in the current generation of its keyspace"""
+        return f"{self._prefix(key.ks)}:{':'.join(key.path)}"
+
+    def _generation_key(self, ks_name: str) -> str:
+        # must outlive the entries, so it is stored without a ttl
+        return f"{self.GENERATION_PREFIX}{ks_name}"
+
+    def _broadcast(self, pipe: Pipeline, key_strs: list[str]):
+        if self._cache_cfg.tracking:
+            return  # redis notifies the other workers that read these keys on its own
+
+        pipe.publish(self._cache_cfg.channel, self._invalidation_message(*key_strs))
+
+    def _invalidation_message(self, *keys: str) -> str:
+        return json.dumps({"origin": self._origin, "keys": keys})
+
+    def _on_invalidation(self, data: bytes):
+        message = json.loads(data)
+        if message["origin"] == self._origin:
+            return
+
+        self._evict_keys(message["keys"])
+
+    def _on_tracking_invalidation(self, data: list[bytes] | None):
+        if data is None:
+            # the whole database was flushed
+            self._clear_locals()
+            self._synced.clear()
+            return
+
+        self._evict_keys([key.decode() for key in data])
+
+    def _evict_keys(self, key_strs: list[str]):
+        for key_str in key_strs:
+            if key_str.startswith(self.GENERATION_PREFIX):
+                # the keyspace was bumped, its generation is read again on next use
+                ks_name = key_str.removeprefix(self.GENERATION_PREFIX)
+                self._synced.pop(ks_name, None)
+                self._notify(ks_name, None)
+                continue
+
+            ks_name = keyspace_name(key_str)
+            local = self._locals.get(ks_name)
+            if local is not None:
+                self._evict_local(local, ks_name, key_str)
+            self._notify(ks_name, key_str)
+
+    def _clear_locals(self):
+        for local in self._locals.values():
+            if local is not None:
+                local.clear()
+        for ks_name in self._watchers:
+            self._notify(ks_name, None)
+
+    def _notify(self, ks_name: str, key_str: str | None):
+        watchers = self._watchers.get(ks_name, ())
+        if len(watchers) == 0:
+            return
+
+        # watchers are told the keys as `Key.as_str` builds them, without the generation they are stored under
+        key_str = _GENERATION.sub("", key_str, count=1) if key_str is not None else None
+        for on_change in watchers:
+            try:
+                on_change(key_str)
+            except Exception as e:
+                logger.warning("cache watcher failed", keyspace=ks_name, exc_info=e)
+
+    async def _on_connect(self, shard: Shard, connection: AbstractConnection):
+        """Turn on tracking for every pooled connection, invalidations go to the subscriber connection of the shard"""
+        await connection.on_connect()
+        if shard.tracking_id is None:
+            return  # not subscribed yet, the connection is reconnected on checkout once we are
+
+        # recorded even when it fails, so the connection is not reconnected on every checkout
+        shard.redirects[connection] = shard.tracking_id
+        try:
+            await connection.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", shard.tracking_id, check_health=False)
+            await connection.read_response()
+        except ResponseError as e:
+            # the subscriber is gone, entries read through this connection are bounded by the local ttl only
+            logger.warning("failed to enable cache key tracking", exc_info=e)
+
+    async def _track(self, shard: Shard, pubsub: PubSub):
+        await pubsub.connect()
+        assert pubsub.connection is not None
+        await pubsub.connection.send_command("CLIENT", "ID")
+        tracking_id = await pubsub.connection.read_response()
+        await pubsub.subscribe(self.TRACKING_CHANNEL)
+
+        # pooled connections redirect to the previous subscriber or do not track at all yet, see `TrackingPool`
+        shard.tracking_id = tracking_id
+
+    async def _listen(self, shard: Shard):
+        while True:
+            try:
+                async with shard.subscriber.pubsub() as pubsub:
+                    if self._cache_cfg.tracking:
+                        await self._track(shard, pubsub)
+                    else:
+                        await pubsub.subscribe(self._cache_cfg.channel)
+
+                    # invalidations could have been missed while we were not subscribed, as the keys of a shard
+                    # are spread over every keyspace the whole in-process tier goes
+                    self._clear_locals()
+                    self._synced.clear()
+                    shard.subscribed.set()
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+
+                        if message["channel"] == self.TRACKING_CHANNEL:
+                            self._on_tracking_invalidation(message["data"])
+                        else:
+                            self._on_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("cache invalidation listener failed, resubscribing", shard=shard.name, exc_info=e)
+                await asyncio.sleep(1)
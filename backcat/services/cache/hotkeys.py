@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from array import array
+
+from backcat import configs
+
+
+class CountMinSketch:
+    """Approximate per-key counters in fixed memory, estimates never undercount.
+
+    Counters are halved every `window` seconds, so the estimates follow recent traffic rather than the
+    whole lifetime of the worker.
+    """
+
+    def __init__(self, width: int, depth: int, window: float):
+        self._width = width
+        self._rows = [array("L", bytes(8 * width)) for _ in range(depth)]
+        self._window = window
+        self._decay_at = time.monotonic() + window
+
+    def add(self, key: str) -> int:
+        """Count one access of `key` and return its estimate"""
+        # rows are indexed by double hashing over the two halves of one hash, seeded tuple hashes are correlated
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+
+        estimate = -1
+        for n, row in enumerate(self._rows):
+            i = (h1 + n * h2) % self._width
+            row[i] += 1
+            estimate = row[i] if estimate < 0 else min(estimate, row[i])
+
+        return estimate
+
+    def decay(self) -> bool:
+        """Halve the counters when the window is over, returns whether they were halved"""
+        now = time.monotonic()
+        if now < self._decay_at:
+            return False
+
+        for row in self._rows:
+            for i, count in enumerate(row):
+                if count != 0:
+                    row[i] = count >> 1
+        self._decay_at = now + self._window
+        return True
+
+
+class HotKeys:
+    """Top-k most read keys of a keyspace in this worker, estimated with a count-min sketch"""
+
+    def __init__(self, cfg: configs.cache.HotKeys):
+        self._sketch = CountMinSketch(cfg.width, cfg.depth, cfg.window)
+        self._k = cfg.top
+        self._threshold = cfg.threshold
+        self._top: dict[str, int] = {}
+        self._floor = 0  # lower bound of the estimates in a full top, keys at or below it cannot get in
+
+    def record(self, key: str):
+        if self._sketch.decay():
+            self._top = {tracked: count >> 1 for tracked, count in self._top.items() if count > 1}
+            self._floor = min(self._top.values(), default=0)
+
+        estimate = self._sketch.add(key)
+        if key in self._top or len(self._top) < self._k:
+            self._top[key] = estimate
+            return
+
+        if estimate <= self._floor:
+            return
+
+        coldest = min(self._top, key=self._top.__getitem__)
+        self._floor = self._top[coldest]
+        if estimate > self._floor:
+            del self._top[coldest]
+            self._top[key] = estimate
+
+    def is_hot(self, key: str) -> bool:
+        return self._top.get(key, 0) >= self._threshold
+
+    def top(self) -> list[tuple[str, int]]:
+        """Tracked keys with their estimated reads in the current window, hottest first"""
+        return sorted(self._top.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Literal
+
+type EvictReason = Literal["capacity", "expired"]
+
+
+class LocalCache[V]:
+    """Bounded in-process LRU with per-entry TTL.
+
+    Every worker owns its own instance, so entries are never shared between processes. Staleness is bounded
+    by the TTL and by invalidation messages delivered through redis pub/sub.
+    """
+
+    def __init__(self, max_size: int, ttl: float, *, on_evict: Callable[[EvictReason], None] | None = None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._on_evict = on_evict
+        self._data: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        # epoch is bumped on every eviction, so a value fetched before an eviction is never stored after it
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def nbytes(self) -> int:
+        """Total size of the stored values, walks every entry, values must be bytes"""
+        return sum(len(value) for _, value in self._data.values())  # type: ignore
+
+    def get(self, key: str) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            if self._on_evict is not None:
+                self._on_evict("expired")
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: V, *, ttl: float | None = None, epoch: int | None = None):
+        if self._max_size == 0:
+            return
+
+        if epoch is not None and epoch != self._epoch:
+            # the key (or the whole cache) was invalidated while the value was in flight
+            return
+
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict("capacity")
+
+    def evict(self, key: str) -> bool:
+        """Drop `key`, returns whether it was present"""
+        self._epoch += 1
+        return self._data.pop(key, None) is not None
+
+    def clear(self):
+        self._epoch += 1
+        self._data.clear()
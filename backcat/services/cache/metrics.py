@@ -0,0 +1,100 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Histogram
+
+HITS = Counter(
+    "backcat_cache_hits",
+    "Lookups answered by the cache by tier (local, redis), tombstones included",
+    ["keyspace", "tier"],
+)
+
+MISSES = Counter(
+    "backcat_cache_misses",
+    "Lookups that found no value in any tier",
+    ["keyspace"],
+)
+
+STALE_SERVED = Counter(
+    "backcat_cache_stale_served",
+    "Values served after their soft ttl while a refresh is scheduled",
+    ["keyspace"],
+)
+
+EARLY_REFRESHES = Counter(
+    "backcat_cache_early_refreshes",
+    "Fresh values picked for probabilistic early recomputation",
+    ["keyspace"],
+)
+
+REFRESHES = Counter(
+    "backcat_cache_refreshes",
+    "Background refreshes of stale values by result (ok, skipped when another worker holds the lock, error)",
+    ["keyspace", "result"],
+)
+
+ERRORS = Counter(
+    "backcat_cache_errors",
+    "Cache operations that failed and were swallowed (or raised when not silent)",
+    ["keyspace", "op"],
+)
+
+EVICTIONS = Counter(
+    "backcat_cache_local_evictions",
+    "Entries dropped from the in-process tier by reason (capacity, expired, invalidated)",
+    ["keyspace", "reason"],
+)
+
+DURATION = Histogram(
+    "backcat_cache_operation_duration_seconds",
+    "Latency of cache operations as seen by the caller",
+    ["keyspace", "op"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+PAYLOAD_SIZE = Histogram(
+    "backcat_cache_payload_bytes",
+    "Size of values read from and written to redis, envelope included",
+    ["keyspace", "op"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+AUDIT_CHECKS = Counter(
+    "backcat_cache_audit_checks",
+    "Cached entities compared with the database by result (consistent, outdated, deleted, tombstoned, undecodable)",
+    ["keyspace", "result"],
+)
+
+AUDIT_STALENESS = Histogram(
+    "backcat_cache_audit_staleness_seconds",
+    "How long divergent cached entities had been out of date with the database when found",
+    ["keyspace"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 21600, 86400),
+)
+
+PRINCIPALS = Counter(
+    "backcat_cache_principals",
+    "Authenticated user lookups by where the user came from (hit: the worker's principal cache, miss: the user repo)",
+    ["result"],
+)
+
+REVOCATIONS = Counter(
+    "backcat_cache_revocations",
+    "Revoked token checks by where they were answered (local: the worker's revoked set, redis: a lookup while "
+    "the set is not in sync)",
+    ["source"],
+)
+
+
+@contextmanager
+def observe(keyspace: str, op: str) -> Iterator[None]:
+    """Time the block into DURATION and count it in ERRORS when it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ERRORS.labels(keyspace, op).inc()
+        raise
+    finally:
+        DURATION.labels(keyspace, op).observe(time.perf_counter() - started)
@@ -0,0 +1,44 @@
+import hashlib
+import json
+
+import pydantic
+
+from backcat.services.cache.codec import CodecName
+from backcat.services.cache.core import Keyspace
+
+
+class RegistryError(Exception): ...
+
+
+KEYSPACES: dict[str, Keyspace] = {}
+"""every registered keyspace by name"""
+
+
+def register(name: str, t: type[pydantic.BaseModel] | None = None, *, codec: CodecName | None = None) -> Keyspace:
+    """Bind the keyspace `name` to the type of its values and optionally a codec other than `configs.Cache.codec`.
+
+    Keyspaces are registered once, at import time, so two owners of the same name fail the startup instead of
+    overwriting each other's values. Typed keyspaces get the schema fingerprint of `t` in their key prefix,
+    see `fingerprint`. Untyped ones hold plain dicts.
+    """
+    if any(c in name for c in ":@#"):
+        raise RegistryError(f"invalid keyspace name: {name}")
+
+    registered = KEYSPACES.get(name)
+    if registered is not None:
+        owner = registered.t.__name__ if registered.t is not None else "dict"
+        raise RegistryError(f"keyspace {name} is already registered for {owner}")
+
+    ks = Keyspace(name, t=t, codec=codec, fingerprint=fingerprint(t) if t is not None else None)
+    KEYSPACES[name] = ks
+    return ks
+
+
+def fingerprint(t: type[pydantic.BaseModel]) -> str:
+    """Short hash of the json schema of `t`.
+
+    It changes with the fields of the model and their types, so a deploy that changes the model reads and writes
+    new keys instead of validating the old values against the new schema.
+    """
+    schema = json.dumps(t.model_json_schema(), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(schema.encode(), digest_size=4).hexdigest()
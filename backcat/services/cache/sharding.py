@@ -0,0 +1,34 @@
+import bisect
+import hashlib
+from collections.abc import Sequence
+
+
+class Ring:
+    """Consistent hash ring, maps keys to one of `nodes` by their position on the ring.
+
+    Every node takes `REPLICAS` points on the ring, so keys spread evenly and adding or removing a node only
+    moves the keys of the ring segments next to its points, about 1/n of them.
+    Nodes are placed by name, so reordering them does not move any key.
+    """
+
+    REPLICAS = 160
+
+    def __init__(self, nodes: Sequence[str]):
+        points = sorted(
+            (_hash(f"{node}#{replica}"), i) for i, node in enumerate(nodes) for replica in range(self.REPLICAS)
+        )
+        self._size = len(nodes)
+        self._hashes = [h for h, _ in points]
+        self._nodes = [i for _, i in points]
+
+    def node(self, key: str) -> int:
+        """Index of the node owning `key`"""
+        if self._size == 1:
+            return 0
+
+        i = bisect.bisect(self._hashes, _hash(key))
+        return self._nodes[i % len(self._nodes)]
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
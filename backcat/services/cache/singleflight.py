@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one in-flight coroutine.
+
+    The call runs in its own task, so a cancelled caller (e.g. a client that went away) does not cancel
+    the work other callers are waiting for.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do[R](self, key: str, fn: Callable[[], Awaitable[R]]) -> R:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task[Any]):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        if not task.cancelled():
+            # mark the exception as retrieved, waiters (if any are left) receive it through the shield
+            task.exception()
@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from pathlib import Path
 from textwrap import dedent
 from typing import Any, Protocol, override
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from asyncpg import DataError, UniqueViolationError
 from piccolo.columns import Column
@@ -10,8 +10,8 @@ from pydantic import BaseModel, Field
 
 from backcat import database, domain
 from backcat.domain import Point
-from backcat.services import errors
-from backcat.services.cache import Cache, Keyspace
+from backcat.services import entities, errors
+from backcat.services.cache import Cache, IDList
 from backcat.services.filestorage import FileStorage
 
 
@@ -83,7 +83,7 @@ class CampingRepo(Protocol):
 
 class CampingRepoImpl(CampingRepo):
     def __init__(self, cache: Cache, file_storage: FileStorage):
-        self._ks = Keyspace("camping")
+        self._ks = entities.CAMPING.ks
         self._cache = cache
         self._fs = file_storage
 
@@ -107,8 +107,11 @@ class CampingRepoImpl(CampingRepo):
                     await database.Camping.insert(db_camping).returning(*database.Camping.all_columns()).run()
                 )[0]
                 domain_camping = database.projection(db_camping, cast_to=domain.Camping)
-                await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
-                return domain_camping
+
+            await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
+            await self._cache.invalidate_tag(self._ks.tag("lists"))
+
+            return domain_camping
         except UniqueViolationError as e:
             # unique violation error means that the camping already exists
             raise errors.ConflictError("camping already exists") from e
@@ -130,10 +133,7 @@ class CampingRepoImpl(CampingRepo):
         actor: domain.UserID,
         camping_id: domain.CampingID,
     ) -> domain.Camping | None:
-        try:
-            domain_camping = await self._cache.get(self._ks.key(camping_id.hex), t=domain.Camping)
-            if domain_camping is not None:
-                return domain_camping
+        async def load() -> domain.Camping | None:
             db_camping = (
                 await database.Camping.objects()
                 .where(
@@ -147,6 +147,11 @@ class CampingRepoImpl(CampingRepo):
                 return None
 
             return database.projection(db_camping)
+
+        try:
+            return await self._cache.get_or_load(
+                self._ks.key(camping_id.hex), load, t=domain.Camping, expire=self._cache.HOT_FEAT
+            )
         except database.ProjectionError as e:
             # projection error means that the db data was read but it was not converted to domain model
             raise errors.InternalServerError("failed to read camping") from e
@@ -187,7 +192,8 @@ class CampingRepoImpl(CampingRepo):
 
                 domain_camping = database.projection(db_camping, cast_to=domain.Camping)
 
-                await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_camping.id.hex))
+            await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
 
             return domain_camping
         except DataError as e:
@@ -225,7 +231,11 @@ class CampingRepoImpl(CampingRepo):
 
                 domain_camping = database.projection(db_camping, cast_to=domain.Camping)
 
-                await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(camping_id.hex))
+            await self._cache.tombstone(
+                self._ks.key(camping_id.hex), expire=self._cache.lifetime(self._ks, self._cache.HOT_FEAT)
+            )
+            await self._cache.invalidate_tag(self._ks.tag("lists"))
 
             return domain_camping
         except IndexError as e:
@@ -246,11 +256,7 @@ class CampingRepoImpl(CampingRepo):
         actor: domain.UserID,
         filter: FilterCamping,
     ) -> list[domain.Camping]:
-        try:
-            cache_data: dict[str, list[domain.Camping]] | None = await self._cache.get(self._ks.key(str(hash(filter))))
-            if cache_data is not None and "campings" in cache_data:
-                return cache_data["campings"]
-
+        async def load_ids() -> IDList:
             query = database.Camping.objects().where(database.Camping.deleted_at.is_null())
 
             if filter.user_id is not None:
@@ -313,11 +319,44 @@ class CampingRepoImpl(CampingRepo):
             db_campings = await query.run()
             domain_campings = [database.projection(camping, cast_to=domain.Camping) for camping in db_campings]  # type: ignore
 
-            await self._cache.set(
-                self._ks.key(str(hash(filter))), {"campings": domain_campings}, expire=self._cache.LIVE_FEAT
+            # entities go to their own keys, so the list shares them with read_camping and other lists
+            await self._cache.set_many([
+                (self._ks.key(domain_camping.id.hex), domain_camping, self._cache.HOT_FEAT)
+                for domain_camping in domain_campings
+            ])
+
+            return IDList(ids=[domain_camping.id.hex for domain_camping in domain_campings])
+
+        async def load_campings(ids: list[str]) -> list[domain.Camping]:
+            db_campings = (
+                await database.Camping.objects()
+                .where(
+                    database.Camping.id.is_in([UUID(id) for id in ids]),
+                    database.Camping.deleted_at.is_null(),
+                )
+                .run()
             )
+            return [database.projection(db_camping) for db_camping in db_campings]
 
-            return domain_campings
+        query_key = self._ks.query(filter)
+        query_tags = [self._ks.tag("lists")]
+        if filter.booked is not None:
+            # booked campings are resolved against the actor when the filter has no user, the ones left unbooked
+            # change with the bookings of every user
+            query_key = self._ks.query(filter, actor.hex)
+            booked_tag = f"user:{(filter.user_id or actor).hex}:booked"
+            query_tags.append(booked_tag if filter.booked else entities.BOOKING.ks.tag("lists"))
+
+        try:
+            campings = await self._cache.get_or_load(
+                query_key, load_ids, t=IDList, expire=self._cache.LIVE_FEAT, tags=query_tags
+            )
+            if campings is None:
+                return []
+
+            return await self._cache.hydrate(
+                self._ks, campings.ids, load_campings, t=domain.Camping, expire=self._cache.HOT_FEAT
+            )
         except database.ProjectionError as e:
             # projection error means that the db data was read but it was not converted to domain model
             raise errors.InternalServerError("failed to read camping") from e
@@ -366,7 +405,8 @@ class CampingRepoImpl(CampingRepo):
 
                 domain_camping = database.projection(db_camping, cast_to=domain.Camping)
 
-                await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_camping.id.hex))
+            await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
 
             return domain_camping
         except errors.ServiceError as e:
@@ -427,7 +467,8 @@ class CampingRepoImpl(CampingRepo):
 
                 domain_camping = database.projection(db_camping, cast_to=domain.Camping)
 
-                await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_camping.id.hex))
+            await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
 
             return domain_camping
         except errors.ServiceError as e:
@@ -488,7 +529,8 @@ class CampingRepoImpl(CampingRepo):
 
                 domain_camping = database.projection(db_camping, cast_to=domain.Camping)
 
-                await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_camping.id.hex))
+            await self._cache.set(self._ks.key(domain_camping.id.hex), domain_camping, expire=self._cache.HOT_FEAT)
 
             return domain_camping
         except errors.ServiceError as e:
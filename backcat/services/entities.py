@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+from piccolo.table import Table
+
+from backcat import database, domain
+from backcat.services.cache import Keyspace, register
+
+
+@dataclass
+class Entity:
+    """Where an entity type lives in the cache and in the database"""
+
+    ks: Keyspace
+    table: type[Table]
+    t: type[domain.DomainBaseModel]
+
+
+CAMPING = Entity(register("camping", domain.Camping), database.Camping, domain.Camping)
+AREA = Entity(register("area", domain.Area), database.Area, domain.Area)
+POI = Entity(register("poi", domain.POI), database.POI, domain.POI)
+BOOKING = Entity(register("booking", domain.Booking), database.Booking, domain.Booking)
+REVIEW = Entity(register("review", domain.Review), database.Review, domain.Review)
+USER = Entity(register("user", domain.User), database.User, domain.User)
+
+ENTITIES = [CAMPING, AREA, POI, BOOKING, REVIEW, USER]
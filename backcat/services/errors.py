@@ -36,3 +36,9 @@ class InternalServerError(ServiceError):
     """internal server error"""
 
     status_code: int = 500
+
+
+class UnavailableError(ServiceError):
+    """service is overloaded, retry later"""
+
+    status_code: int = 503
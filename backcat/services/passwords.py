@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+from prometheus_client import Counter, Gauge, Histogram
+
+from backcat import configs
+from backcat.services import errors
+
+PENDING = Gauge("backcat_passwords_pending", "Password hashes waiting for a free slot of the pool")
+
+RUNNING = Gauge("backcat_passwords_running", "Password hashes being computed")
+
+REJECTED = Counter(
+    "backcat_passwords_rejected",
+    "Password hashes rejected because too many were waiting already, by op (hash, verify)",
+    ["op"],
+)
+
+WAIT = Histogram(
+    "backcat_passwords_wait_seconds",
+    "How long password hashes waited for a free slot of the pool, by op (hash, verify)",
+    ["op"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+DURATION = Histogram(
+    "backcat_passwords_duration_seconds",
+    "How long computing password hashes took, by op (hash, verify)",
+    ["op"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+class Passwords:
+    """Argon2 hashing and verification off the event loop.
+
+    Hashes are computed in a pool of `workers` threads or processes. At most `workers` run at once, up to
+    `max_pending` more wait for a free slot and the rest are rejected with UnavailableError, so a burst of sign-ins
+    queues up in front of the pool instead of stalling every other request of the worker.
+    """
+
+    def __init__(self, cfg: configs.Passwords):
+        self._cfg = cfg
+        self._hasher = PasswordHasher(
+            time_cost=cfg.argon2.time_cost,
+            memory_cost=cfg.argon2.memory_cost,
+            parallelism=cfg.argon2.parallelism,
+            hash_len=cfg.argon2.hash_len,
+            salt_len=cfg.argon2.salt_len,
+        )
+        self._executor: Executor | None = None
+        match cfg.executor:
+            case "thread":
+                self._executor = ThreadPoolExecutor(max_workers=cfg.workers, thread_name_prefix="argon2")
+            case "process":
+                self._executor = ProcessPoolExecutor(max_workers=cfg.workers)
+            case "inline":
+                pass
+
+        self._slots = asyncio.Semaphore(cfg.workers)
+        self._pending = 0
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self._hasher.hash, password)
+
+    async def verify(self, password_hash: str, password: str) -> bool:
+        """Raises argon2.exceptions.VerificationError when the password does not match the hash"""
+        return await self._run("verify", self._hasher.verify, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether the hash was made with other parameters than the configured ones, cheap enough for the loop"""
+        return self._cfg.rehash and self._hasher.check_needs_rehash(password_hash)
+
+    async def _run[R](self, op: str, f: Callable[..., R], *args: str) -> R:
+        if self._executor is None:
+            with DURATION.labels(op).time():
+                return f(*args)
+
+        if self._slots.locked() and self._pending >= self._cfg.max_pending:
+            REJECTED.labels(op).inc()
+            raise errors.UnavailableError("too many sign-ins at once, retry later")
+
+        started = time.perf_counter()
+        self._pending += 1
+        PENDING.inc()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._pending -= 1
+            PENDING.dec()
+        WAIT.labels(op).observe(time.perf_counter() - started)
+
+        RUNNING.inc()
+        try:
+            with DURATION.labels(op).time():
+                # bound methods of the hasher pickle along with its parameters, so process pools work as well
+                return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(f, *args))
+        finally:
+            RUNNING.dec()
+            self._slots.release()
@@ -1,5 +1,6 @@
 from datetime import UTC, datetime
 from typing import Any, Protocol
+from uuid import UUID
 
 from asyncpg import DataError, UniqueViolationError
 from piccolo.columns import Column
@@ -7,8 +8,8 @@ from pydantic import BaseModel
 
 from backcat import database, domain
 from backcat.database.projector import ProjectionError, projection
-from backcat.services import errors
-from backcat.services.cache import Cache, Keyspace
+from backcat.services import entities, errors
+from backcat.services.cache import Cache, IDList
 
 
 class UpdatePOI(BaseModel):
@@ -58,7 +59,7 @@ class POIRepo(Protocol):
 
 class POIRepoImpl(POIRepo):
     def __init__(self, cache: Cache):
-        self._ks = Keyspace("poi")
+        self._ks = entities.POI.ks
         self._cache = cache
 
     async def create_poi(self, actor: domain.UserID, poi: domain.POI, camping_id: domain.CampingID) -> domain.POI:
@@ -75,9 +76,10 @@ class POIRepoImpl(POIRepo):
                 db_poi = (await database.POI.insert(db_poi).returning(*database.POI.all_columns()).run())[0]
                 domain_poi = projection(db_poi, cast_to=domain.POI)
 
-                await self._cache.set(self._ks.key(domain_poi.id.hex), domain_poi, expire=self._cache.HOT_FEAT)
+            await self._cache.set(self._ks.key(domain_poi.id.hex), domain_poi, expire=self._cache.HOT_FEAT)
+            await self._cache.invalidate_tag(f"camping:{camping_id.hex}:pois", self._ks.tag("lists"))
 
-                return domain_poi
+            return domain_poi
         except UniqueViolationError as e:
             # unique violation error means that the poi already exists
             raise errors.ConflictError("POI already exists") from e
@@ -94,11 +96,7 @@ class POIRepoImpl(POIRepo):
             raise errors.InternalServerError("failed to insert POI") from e
 
     async def read_poi(self, actor: domain.UserID, poi_id: domain.POIID) -> domain.POI | None:
-        try:
-            domain_poi = await self._cache.get(self._ks.key(poi_id.hex), t=domain.POI)
-            if domain_poi is not None:
-                return domain_poi
-
+        async def load() -> domain.POI | None:
             async with database.POI._meta.db.transaction():
                 db_poi = (
                     await database.POI.objects()
@@ -112,11 +110,12 @@ class POIRepoImpl(POIRepo):
                 if db_poi is None:
                     return None
 
-                domain_poi = projection(db_poi)
-
-                await self._cache.set(self._ks.key(poi_id.hex), domain_poi, expire=self._cache.HOT_FEAT)
+                return projection(db_poi)
 
-            return domain_poi
+        try:
+            return await self._cache.get_or_load(
+                self._ks.key(poi_id.hex), load, t=domain.POI, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             # projection error means that the db data was read, but it was not converted to a domain model
             raise errors.InternalServerError("failed to read POI") from e
@@ -152,7 +151,8 @@ class POIRepoImpl(POIRepo):
 
                 domain_poi = projection(db_poi, cast_to=domain.POI)
 
-                await self._cache.set(self._ks.key(domain_poi.id.hex), domain_poi, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_poi.id.hex))
+            await self._cache.set(self._ks.key(domain_poi.id.hex), domain_poi, expire=self._cache.HOT_FEAT)
 
             return domain_poi
         except DataError as e:
@@ -185,6 +185,12 @@ class POIRepoImpl(POIRepo):
 
                 domain_poi = projection(db_poi, cast_to=domain.POI)
 
+            await self._cache.record_write(self._ks.key(poi_id.hex))
+            await self._cache.tombstone(
+                self._ks.key(poi_id.hex), expire=self._cache.lifetime(self._ks, self._cache.HOT_FEAT)
+            )
+            await self._cache.invalidate_tag(f"camping:{db_poi['camping'].hex}:pois", self._ks.tag("lists"))
+
             return domain_poi
         except IndexError as e:
             # index error means that no row was updated
@@ -203,14 +209,44 @@ class POIRepoImpl(POIRepo):
         actor: domain.UserID,
         filter: FilterPOI,
     ) -> list[domain.POI]:
-        try:
+        async def load_ids() -> IDList:
             query = database.POI.objects().where(database.POI.deleted_at.is_null())
 
             if filter.camping_id is not None:
                 query = query.where(database.POI.camping._.id == filter.camping_id)
 
             db_pois = await query.run()
+            domain_pois = [projection(db_poi) for db_poi in db_pois]
+
+            await self._cache.set_many([
+                (self._ks.key(domain_poi.id.hex), domain_poi, self._cache.HOT_FEAT) for domain_poi in domain_pois
+            ])
+
+            return IDList(ids=[domain_poi.id.hex for domain_poi in domain_pois])
+
+        async def load_pois(ids: list[str]) -> list[domain.POI]:
+            db_pois = (
+                await database.POI.objects()
+                .where(
+                    database.POI.id.is_in([UUID(id) for id in ids]),
+                    database.POI.deleted_at.is_null(),
+                )
+                .run()
+            )
             return [projection(db_poi) for db_poi in db_pois]
+
+        query_tags = [self._ks.tag("lists")]
+        if filter.camping_id is not None:
+            query_tags = [f"camping:{filter.camping_id.hex}:pois"]
+
+        try:
+            pois = await self._cache.get_or_load(
+                self._ks.query(filter), load_ids, t=IDList, expire=self._cache.HOT_FEAT, tags=query_tags
+            )
+            if pois is None:
+                return []
+
+            return await self._cache.hydrate(self._ks, pois.ids, load_pois, t=domain.POI, expire=self._cache.HOT_FEAT)
         except ProjectionError as e:
             # projection error means that the db data was read, but it was not converted to a domain model
             raise errors.InternalServerError("failed to read POI") from e
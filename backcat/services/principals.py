@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from backcat import configs, domain
+from backcat.services import entities
+from backcat.services.cache import Cache, LocalCache, metrics
+from backcat.services.token import TokenRepo
+from backcat.services.user_repo import UserRepo
+
+CLAIMS = frozenset({"name", "email", "ver"})
+"""token claims that carry the principal, see `configs.JWT.fat_tokens`"""
+
+
+@dataclass
+class Principal:
+    """Authenticated user as told by the token claims, use `Principals.user` for the full user"""
+
+    id: domain.UserID
+    name: str
+    email: str
+    version: int
+
+
+class Principals:
+    """Resolves tokens to the users they were issued to.
+
+    Per-worker cache of authenticated users, saves the user lookup on most authenticated requests. Users are kept
+    for up to `ttl` seconds and dropped as soon as any worker writes, invalidates or deletes their cache key
+    (update_user, delete_user), see `Cache.watch`.
+
+    With `jwt.fat_tokens` tokens carry a `Principal` in their claims and requests need no lookup at all, only
+    the token version is checked against the in-process one of `TokenRepo`. Tokens issued without the claims
+    are still resolved to full users.
+    """
+
+    def __init__(
+        self,
+        cache: Cache,
+        user_repo: UserRepo,
+        token_repo: TokenRepo,
+        cache_cfg: configs.Cache,
+        jwt_cfg: configs.JWT,
+    ):
+        self._cache = cache
+        self._user_repo = user_repo
+        self._token_repo = token_repo
+        self._cfg = cache_cfg.principals
+        self._fat_tokens = jwt_cfg.fat_tokens
+        self._ks = entities.USER.ks
+        self._users = LocalCache[domain.User](self._cfg.max_size, self._cfg.ttl)
+
+    async def start(self):
+        if self._cfg.enabled:
+            await self._cache.watch(self._ks, self._on_change)
+
+    async def claims(self, user: domain.User) -> dict[str, Any] | None:
+        """Extra claims of tokens issued to `user`, None unless tokens carry the principal"""
+        if not self._fat_tokens:
+            return None
+
+        return {"name": user.name, "email": user.email, "ver": await self._token_repo.version(user.id.hex)}
+
+    async def authenticate(self, user_id: UUID, claims: dict[str, Any]) -> domain.User | Principal | None:
+        """The principal of a token with the given extra claims, None when it is no longer valid"""
+        if not self._fat_tokens or not CLAIMS <= claims.keys():
+            return await self.get(user_id)
+
+        if await self._token_repo.is_outdated(user_id.hex, claims["ver"]):
+            return None
+
+        return Principal(id=user_id, name=claims["name"], email=claims["email"], version=claims["ver"])
+
+    async def user(self, principal: domain.User | Principal) -> domain.User | None:
+        """The full user behind a principal, looked up only when the token carried the principal"""
+        if isinstance(principal, domain.User):
+            return principal
+
+        return await self.get(principal.id)
+
+    async def get(self, user_id: UUID) -> domain.User | None:
+        if not self._cfg.enabled:
+            return await self._user_repo.read_user(user_id)
+
+        key_str = self._ks.key(user_id.hex).as_str()
+        user = self._users.get(key_str)
+        if user is not None:
+            metrics.PRINCIPALS.labels("hit").inc()
+            # handlers get their own copy, the kept one is shared by every request of the worker
+            return user.model_copy()
+
+        metrics.PRINCIPALS.labels("miss").inc()
+        epoch = self._users.epoch
+        user = await self._user_repo.read_user(user_id)
+        if user is not None:
+            self._users.put(key_str, user.model_copy(), epoch=epoch)
+
+        return user
+
+    def _on_change(self, key_str: str | None):
+        if key_str is None:
+            self._users.clear()
+        else:
+            self._users.evict(key_str)
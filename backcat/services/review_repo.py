@@ -1,5 +1,6 @@
 from datetime import UTC, datetime
 from typing import Any, Protocol
+from uuid import UUID
 
 from asyncpg import DataError, UniqueViolationError
 from piccolo.columns import Column
@@ -8,8 +9,8 @@ from pydantic import BaseModel
 from backcat import database
 from backcat import domain
 from backcat.database.projector import ProjectionError, projection
-from backcat.services import errors
-from backcat.services.cache import Cache, Keyspace
+from backcat.services import entities, errors
+from backcat.services.cache import Cache, IDList
 
 
 class UpdateReview(BaseModel):
@@ -57,7 +58,7 @@ class ReviewRepo(Protocol):
 
 class ReviewRepoImpl(ReviewRepo):
     def __init__(self, cache: Cache):
-        self._ks = Keyspace("review")
+        self._ks = entities.REVIEW.ks
         self._cache = cache
 
     async def create_review(
@@ -78,9 +79,10 @@ class ReviewRepoImpl(ReviewRepo):
                 db_review = (await database.Review.insert(db_review).returning(*database.Review.all_columns()).run())[0]
                 domain_review = projection(db_review, cast_to=domain.Review)
 
-                await self._cache.set(self._ks.key(domain_review.id.hex), domain_review, expire=self._cache.HOT_FEAT)
+            await self._cache.set(self._ks.key(domain_review.id.hex), domain_review, expire=self._cache.HOT_FEAT)
+            await self._cache.invalidate_tag(f"area:{area_id.hex}:reviews", self._ks.tag("lists"))
 
-                return domain_review
+            return domain_review
         except UniqueViolationError as e:
             raise errors.ConflictError("review already exists") from e
         except DataError as e:
@@ -97,11 +99,7 @@ class ReviewRepoImpl(ReviewRepo):
         actor: domain.UserID,
         review_id: domain.ReviewID,
     ) -> domain.Review | None:
-        try:
-            domain_review = await self._cache.get(self._ks.key(review_id.hex), t=domain.Review)
-            if domain_review is not None:
-                return domain_review
-
+        async def load() -> domain.Review | None:
             async with database.Review._meta.db.transaction():
                 db_review = (
                     await database.Review.objects()
@@ -115,11 +113,12 @@ class ReviewRepoImpl(ReviewRepo):
                 if db_review is None:
                     return None
 
-                domain_review = projection(db_review)
-
-                await self._cache.set(self._ks.key(review_id.hex), domain_review, expire=self._cache.HOT_FEAT)
+                return projection(db_review)
 
-            return domain_review
+        try:
+            return await self._cache.get_or_load(
+                self._ks.key(review_id.hex), load, t=domain.Review, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             raise errors.InternalServerError("failed to read review") from e
         except Exception as e:
@@ -154,7 +153,8 @@ class ReviewRepoImpl(ReviewRepo):
 
                 domain_review = projection(db_review, cast_to=domain.Review)
 
-                await self._cache.set(self._ks.key(domain_review.id.hex), domain_review, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_review.id.hex))
+            await self._cache.set(self._ks.key(domain_review.id.hex), domain_review, expire=self._cache.HOT_FEAT)
 
             return domain_review
         except DataError as e:
@@ -188,6 +188,12 @@ class ReviewRepoImpl(ReviewRepo):
 
                 domain_review = projection(db_review, cast_to=domain.Review)
 
+            await self._cache.record_write(self._ks.key(review_id.hex))
+            await self._cache.tombstone(
+                self._ks.key(review_id.hex), expire=self._cache.lifetime(self._ks, self._cache.HOT_FEAT)
+            )
+            await self._cache.invalidate_tag(f"area:{db_review['area'].hex}:reviews", self._ks.tag("lists"))
+
             return domain_review
         except IndexError as e:
             raise errors.NotFoundError("no such review found") from e
@@ -203,14 +209,47 @@ class ReviewRepoImpl(ReviewRepo):
         actor: domain.UserID,
         filter: FilterReview,
     ) -> list[domain.Review]:
-        try:
+        async def load_ids() -> IDList:
             query = database.Review.objects().where(database.Review.deleted_at.is_null())
 
             if filter.area_id is not None:
                 query = query.where(database.Review.area._.id == filter.area_id)
 
             db_reviews = await query.run()
+            domain_reviews = [projection(db_review) for db_review in db_reviews]
+
+            await self._cache.set_many([
+                (self._ks.key(domain_review.id.hex), domain_review, self._cache.HOT_FEAT)
+                for domain_review in domain_reviews
+            ])
+
+            return IDList(ids=[domain_review.id.hex for domain_review in domain_reviews])
+
+        async def load_reviews(ids: list[str]) -> list[domain.Review]:
+            db_reviews = (
+                await database.Review.objects()
+                .where(
+                    database.Review.id.is_in([UUID(id) for id in ids]),
+                    database.Review.deleted_at.is_null(),
+                )
+                .run()
+            )
             return [projection(db_review) for db_review in db_reviews]
+
+        query_tags = [self._ks.tag("lists")]
+        if filter.area_id is not None:
+            query_tags = [f"area:{filter.area_id.hex}:reviews"]
+
+        try:
+            reviews = await self._cache.get_or_load(
+                self._ks.query(filter), load_ids, t=IDList, expire=self._cache.HOT_FEAT, tags=query_tags
+            )
+            if reviews is None:
+                return []
+
+            return await self._cache.hydrate(
+                self._ks, reviews.ids, load_reviews, t=domain.Review, expire=self._cache.HOT_FEAT
+            )
         except ProjectionError as e:
             raise errors.InternalServerError("failed to read reviews") from e
         except Exception as e:
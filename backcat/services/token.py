@@ -1,27 +1,180 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
 from typing import Protocol
 
-from backcat.services.cache import Cache, Keyspace
+import structlog
+
+from backcat import configs
+from backcat.services.cache import Cache, metrics, register
+
+logger = structlog.get_logger(__name__)
+
+KEYSPACE = register("token")
 
 
 class TokenRepo(Protocol):
-    async def ban(self, token_id: str) -> None: ...
+    async def start(self) -> None: ...
+    async def close(self) -> None: ...
+    async def ban(self, token_id: str, expires: datetime) -> None: ...
     async def unban(self, token_id: str) -> None: ...
     async def is_banned(self, token_id: str) -> bool: ...
+    async def version(self, user_id: str) -> int: ...
+    async def revoke_all(self, user_id: str) -> int: ...
+    async def is_outdated(self, user_id: str, version: int) -> bool: ...
 
 
 class TokenRepoImpl(TokenRepo):
-    def __init__(self, cache: Cache):
-        self._ks = Keyspace("token")
+    """Revoked tokens, kept in redis until the tokens themselves expire.
+
+    Every ban and unban is also appended to a redis stream that keeps entries for the token lifetime. With
+    `cache.revocations.enabled` each worker reads the stream from its start on startup and follows it afterwards,
+    so checking a token is a lookup in an in-process set. Until the worker has caught up with the stream, or while
+    it can not read it, tokens are checked in redis.
+
+    Tokens that carry the principal in their claims (`jwt.fat_tokens`) also carry the token version of their user.
+    `revoke_all` bumps it and publishes the bump on the same stream, tokens with older versions are rejected.
+    A bump is forgotten after the token lifetime, every token issued before it has expired by then. Fat tokens
+    save the user lookup only when their version is checked in process, so the stream is followed with them
+    whether revocations are enabled or not.
+    """
+
+    READ_COUNT = 1000
+    """how many stream entries to read at once"""
+    FOLLOW_BLOCK = timedelta(seconds=5)
+    """how long one read of the stream waits for new entries"""
+    CATCH_UP_TIMEOUT = timedelta(seconds=5)
+    """how long `start` waits for the kept entries to be read"""
+    PRUNE_INTERVAL = timedelta(minutes=1)
+    """how often expired tokens are dropped from the in-process set"""
+
+    def __init__(self, cache: Cache, cache_cfg: configs.Cache, jwt_cfg: configs.JWT):
+        self._ks = KEYSPACE
         self._cache = cache
+        self._cfg = cache_cfg.revocations
+        self._follows = self._cfg.enabled or jwt_cfg.fat_tokens
+        self._lifetime = timedelta(seconds=jwt_cfg.token_expires)
 
-    async def ban(self, token_id: str) -> None:
-        await self._cache.set(self._ks.key(token_id), {"blacklisted": True}, expire=self._cache.HOT_FEAT)
+        # token id -> when the token expires (unix time)
+        self._revoked: dict[str, float] = {}
+        # user id -> lowest accepted token version and until when tokens below it may exist (unix time)
+        self._versions: dict[str, tuple[int, float]] = {}
+        self._synced = asyncio.Event()
+        self._pruned_at = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self):
+        if not self._follows or self._task is not None:
+            return
+
+        self._task = asyncio.create_task(self._follow())
+        try:
+            await asyncio.wait_for(self._synced.wait(), timeout=self.CATCH_UP_TIMEOUT.total_seconds())
+        except TimeoutError:
+            logger.warning("revoked tokens were not loaded in time, checking them in redis meanwhile")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._synced.clear()
+
+    async def ban(self, token_id: str, expires: datetime) -> None:
+        remaining = expires - datetime.now(UTC)
+        if remaining <= timedelta(0):
+            return  # rejected as expired anyway
+
+        await self._cache.set(self._ks.key(token_id), {"blacklisted": True}, expire=remaining, exact=True)
+        await self._publish(token_id, expires.timestamp(), keep=max(self._lifetime, remaining))
 
     async def unban(self, token_id: str) -> None:
         await self._cache.invalidate(self._ks.key(token_id))
+        await self._publish(token_id, 0.0, keep=self._lifetime)
 
     async def is_banned(self, token_id: str) -> bool:
+        if self._synced.is_set():
+            metrics.REVOCATIONS.labels("local").inc()
+            expires = self._revoked.get(token_id)
+            return expires is not None and expires > time.time()
+
+        metrics.REVOCATIONS.labels("redis").inc()
         data = await self._cache.get(self._ks.key(token_id))
         if data is None:
             return False
         return data.get("blacklisted", False)
+
+    async def version(self, user_id: str) -> int:
+        return await self._cache.counter(self._version_name(user_id))
+
+    async def revoke_all(self, user_id: str) -> int:
+        version = await self._cache.incr(self._version_name(user_id))
+        await self._cache.append(self._cfg.stream, {"user": user_id, "version": str(version)}, keep=self._lifetime)
+        return version
+
+    async def is_outdated(self, user_id: str, version: int) -> bool:
+        if self._synced.is_set():
+            metrics.REVOCATIONS.labels("local").inc()
+            required, until = self._versions.get(user_id, (0, 0.0))
+            return version < required and until > time.time()
+
+        metrics.REVOCATIONS.labels("redis").inc()
+        return version < await self.version(user_id)
+
+    def _version_name(self, user_id: str) -> str:
+        # stored without a ttl, so versions only ever grow
+        return f"{self._ks.name}:version:{user_id}"
+
+    async def _publish(self, token_id: str, expires: float, *, keep: timedelta):
+        # published even when the in-process set is disabled here, other workers may have it enabled
+        await self._cache.append(self._cfg.stream, {"token": token_id, "expires": repr(expires)}, keep=keep)
+
+    async def _follow(self):
+        after = "0"
+        while True:
+            try:
+                # kept entries are read without blocking, the set is in sync once a read comes back short
+                block = self.FOLLOW_BLOCK if self._synced.is_set() else None
+                entries = await self._cache.read(self._cfg.stream, after, count=self.READ_COUNT, block=block)
+                for entry_id, fields in entries:
+                    self._apply(entry_id, fields)
+                    after = entry_id
+
+                if len(entries) < self.READ_COUNT:
+                    self._synced.set()
+                self._prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # bans published meanwhile are read once the stream is back, the set is out of sync until then
+                self._synced.clear()
+                logger.warning("revoked token stream failed, following it again", exc_info=e)
+                await asyncio.sleep(1)
+
+    def _apply(self, entry_id: str, fields: dict[str, str]):
+        if "user" in fields:
+            # entry ids start with the time they were added at in ms
+            until = int(entry_id.split("-", 1)[0]) / 1000 + self._lifetime.total_seconds()
+            version = int(fields["version"])
+            if until > time.time() and version > self._versions.get(fields["user"], (0, 0.0))[0]:
+                self._versions[fields["user"]] = (version, until)
+            return
+
+        expires = float(fields["expires"])
+        if expires > time.time():
+            self._revoked[fields["token"]] = expires
+        else:
+            self._revoked.pop(fields["token"], None)
+
+    def _prune(self):
+        now = time.monotonic()
+        if now - self._pruned_at < self.PRUNE_INTERVAL.total_seconds():
+            return
+
+        self._pruned_at = now
+        now = time.time()
+        self._revoked = {token_id: expires for token_id, expires in self._revoked.items() if expires > now}
+        self._versions = {user_id: required for user_id, required in self._versions.items() if required[1] > now}
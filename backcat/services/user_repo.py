@@ -1,15 +1,20 @@
+import asyncio
 from datetime import UTC, datetime
 from typing import Any, Protocol, override
 
 import argon2
-from argon2 import PasswordHasher
+import structlog
 from asyncpg import DataError, UniqueViolationError
 from piccolo.columns import Column
 from pydantic import BaseModel, EmailStr, Field
 
 from backcat import database, domain
-from backcat.services import errors
-from backcat.services.cache import Cache, Keyspace
+from backcat.services import entities, errors
+from backcat.services.cache import Cache
+from backcat.services.passwords import Passwords
+from backcat.services.token import TokenRepo
+
+logger = structlog.get_logger(__name__)
 
 
 class UpdateUser(BaseModel):
@@ -26,16 +31,21 @@ class UserRepo(Protocol):
 
 
 class UserRepoImpl(UserRepo):
-    def __init__(self, cache: Cache):
-        self._ks = Keyspace("camping")
+    def __init__(self, cache: Cache, passwords: Passwords, token_repo: TokenRepo):
+        self._ks = entities.USER.ks
         self._cache = cache
-        self._password_hasher = PasswordHasher()
+        self._passwords = passwords
+        self._token_repo = token_repo
+        # user id -> background upgrade of the password hash, see `_rehash`
+        self._rehashes: dict[domain.UserID, asyncio.Task[None]] = {}
 
     @override
     async def create_user(self, user: domain.User) -> domain.User:
         try:
-            password_hash = self._password_hasher.hash(user.password)
+            password_hash = await self._passwords.hash(user.password)
             user.password = password_hash
+        except errors.ServiceError as e:
+            raise e
         except Exception as e:
             raise errors.InternalServerError("failed to hash password") from e
 
@@ -52,9 +62,9 @@ class UserRepoImpl(UserRepo):
                 db_user = (await database.User.insert(db_user).returning(*database.User.all_columns()).run())[0]
                 domain_user = database.projection(db_user, cast_to=domain.User)
 
-                await self._cache.set(self._ks.key(domain_user.id.hex), domain_user, expire=self._cache.HOT_FEAT)
+            await self._cache.set(self._ks.key(domain_user.id.hex), domain_user, expire=self._cache.HOT_FEAT)
 
-                return domain_user
+            return domain_user
         except UniqueViolationError as e:
             # unique violation error means that the user already exists
             raise errors.ConflictError("user already exists") from e
@@ -72,11 +82,7 @@ class UserRepoImpl(UserRepo):
 
     @override
     async def read_user(self, user_id: domain.UserID) -> domain.User | None:
-        try:
-            domain_user = await self._cache.get(self._ks.key(user_id.hex), t=domain.User)
-            if domain_user is not None:
-                return domain_user
-
+        async def load() -> domain.User | None:
             db_user = (
                 await database.User.objects()
                 .where(
@@ -90,6 +96,11 @@ class UserRepoImpl(UserRepo):
                 return None
 
             return database.projection(db_user)
+
+        try:
+            return await self._cache.get_or_load(
+                self._ks.key(user_id.hex), load, t=domain.User, expire=self._cache.HOT_FEAT
+            )
         except database.ProjectionError as e:
             # projection error means that the db data was read but it was not converted to domain model
             raise errors.InternalServerError("failed to read user") from e
@@ -118,7 +129,8 @@ class UserRepoImpl(UserRepo):
 
                 domain_user = database.projection(db_user, cast_to=domain.User)
 
-                await self._cache.set(self._ks.key(domain_user.id.hex), domain_user, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(domain_user.id.hex))
+            await self._cache.set(self._ks.key(domain_user.id.hex), domain_user, expire=self._cache.HOT_FEAT)
 
             return domain_user
         except UniqueViolationError as e:
@@ -151,7 +163,12 @@ class UserRepoImpl(UserRepo):
 
                 domain_user = database.projection(db_user, cast_to=domain.User)
 
-                await self._cache.set(self._ks.key(domain_user.id.hex), domain_user, expire=self._cache.HOT_FEAT)
+            await self._cache.record_write(self._ks.key(user_id.hex))
+            await self._cache.tombstone(
+                self._ks.key(user_id.hex), expire=self._cache.lifetime(self._ks, self._cache.HOT_FEAT)
+            )
+            # tokens carrying the principal are not checked against the user, reject them by their version
+            await self._token_repo.revoke_all(user_id.hex)
 
             return domain_user
         except IndexError as e:
@@ -179,7 +196,9 @@ class UserRepoImpl(UserRepo):
                 raise errors.AcccessDeniedError("user not found")
 
             user = database.projection(db_user)
-            self._password_hasher.verify(user.password, password)
+            await self._passwords.verify(user.password, password)
+            if self._passwords.needs_rehash(user.password):
+                self._rehash(user.id, user.password, password)
 
             return user
         except errors.ServiceError as e:
@@ -191,3 +210,29 @@ class UserRepoImpl(UserRepo):
             raise errors.AcccessDeniedError("invalid password") from e
         except Exception as e:
             raise errors.InternalServerError("failed to read user") from e
+
+    def _rehash(self, user_id: domain.UserID, password_hash: str, password: str):
+        """Upgrade a hash made with outdated parameters in the background, the sign-in does not wait for it"""
+        if user_id in self._rehashes:
+            return
+
+        task = asyncio.create_task(self._upgrade_hash(user_id, password_hash, password))
+        self._rehashes[user_id] = task
+        task.add_done_callback(lambda _: self._rehashes.pop(user_id, None))
+
+    async def _upgrade_hash(self, user_id: domain.UserID, password_hash: str, password: str):
+        try:
+            upgraded = await self._passwords.hash(password)
+
+            # matched on the old hash, so a password changed in the meantime is not overwritten
+            updated = (
+                await database.User.update({database.User.password: upgraded})
+                .where(database.User.id == user_id, database.User.password == password_hash)
+                .returning(database.User.id)
+                .run()
+            )
+            if len(updated) != 0:
+                await self._cache.invalidate(self._ks.key(user_id.hex))
+        except Exception as e:
+            # the hash stays as it was, the next sign-in tries again
+            logger.warning("failed to upgrade password hash", user_id=user_id.hex, exc_info=e)
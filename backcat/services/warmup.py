@@ -0,0 +1,108 @@
+import asyncio
+from datetime import timedelta
+from uuid import UUID
+
+import structlog
+
+from backcat import configs, database, domain
+from backcat.services import entities
+from backcat.services.cache import Cache, IDList, register
+from backcat.services.entities import Entity
+
+logger = structlog.get_logger(__name__)
+
+KEYSPACE = register("warmup", IDList)
+
+TARGETS = [entities.CAMPING, entities.AREA, entities.POI]
+
+
+class WarmUp:
+    """Preloads recently updated entities into the cache before the worker starts serving.
+
+    One worker, holding a cross-worker lock, loads the entities from the database into redis and publishes the
+    ids it picked. The other workers wait for it and fill their in-process tier from redis with those ids. Once
+    done it leaves a marker for `window` seconds, so workers of the same deploy do not warm redis up again.
+    """
+
+    POLL_INTERVAL = timedelta(milliseconds=100)
+    WARMED = "warmed"
+    """key of the marker, holds the names of the warmed keyspaces"""
+
+    def __init__(self, cache: Cache, cache_cfg: configs.Cache):
+        self._ks = KEYSPACE
+        self._cache = cache
+        self._cfg = cache_cfg.warmup
+
+    async def run(self):
+        if not self._cfg.enabled:
+            return
+
+        try:
+            async with asyncio.timeout(self._cfg.budget):
+                await self._run()
+        except TimeoutError:
+            logger.warning("cache warm-up ran out of its time budget", budget=self._cfg.budget)
+        except Exception as e:
+            logger.warning("cache warm-up failed", exc_info=e)
+
+    async def _run(self):
+        window = timedelta(seconds=self._cfg.window)
+        warmed = await self._cache.get(self._ks.key(self.WARMED), t=IDList)
+        lock = self._cache.lock("warmup", timeout=timedelta(seconds=self._cfg.budget))
+        if warmed is None and await lock.acquire():
+            try:
+                for target in TARGETS:
+                    ids = await self._recent(target)
+                    # stored first, so waiting workers find it even if we run out of time on the entities
+                    await self._cache.set(self._ks.key(target.ks.name), IDList(ids=ids), expire=window)
+                    await self._hydrate(target, ids)
+                    logger.info("cache warmed up", keyspace=target.ks.name, entities=len(ids))
+
+                names = [target.ks.name for target in TARGETS]
+                await self._cache.set(self._ks.key(self.WARMED), IDList(ids=names), expire=window)
+            finally:
+                try:
+                    await lock.release()
+                except Exception:
+                    pass  # the lock expired, nothing to release
+            return
+
+        targets = [target for target in TARGETS if self._cache.has_local(target.ks)]
+        if len(targets) == 0:
+            return  # redis is shared, the lock holder warms it for everyone
+
+        while await lock.locked():
+            await asyncio.sleep(self.POLL_INTERVAL.total_seconds())
+
+        for target in targets:
+            recent = await self._cache.get(self._ks.key(target.ks.name), t=IDList)
+            if recent is not None:
+                await self._hydrate(target, recent.ids)
+
+    async def _recent(self, target: Entity) -> list[str]:
+        table = target.table
+        rows = (
+            await table.select(table.id)  # type: ignore
+            .where(table.deleted_at.is_null())  # type: ignore
+            .order_by(table.updated_at, ascending=False)  # type: ignore
+            .limit(self._cfg.limit)
+            .run()
+        )
+        return [row["id"].hex for row in rows]
+
+    async def _hydrate(self, target: Entity, ids: list[str]):
+        async def load(batch: list[str]) -> list[domain.DomainBaseModel]:
+            table = target.table
+            rows = (
+                await table.objects()
+                .where(
+                    table.id.is_in([UUID(id) for id in batch]),  # type: ignore
+                    table.deleted_at.is_null(),  # type: ignore
+                )
+                .run()
+            )
+            return [database.projection(row) for row in rows]  # type: ignore
+
+        for start in range(0, len(ids), self._cfg.batch):
+            batch = ids[start : start + self._cfg.batch]
+            await self._cache.hydrate(target.ks, batch, load, t=target.t, expire=Cache.HOT_FEAT)
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from backcat.cmd.calibrate import passwords
+
+
+def test_calibration_halves_memory_until_one_iteration_fits():
+    params, elapsed = passwords.calibrate(target=0.0, max_memory=4 * passwords.MIN_MEMORY, parallelism=1, rounds=1)
+
+    # nothing fits in no time, so the weakest parameters it allows are picked
+    assert params.memory_cost == passwords.MIN_MEMORY
+    assert params.time_cost == 1
+    assert params.parallelism == 1
+    assert elapsed > 0
+
+
+def test_calibration_spends_a_generous_target_on_iterations():
+    one, _ = passwords.calibrate(target=0.0, max_memory=passwords.MIN_MEMORY, parallelism=1, rounds=1)
+    single = passwords.measure(one, rounds=3)
+
+    params, elapsed = passwords.calibrate(target=single * 4, max_memory=passwords.MIN_MEMORY, parallelism=1, rounds=3)
+
+    assert params.memory_cost == passwords.MIN_MEMORY
+    assert params.time_cost > 1
+    assert elapsed <= single * 4
+
+
+def test_calibration_runs_without_the_server_config(tmp_path: Path):
+    env = {name: value for name, value in os.environ.items() if not name.upper().startswith("BACKCAT_")}
+    env["PYTHONPATH"] = str(Path.cwd())
+    script = "import sys, runpy; runpy.run_module('backcat.cmd.calibrate.passwords'); print(sorted(sys.modules))"
+
+    # run from an empty directory, so no .env or config.toml is picked up either
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert "backcat.cmd.server" not in result.stdout
@@ -0,0 +1,111 @@
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.litestar import LitestarProvider, setup_dishka
+from litestar import Litestar, Router
+
+from backcat import configs, services
+from backcat.cmd.server import api, authorization
+from backcat.services.cache import Cache, IDList, register
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-extra", IDList)
+
+TOKEN = "maintenance" * 4
+
+
+def make_app(cache: Cache, cfg: configs.Extra) -> Litestar:
+    """/api/extra/cache as mounted by the server, over the given cache"""
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: cache, provides=services.Cache)
+    app = Litestar(
+        route_handlers=[
+            Router(
+                "/api/extra",
+                guards=[authorization.extra_guard_factory(cfg)],
+                route_handlers=[api.extra.cache.Controller],
+            )
+        ],
+    )
+    setup_dishka(container=make_async_container(provider, LitestarProvider()), app=app)
+    return app
+
+
+@pytest.fixture
+async def client(cache: Cache) -> AsyncIterator[httpx.AsyncClient]:
+    transport = httpx.ASGITransport(app=make_app(cache, configs.Extra(token=TOKEN)))  # type: ignore
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+        yield client
+
+
+async def test_endpoints_are_disabled_without_a_token(cache: Cache):
+    transport = httpx.ASGITransport(app=make_app(cache, configs.Extra()))  # type: ignore
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/extra/cache/local", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 403
+
+
+async def test_wrong_tokens_are_refused(client: httpx.AsyncClient):
+    response = await client.get("/api/extra/cache/local", headers={"Authorization": "Bearer wrong"})
+
+    assert response.status_code == 401
+
+
+async def test_keyspaces_list_keys_and_memory(client: httpx.AsyncClient, cache: Cache):
+    await cache.set_many([(KEYSPACE.key(str(i)), IDList(ids=[str(i)]), Cache.HOT_FEAT) for i in range(5)])
+
+    response = await client.get("/api/extra/cache/keyspaces")
+
+    assert response.status_code == 200
+    keyspaces = {keyspace["name"]: keyspace for keyspace in response.json()["keyspaces"]}
+    assert keyspaces["test-extra"]["registered"] and keyspaces["test-extra"]["type"] == "IDList"
+    assert keyspaces["test-extra"]["keys"] == 5 and keyspaces["test-extra"]["memory"] > 0
+    assert keyspaces["camping"]["keys"] == 0
+
+
+async def test_entries_can_be_inspected_and_evicted(client: httpx.AsyncClient, cache: Cache):
+    await cache.set(KEYSPACE.key("a", "b"), IDList(ids=["1"]), expire=Cache.HOT_FEAT)
+
+    response = await client.get("/api/extra/cache/keyspaces/test-extra/keys/a:b")
+
+    assert response.status_code == 200
+    entry = response.json()
+    assert entry["key"] == KEYSPACE.key("a", "b").as_str()
+    assert entry["value"] == {"ids": ["1"]} and not entry["tombstone"] and entry["ttl"] > 0
+
+    assert (await client.delete("/api/extra/cache/keyspaces/test-extra/keys/a:b")).status_code == 204
+    assert (await client.get("/api/extra/cache/keyspaces/test-extra/keys/a:b")).status_code == 404
+
+
+async def test_keyspaces_can_be_bumped(client: httpx.AsyncClient, cache: Cache):
+    await cache.set(KEYSPACE.key("bumped"), IDList(ids=["1"]), expire=Cache.HOT_FEAT)
+
+    response = await client.post("/api/extra/cache/keyspaces/test-extra/bump")
+
+    assert response.status_code == 200
+    assert response.json() == {"keyspace": "test-extra", "generation": 1}
+    assert await cache.get(KEYSPACE.key("bumped"), t=IDList) is None
+
+
+async def test_unknown_keyspaces_are_not_found(client: httpx.AsyncClient):
+    assert (await client.get("/api/extra/cache/keyspaces/missing/keys/a")).status_code == 404
+    assert (await client.post("/api/extra/cache/keyspaces/missing/bump")).status_code == 404
+
+
+async def test_local_tier_and_hot_keys_of_the_worker(make_cache: MakeCache):
+    cache = await make_cache({"local": {"enabled": True}, "hotkeys": {"enabled": True}})
+    await cache.set(KEYSPACE.key("local"), IDList(ids=["1"]), expire=Cache.HOT_FEAT)
+    await cache.get(KEYSPACE.key("local"))
+    transport = httpx.ASGITransport(app=make_app(cache, configs.Extra(token=TOKEN)))  # type: ignore
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+        local = (await client.get("/api/extra/cache/local")).json()
+        hot_keys = (await client.get("/api/extra/cache/hot-keys")).json()
+
+    assert local["keyspaces"]["test-extra"]["entries"] == 1
+    assert hot_keys["keyspaces"]["test-extra"] == [{"key": KEYSPACE.key("local").as_str(), "reads": 1}]
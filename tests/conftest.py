@@ -0,0 +1,116 @@
+import os
+
+# importing backcat builds the server config, tests run with a minimal one unless the env provides its own
+os.environ.setdefault("BACKCAT_LOG", "{}")
+os.environ.setdefault("BACKCAT_CORS", "{}")
+os.environ.setdefault("BACKCAT_CSRF", '{"enabled": false}')
+os.environ.setdefault("BACKCAT_JWT", '{"secret": "' + "test" * 8 + '"}')
+os.environ.setdefault("BACKCAT_REDIS", '{"dsn": "redis://localhost:6379/0"}')
+os.environ.setdefault("BACKCAT_S3", '{"endpoint": "s3.example.com", "bucket": "backcat"}')
+
+import shutil
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from pydantic import RedisDsn
+
+from backcat import configs, database, domain
+from backcat.services import Cache
+from backcat.services.passwords import Passwords
+from backcat.services.token import TokenRepoImpl
+from backcat.services.user_repo import UserRepoImpl
+from tests.helpers import FAST_ARGON2
+from tests.servers import MakeCache, RedisServer
+
+REDIS_SHARDS = 3
+"""redis-server processes started for the session, the sharded cache tests use all of them"""
+
+
+@pytest.fixture(scope="session")
+def redis_servers() -> Iterator[list[RedisServer]]:
+    binary = shutil.which("redis-server")
+    if binary is None:
+        pytest.skip("redis-server is not installed")
+
+    servers = [RedisServer(binary) for _ in range(REDIS_SHARDS)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def redis_dsns(redis_servers: list[RedisServer]) -> list[RedisDsn]:
+    """DSNs of the session redis servers, emptied before every test"""
+    for server in redis_servers:
+        server.flush()
+    return [server.dsn for server in redis_servers]
+
+
+@pytest.fixture
+async def make_cache(redis_dsns: list[RedisDsn]) -> AsyncIterator[MakeCache]:
+    """Build started caches over the first `shards` servers, `cache_cfg` is validated into configs.Cache"""
+    caches: list[Cache] = []
+
+    async def make(cache_cfg: dict[str, Any] | None = None, *, shards: int = 1) -> Cache:
+        cache = Cache(
+            configs.Redis(dsn=redis_dsns[:shards]),
+            configs.Cache.model_validate(cache_cfg or {}),
+        )
+        await cache.start()
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        await cache.close()
+
+
+@pytest.fixture
+async def cache(make_cache: MakeCache) -> Cache:
+    return await make_cache()
+
+
+TABLES = [database.User, database.Camping, database.Area, database.POI, database.Booking, database.Review]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _tables():
+    try:
+        for table in TABLES:
+            await table.create_table(if_not_exists=True).run()
+    except OSError:
+        pytest.skip("postgres is not reachable, see POSTGRES_* in piccolo_conf.py")
+
+
+@pytest.fixture
+async def db(_tables: None):
+    """Tables of every entity, emptied before each test"""
+    await database.User.raw(f"truncate {', '.join(table._meta.tablename for table in TABLES)} cascade").run()
+
+
+@pytest.fixture
+async def user(db: None) -> domain.User:
+    """User stored in the database, the password is stored as is"""
+    user = domain.User(
+        **domain.User.new_defaults_kwargs(),
+        email="camper@example.com",
+        name="camper",
+        password="not-a-hash",
+    )
+    await database.User.insert(database.projection(user)).run()
+    return user
+
+
+@pytest.fixture
+async def passwords() -> AsyncIterator[Passwords]:
+    passwords = Passwords(configs.Passwords.model_validate({"argon2": FAST_ARGON2}))
+    yield passwords
+    await passwords.close()
+
+
+@pytest.fixture
+def user_repo(cache: Cache, passwords: Passwords) -> UserRepoImpl:
+    token_repo = TokenRepoImpl(cache, configs.Cache(), configs.JWT(secret="test" * 8))
+    return UserRepoImpl(cache, passwords, token_repo)
@@ -0,0 +1,20 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+FAST_ARGON2 = {"time_cost": 1, "memory_cost": 8, "parallelism": 1}
+"""argon2 parameters cheap enough for tests"""
+
+
+async def eventually[R](read: Callable[[], Awaitable[R]], expected: Any, *, timeout: float = 2.0) -> R:
+    """Poll `read` until it returns `expected` or `timeout` passes, returns the last value read.
+
+    Invalidations reach the caches of other workers asynchronously.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        value = await read()
+        if value == expected or loop.time() > deadline:
+            return value
+        await asyncio.sleep(0.01)
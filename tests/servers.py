@@ -0,0 +1,53 @@
+import socket
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+
+import redis
+from pydantic import RedisDsn
+
+from backcat.services import Cache
+
+type MakeCache = Callable[..., Awaitable[Cache]]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class RedisServer:
+    """redis-server process without persistence on a free local port"""
+
+    def __init__(self, binary: str):
+        self.port = free_port()
+        self.dsn = RedisDsn(f"redis://127.0.0.1:{self.port}/0")
+        self._process = subprocess.Popen(
+            [binary, "--port", str(self.port), "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"],
+            stdout=subprocess.DEVNULL,
+        )
+        self.client = redis.Redis(port=self.port)
+
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                self.client.ping()
+                return
+            except redis.ConnectionError:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise
+                time.sleep(0.05)
+
+    def size(self) -> int:
+        """Number of keys stored on the server"""
+        return self.client.dbsize()  # type: ignore
+
+    def flush(self):
+        self.client.flushall()
+
+    def stop(self):
+        self.client.close()
+        self._process.terminate()
+        self._process.wait()
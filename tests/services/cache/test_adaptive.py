@@ -0,0 +1,106 @@
+import time
+from datetime import timedelta
+
+from backcat.services.cache import Cache, IDList, register
+from tests.servers import MakeCache, RedisServer
+
+KEYSPACE = register("test-adaptive")
+
+ADAPTIVE = {"adaptive": {"enabled": True, "min": 5, "max": 3600, "factor": 0.5, "alpha": 0.5}, "expiry": {"jitter": 0}}
+
+
+def stats(server: RedisServer, key_str: str) -> dict[str, float]:
+    found: dict[bytes, bytes] = server.client.hgetall(f"writes:{key_str}")  # type: ignore
+    return {field.decode(): float(value) for field, value in found.items()}
+
+
+def seconds(ttl: timedelta | None) -> float:
+    assert ttl is not None
+    return ttl.total_seconds()
+
+
+async def test_first_write_only_records_its_time(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(ADAPTIVE)
+    key = KEYSPACE.key("first")
+
+    await cache.record_write(key, silent=False)
+
+    recorded = stats(redis_servers[0], key.as_str())
+    assert recorded.keys() == {"at"}
+    assert abs(recorded["at"] - time.time()) < 1
+
+
+async def test_intervals_are_averaged(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(ADAPTIVE)
+    key = KEYSPACE.key("averaged")
+    writes_key = f"writes:{key.as_str()}"
+    redis_servers[0].client.hset(writes_key, mapping={"at": time.time() - 100, "interval": 300})
+
+    await cache.record_write(key, silent=False)
+
+    recorded = stats(redis_servers[0], key.as_str())
+    assert abs(recorded["interval"] - (0.5 * 100 + 0.5 * 300)) < 1
+    history = redis_servers[0].client.pttl(writes_key)
+    assert history > 0  # type: ignore
+
+
+async def test_keys_never_written_keep_the_callers_ttl(make_cache: MakeCache):
+    cache = await make_cache(ADAPTIVE)
+    key = KEYSPACE.key("cold")
+
+    await cache.set(key, IDList(ids=[]), expire=Cache.HOT_FEAT)
+
+    assert seconds(await cache.ttl(key)) > Cache.HOT_FEAT.total_seconds() - 1
+
+
+async def test_keys_written_once_start_at_the_callers_ttl(make_cache: MakeCache):
+    cache = await make_cache(ADAPTIVE)
+    key = KEYSPACE.key("once")
+    await cache.record_write(key, silent=False)
+
+    await cache.set(key, IDList(ids=[]), expire=Cache.HOT_FEAT)
+
+    assert seconds(await cache.ttl(key)) > Cache.HOT_FEAT.total_seconds() - 1
+
+
+async def test_volatile_keys_get_the_shortest_ttl(make_cache: MakeCache):
+    cache = await make_cache(ADAPTIVE)
+    key = KEYSPACE.key("volatile")
+    for _ in range(3):
+        await cache.record_write(key, silent=False)
+
+    await cache.set(key, IDList(ids=[]), expire=Cache.HOT_FEAT)
+
+    assert seconds(await cache.ttl(key)) <= 5
+
+
+async def test_quiet_keys_get_longer_ttls_up_to_the_max(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(ADAPTIVE)
+    quiet, silent = KEYSPACE.key("quiet"), KEYSPACE.key("silent")
+    now = time.time()
+    redis_servers[0].client.hset(f"writes:{quiet.as_str()}", mapping={"at": now - 10, "interval": 1000})
+    redis_servers[0].client.hset(f"writes:{silent.as_str()}", mapping={"at": now - 100_000, "interval": 1000})
+
+    await cache.set_many([(quiet, IDList(ids=[]), Cache.LIVE_FEAT), (silent, IDList(ids=[]), Cache.LIVE_FEAT)])
+
+    assert 499 < seconds(await cache.ttl(quiet)) <= 500
+    assert 3599 < seconds(await cache.ttl(silent)) <= 3600
+
+
+async def test_exact_ttls_are_not_adapted(make_cache: MakeCache):
+    cache = await make_cache(ADAPTIVE)
+    key = KEYSPACE.key("exact")
+    for _ in range(3):
+        await cache.record_write(key, silent=False)
+
+    await cache.set(key, IDList(ids=[]), expire=Cache.HOT_FEAT, exact=True)
+
+    assert seconds(await cache.ttl(key)) > Cache.HOT_FEAT.total_seconds() - 1
+
+
+async def test_writes_are_not_recorded_without_adaptive_ttls(cache: Cache, redis_servers: list[RedisServer]):
+    key = KEYSPACE.key("disabled")
+
+    await cache.record_write(key, silent=False)
+
+    assert stats(redis_servers[0], key.as_str()) == {}
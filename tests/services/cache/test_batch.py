@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from backcat import domain
+from backcat.services.cache import Cache, IDList, register
+from tests.servers import RedisServer
+
+KEYSPACE = register("test-batch", domain.Camping)
+
+POLYGON = [domain.Point(lat=0, lon=0), domain.Point(lat=0, lon=1), domain.Point(lat=1, lon=1)]
+
+
+def new_camping(title: str) -> domain.Camping:
+    return domain.Camping(**domain.Camping.new_defaults_kwargs(), polygon=POLYGON, title=title, description=None)
+
+
+def calls(server: RedisServer, command: str) -> int:
+    stats = server.client.info("commandstats")
+    return stats.get(f"cmdstat_{command}", {}).get("calls", 0)  # type: ignore
+
+
+async def test_set_many_keeps_the_expire_of_each_item(cache: Cache):
+    short, long = KEYSPACE.key("short"), KEYSPACE.key("long")
+
+    await cache.set_many(
+        [(short, IDList(ids=["a"]), Cache.LIVE_FEAT), (long, IDList(ids=["b"]), Cache.COLD_FEAT)],
+        exact=True,
+    )
+
+    short_ttl, long_ttl = await cache.ttl(short), await cache.ttl(long)
+    assert short_ttl is not None and Cache.LIVE_FEAT - timedelta(seconds=1) < short_ttl <= Cache.LIVE_FEAT
+    assert long_ttl is not None and Cache.COLD_FEAT - timedelta(seconds=1) < long_ttl <= Cache.COLD_FEAT
+
+
+async def test_get_many_reads_with_one_mget(cache: Cache, redis_servers: list[RedisServer]):
+    keys = [KEYSPACE.key(str(i)) for i in range(10)]
+    await cache.set_many([(key, IDList(ids=[str(i)]), Cache.HOT_FEAT) for i, key in enumerate(keys) if i % 2 == 0])
+    await cache.tombstone(keys[1])
+    redis_servers[0].client.config_resetstat()
+
+    found = await cache.get_many(keys, t=IDList)
+
+    assert found == [IDList(ids=[str(i)]) if i % 2 == 0 else None for i in range(10)]
+    assert calls(redis_servers[0], "mget") == 1
+    assert calls(redis_servers[0], "get") == 0
+
+
+async def test_invalidate_many_deletes_with_one_del(cache: Cache, redis_servers: list[RedisServer]):
+    keys = [KEYSPACE.key(str(i)) for i in range(10)]
+    await cache.set_many([(key, IDList(ids=[str(i)]), Cache.HOT_FEAT) for i, key in enumerate(keys)])
+    redis_servers[0].client.config_resetstat()
+
+    await cache.invalidate_many(keys[:5])
+
+    assert await cache.get_many(keys, t=IDList) == [None] * 5 + [IDList(ids=[str(i)]) for i in range(5, 10)]
+    assert calls(redis_servers[0], "del") == 1
+
+
+async def test_hydrate_loads_only_what_is_missing(cache: Cache):
+    campings = [new_camping(str(i)) for i in range(6)]
+    await cache.set_many([(KEYSPACE.key(camping.id.hex), camping, Cache.HOT_FEAT) for camping in campings[:3]])
+    gone = new_camping("gone")
+    await cache.tombstone(KEYSPACE.key(gone.id.hex))
+    asked: list[list[str]] = []
+
+    async def load(ids: list[str]) -> list[domain.Camping]:
+        asked.append(ids)
+        # the last one was deleted before the loader got to it
+        return [camping for camping in campings[3:5] if camping.id.hex in ids]
+
+    ids = [camping.id.hex for camping in reversed(campings)] + [gone.id.hex]
+    found = await cache.hydrate(KEYSPACE, ids, load, t=domain.Camping, expire=Cache.HOT_FEAT)
+
+    assert found == list(reversed(campings[:5]))
+    assert asked == [[camping.id.hex for camping in reversed(campings[3:])]]
+    assert await cache.get(KEYSPACE.key(campings[4].id.hex), t=domain.Camping) == campings[4]
+
+
+async def test_batches_of_nothing_do_nothing(cache: Cache):
+    await cache.set_many([])
+    await cache.invalidate_many([])
+
+    assert await cache.get_many([], t=IDList) == []
+    assert await cache.peek_many([]) == []
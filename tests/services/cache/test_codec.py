@@ -0,0 +1,85 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from backcat import domain
+from backcat.services.cache import Cache, codec, register
+from backcat.services.cache.codec import CodecError, Envelope, JsonCodec, MsgpackCodec
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-codec", domain.Camping)
+
+CAMPING = domain.Camping(
+    id=uuid4(),
+    created_at=datetime(2025, 1, 1, tzinfo=UTC),
+    updated_at=datetime(2025, 1, 2, tzinfo=UTC),
+    deleted_at=None,
+    polygon=[domain.Point(lat=1.5, lon=2), domain.Point(lat=3, lon=4), domain.Point(lat=5, lon=6.25)],
+    title="lakeside",
+    description=None,
+    thumbnails=["a.png"],
+)
+
+
+@pytest.mark.parametrize("c", codec.CODECS.values(), ids=lambda c: c.name)
+def test_models_round_trip(c: codec.Codec):
+    data = codec.encode(CAMPING, c)
+
+    assert codec.decode(data, domain.Camping) == CAMPING
+
+
+@pytest.mark.parametrize("c", codec.CODECS.values(), ids=lambda c: c.name)
+def test_dicts_round_trip(c: codec.Codec):
+    value = {"name": "x", "nested": {"ids": [1, 2]}, "none": None}
+
+    assert codec.decode(codec.encode(value, c), None) == value
+
+
+def test_msgpack_is_smaller_than_json():
+    assert len(MsgpackCodec().encode(CAMPING)) < len(JsonCodec().encode(CAMPING))
+
+
+def test_envelope_keeps_timing():
+    data = codec.encode({"v": 1}, MsgpackCodec(), fresh_until=1700000000.5, recompute=0.25)
+
+    assert codec.timing(data) == (1700000000.5, 0.25)
+    assert codec.decode(data, None) == {"v": 1}
+
+
+def test_values_without_envelope_are_legacy_json():
+    data = CAMPING.model_dump_json().encode()
+
+    assert codec.timing(data) == (None, None)
+    assert codec.decode(data, domain.Camping) == CAMPING
+
+
+def test_tombstones_have_no_value():
+    data = codec.tombstone()
+
+    assert codec.is_tombstone(data)
+    assert not codec.is_tombstone(codec.encode({"v": 1}, MsgpackCodec()))
+    with pytest.raises(CodecError):
+        codec.decode(data, None)
+
+
+def test_unknown_codecs_and_versions_are_rejected():
+    with pytest.raises(CodecError, match="codec id"):
+        codec.decode(Envelope(codec=99, payload=b"{}").pack(), None)
+
+    data = bytearray(Envelope(codec=JsonCodec.id, payload=b"{}").pack())
+    data[1] = Envelope.VERSION + 1
+    with pytest.raises(CodecError, match="version"):
+        codec.decode(bytes(data), None)
+
+
+async def test_values_written_with_either_codec_are_readable(make_cache: MakeCache):
+    json_cache, msgpack_cache = await make_cache({"codec": "json"}), await make_cache({"codec": "msgpack"})
+    old, new = KEYSPACE.key("old"), KEYSPACE.key("new")
+
+    await json_cache.set(old, CAMPING, expire=Cache.HOT_FEAT)
+    await msgpack_cache.set(new, CAMPING, expire=Cache.HOT_FEAT)
+
+    for cache in (json_cache, msgpack_cache):
+        assert await cache.get(old, t=domain.Camping) == CAMPING
+        assert await cache.get(new, t=domain.Camping) == CAMPING
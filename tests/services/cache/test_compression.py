@@ -0,0 +1,81 @@
+import json
+import os
+from collections.abc import ByteString
+from pathlib import Path
+
+import pytest
+import zstandard
+
+from backcat import configs
+from backcat.services.cache import Cache, IDList, codec, register
+from backcat.services.cache.compression import CompressionError, Compressor, decompress, load_dictionary
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-compression")
+
+PAYLOAD = json.dumps([{"title": f"camping {i}", "description": "by the lake"} for i in range(100)]).encode()
+
+
+def train(path: Path, seed: int) -> Path:
+    samples: list[ByteString] = [
+        json.dumps({"id": i * seed, "title": f"camping {i}", "description": "by the lake", "rating": i % 5}).encode()
+        for i in range(2000)
+    ]
+    path.write_bytes(zstandard.train_dictionary(4096, samples).as_bytes())
+    return path
+
+
+def test_large_payloads_round_trip():
+    compressed = Compressor(configs.cache.Compression(threshold=100)).compress(PAYLOAD)
+
+    assert compressed is not None and len(compressed) < len(PAYLOAD)
+    assert decompress(compressed) == PAYLOAD
+
+
+def test_small_payloads_are_left_alone():
+    assert Compressor(configs.cache.Compression(threshold=len(PAYLOAD) + 1)).compress(PAYLOAD) is None
+
+
+def test_payloads_that_do_not_shrink_are_left_alone():
+    assert Compressor(configs.cache.Compression(threshold=0)).compress(os.urandom(4096)) is None
+
+
+def test_dictionary_frames_round_trip(tmp_path: Path):
+    compressor = Compressor(configs.cache.Compression(threshold=0, dictionary=train(tmp_path / "cache.zdict", 1)))
+    payload = b'{"id": 7, "title": "camping 7", "description": "by the lake", "rating": 2}'
+
+    compressed = compressor.compress(payload)
+
+    assert compressed is not None and zstandard.get_frame_parameters(compressed).dict_id != 0
+    assert decompress(compressed) == payload
+
+
+def test_frames_of_unknown_dictionaries_are_rejected(tmp_path: Path):
+    dictionary = zstandard.ZstdCompressionDict(train(tmp_path / "unknown.zdict", 2).read_bytes())
+    compressed = zstandard.ZstdCompressor(dict_data=dictionary).compress(PAYLOAD)
+
+    with pytest.raises(CompressionError, match="not loaded"):
+        decompress(compressed)
+
+
+def test_untrained_dictionaries_are_rejected(tmp_path: Path):
+    path = tmp_path / "raw.zdict"
+    path.write_bytes(PAYLOAD)
+
+    with pytest.raises(CompressionError, match="not a trained"):
+        load_dictionary(path)
+
+
+async def test_cached_values_are_compressed_above_the_threshold(make_cache: MakeCache):
+    cache = await make_cache({"compression": {"enabled": True, "threshold": 256}})
+    small, large = KEYSPACE.key("small"), KEYSPACE.key("large")
+    ids = [f"camping-{i}" for i in range(100)]
+
+    await cache.set_many([(small, IDList(ids=ids[:1]), Cache.HOT_FEAT), (large, IDList(ids=ids), Cache.HOT_FEAT)])
+
+    stored = await cache.peek_many([small, large])
+    flags = [codec.Envelope.unpack(data).flags & codec.Envelope.FLAG_COMPRESSED for data in stored if data]
+    assert flags == [0, codec.Envelope.FLAG_COMPRESSED]
+    # readers decompress whatever they find, whether they compress themselves or not
+    plain = await make_cache()
+    assert await plain.get_many([small, large], t=IDList) == [IDList(ids=ids[:1]), IDList(ids=ids)]
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import timedelta
+
+from prometheus_client import REGISTRY
+
+from backcat.services.cache import Cache, IDList, register
+from tests.helpers import eventually
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-expiry")
+
+
+def early_refreshes() -> float:
+    return REGISTRY.get_sample_value("backcat_cache_early_refreshes_total", {"keyspace": "test-expiry"}) or 0
+
+
+async def test_ttls_are_shortened_by_the_jitter(make_cache: MakeCache):
+    cache = await make_cache({"expiry": {"jitter": 0.5}})
+    keys = [KEYSPACE.key(str(i)) for i in range(50)]
+
+    await cache.set_many([(key, IDList(ids=[]), Cache.COLD_FEAT) for key in keys])
+
+    ttls = [await cache.ttl(key) for key in keys]
+    assert all(
+        ttl is not None and Cache.COLD_FEAT * 0.5 - timedelta(seconds=1) <= ttl <= Cache.COLD_FEAT for ttl in ttls
+    )
+    assert max(ttls) - min(ttls) > Cache.COLD_FEAT * 0.2  # type: ignore
+
+
+async def test_exact_ttls_are_not_jittered(make_cache: MakeCache):
+    cache = await make_cache({"expiry": {"jitter": 0.5}})
+    key = KEYSPACE.key("exact")
+
+    await cache.set(key, IDList(ids=[]), expire=Cache.COLD_FEAT, exact=True)
+
+    ttl = await cache.ttl(key)
+    assert ttl is not None and ttl > Cache.COLD_FEAT - timedelta(seconds=1)
+
+
+async def test_slow_values_are_recomputed_before_they_expire(make_cache: MakeCache):
+    cache = await make_cache({"expiry": {"beta": 10}})
+    key = KEYSPACE.key("slow")
+    # took an hour to compute and turns stale in a minute, xfetch refreshes it well before that
+    await cache.set(key, IDList(ids=["old"]), expire=timedelta(minutes=1), recompute=3600)
+    before = early_refreshes()
+
+    async def load() -> IDList:
+        return IDList(ids=["new"])
+
+    assert await cache.get_or_load(key, load, t=IDList, expire=timedelta(minutes=1)) == IDList(ids=["old"])
+    assert await eventually(lambda: cache.get(key, t=IDList), IDList(ids=["new"])) == IDList(ids=["new"])
+    assert early_refreshes() == before + 1
+
+
+async def test_fast_values_are_not_recomputed_early(make_cache: MakeCache):
+    cache = await make_cache()
+    key = KEYSPACE.key("fast")
+    await cache.set(key, IDList(ids=["old"]), expire=Cache.COLD_FEAT, recompute=0.001)
+    calls = 0
+
+    async def load() -> IDList:
+        nonlocal calls
+        calls += 1
+        return IDList(ids=["new"])
+
+    for _ in range(100):
+        assert await cache.get_or_load(key, load, t=IDList) == IDList(ids=["old"])
+    await asyncio.sleep(0.05)
+    assert calls == 0
+
+
+async def test_zero_beta_disables_early_recomputation(make_cache: MakeCache):
+    cache = await make_cache({"expiry": {"beta": 0}})
+    key = KEYSPACE.key("disabled")
+    await cache.set(key, IDList(ids=["old"]), expire=timedelta(minutes=1), recompute=3600)
+    before = early_refreshes()
+
+    async def load() -> IDList:
+        return IDList(ids=["new"])
+
+    for _ in range(10):
+        assert await cache.get_or_load(key, load, t=IDList) == IDList(ids=["old"])
+    assert early_refreshes() == before
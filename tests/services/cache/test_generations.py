@@ -0,0 +1,96 @@
+from backcat.services.cache import Cache, IDList, Keyspace, register
+from tests.helpers import eventually
+from tests.servers import MakeCache, RedisServer
+
+KEYSPACE = register("test-generations")
+
+OTHER = register("test-generations-other")
+
+
+async def read(cache: Cache, ks: Keyspace) -> int:
+    """Generation `cache` reads `ks` with"""
+    await cache.get(ks.key("probe"))
+    return cache.generation(ks)
+
+
+async def test_bump_makes_every_key_unreachable(cache: Cache):
+    keys = [KEYSPACE.key(str(i)) for i in range(3)]
+    await cache.set_many([(key, IDList(ids=[]), Cache.HOT_FEAT) for key in keys])
+    other = OTHER.key("kept")
+    await cache.set(other, IDList(ids=[]), expire=Cache.HOT_FEAT)
+
+    generation = await cache.bump(KEYSPACE)
+
+    assert generation == 1
+    assert await cache.get_many([KEYSPACE.key(str(i)) for i in range(3)], t=IDList) == [None] * 3
+    assert await cache.get(other, t=IDList) == IDList(ids=[])
+
+
+async def test_keys_are_written_under_the_new_generation(cache: Cache):
+    await cache.bump(KEYSPACE)
+    await cache.bump(KEYSPACE)
+    key = KEYSPACE.key("new")
+
+    await cache.set(key, IDList(ids=["new"]), expire=Cache.HOT_FEAT)
+
+    assert key.as_str() == "test-generations:new"
+    assert await cache.scan(KEYSPACE) == (0, [key])
+    assert await cache.get(key, t=IDList) == IDList(ids=["new"])
+
+
+async def test_listening_workers_switch_on_the_invalidation(make_cache: MakeCache):
+    worker, other = await make_cache({"local": {"enabled": True}}), await make_cache({"local": {"enabled": True}})
+    await read(worker, KEYSPACE)
+
+    await other.bump(KEYSPACE)
+
+    assert await eventually(lambda: read(worker, KEYSPACE), 1) == 1
+
+
+async def test_other_workers_switch_within_the_generation_ttl(make_cache: MakeCache):
+    worker, other = await make_cache(), await make_cache()
+    await read(worker, KEYSPACE)
+
+    await other.bump(KEYSPACE)
+
+    assert await read(worker, KEYSPACE) == 0
+    timeout = Cache.GENERATION_TTL.total_seconds() + 1
+    assert await eventually(lambda: read(worker, KEYSPACE), 1, timeout=timeout) == 1
+
+
+async def test_bump_drops_the_local_tier_and_tells_watchers(make_cache: MakeCache):
+    cache = await make_cache({"local": {"enabled": True}})
+    await cache.set(KEYSPACE.key("local"), IDList(ids=[]), expire=Cache.HOT_FEAT)
+    await cache.get(KEYSPACE.key("local"))
+    changes: list[str | None] = []
+    await cache.watch(KEYSPACE, changes.append)
+
+    await cache.bump(KEYSPACE)
+
+    assert cache.local_stats()["test-generations"].entries == 0
+    assert None in changes
+
+
+async def test_caches_keep_their_own_generations(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    worker, other = await make_cache(), await make_cache()
+    assert await read(worker, KEYSPACE) == 0
+
+    await other.bump(KEYSPACE)
+    await worker.set(KEYSPACE.key("mine"), IDList(ids=[]), expire=Cache.HOT_FEAT)
+
+    # the bump of the other cache does not reach this one's keys until it reads the generation again
+    assert other.generation(KEYSPACE) == 1
+    assert worker.generation(KEYSPACE) == 0
+    assert redis_servers[0].client.exists("test-generations:mine") == 1
+
+
+async def test_watchers_are_told_the_keys_they_built(make_cache: MakeCache):
+    cache = await make_cache({"local": {"enabled": True}})
+    changes: list[str | None] = []
+    await cache.watch(KEYSPACE, changes.append)
+    await cache.bump(KEYSPACE)
+    key = KEYSPACE.key("watched")
+
+    await cache.set(key, IDList(ids=[]), expire=Cache.HOT_FEAT)
+
+    assert changes[-1] == key.as_str()
@@ -0,0 +1,90 @@
+import time
+from datetime import timedelta
+
+from backcat import configs
+from backcat.services.cache import Cache, HotKeys, IDList, register
+from backcat.services.cache.hotkeys import CountMinSketch
+from tests.servers import MakeCache, RedisServer
+
+KEYSPACE = register("test-hotkeys")
+
+HOT = {"hotkeys": {"enabled": True, "threshold": 10, "top": 4, "extend": 3}, "expiry": {"jitter": 0}}
+
+
+def test_sketch_never_undercounts():
+    sketch = CountMinSketch(64, 4, 60)
+    counts = {f"key-{i}": i % 7 + 1 for i in range(500)}
+    for key, count in counts.items():
+        for _ in range(count):
+            sketch.add(key)
+
+    assert all(sketch.add(key) > count for key, count in counts.items())
+
+
+def test_sketch_halves_its_counters_every_window(monkeypatch):
+    sketch = CountMinSketch(64, 4, 60)
+    for _ in range(10):
+        sketch.add("key")
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert sketch.decay()
+    assert sketch.add("key") == 6
+
+
+def test_hottest_keys_make_the_top():
+    hotkeys = HotKeys(configs.cache.HotKeys(top=2, threshold=5))
+    for key, reads in [("a", 3), ("b", 10), ("c", 1), ("d", 7)]:
+        for _ in range(reads):
+            hotkeys.record(key)
+
+    assert [key for key, _ in hotkeys.top()] == ["b", "d"]
+    assert hotkeys.is_hot("b") and hotkeys.is_hot("d")
+    assert not hotkeys.is_hot("a")
+
+
+def test_top_keys_below_the_threshold_are_not_hot():
+    hotkeys = HotKeys(configs.cache.HotKeys(top=2, threshold=5))
+    for _ in range(4):
+        hotkeys.record("a")
+
+    assert hotkeys.top() == [("a", 4)]
+    assert not hotkeys.is_hot("a")
+
+
+async def test_hot_keys_are_reported_by_keyspace(make_cache: MakeCache):
+    cache = await make_cache(HOT)
+    for _ in range(3):
+        await cache.get(KEYSPACE.key("read"))
+
+    assert cache.hot_keys()["test-hotkeys"] == [(KEYSPACE.key("read").as_str(), 3)]
+
+
+async def test_hot_keys_are_kept_longer(make_cache: MakeCache):
+    cache = await make_cache(HOT)
+    hot, cold = KEYSPACE.key("hot"), KEYSPACE.key("cold")
+    for _ in range(10):
+        await cache.get(hot)
+
+    await cache.set_many([(hot, IDList(ids=[]), Cache.LIVE_FEAT), (cold, IDList(ids=[]), Cache.LIVE_FEAT)])
+
+    hot_ttl, cold_ttl = await cache.ttl(hot), await cache.ttl(cold)
+    assert hot_ttl is not None and hot_ttl > Cache.LIVE_FEAT * 3 - timedelta(seconds=1)
+    assert cold_ttl is not None and cold_ttl <= Cache.LIVE_FEAT
+
+
+async def test_hot_keys_are_promoted_in_process(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(HOT)
+    hot, cold = KEYSPACE.key("hot"), KEYSPACE.key("cold")
+    await cache.set_many([(hot, IDList(ids=["hot"]), Cache.HOT_FEAT), (cold, IDList(ids=["cold"]), Cache.HOT_FEAT)])
+    for _ in range(10):
+        await cache.get(hot)
+    await cache.get(cold)
+    assert not cache.has_local(KEYSPACE)
+
+    redis_servers[0].flush()
+
+    assert await cache.get(hot, t=IDList) == IDList(ids=["hot"])
+    assert await cache.get(cold, t=IDList) is None
+    assert cache.local_stats()["test-hotkeys"].promoted
@@ -0,0 +1,75 @@
+import time
+
+from backcat.services.cache import Cache, LocalCache, register
+from tests.helpers import eventually
+from tests.servers import MakeCache, RedisServer
+
+KEYSPACE = register("test-local")
+
+LOCAL = {"local": {"enabled": True, "ttl": 60}}
+
+
+def test_local_cache_drops_least_recently_used():
+    local = LocalCache[int](2, 60)
+    local.put("a", 1)
+    local.put("b", 2)
+    local.get("a")
+    local.put("c", 3)
+
+    assert local.get("a") == 1
+    assert local.get("b") is None
+    assert local.get("c") == 3
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    local = LocalCache[int](2, 60)
+    local.put("a", 1, ttl=1)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+    assert local.get("a") is None
+    assert len(local) == 0
+
+
+def test_local_cache_rejects_values_fetched_before_an_eviction():
+    local = LocalCache[int](2, 60)
+    epoch = local.epoch
+    local.evict("a")
+
+    local.put("a", 1, epoch=epoch)
+
+    assert local.get("a") is None
+
+
+async def test_reads_are_served_in_process(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(LOCAL)
+    key = KEYSPACE.key("served")
+    await cache.set(key, {"v": 1}, expire=Cache.HOT_FEAT)
+    assert await cache.get(key) == {"v": 1}
+
+    redis_servers[0].flush()
+
+    assert await cache.get(key) == {"v": 1}
+    assert cache.local_stats()["test-local"].entries == 1
+
+
+async def test_writes_evict_other_workers(make_cache: MakeCache):
+    worker, other = await make_cache(LOCAL), await make_cache(LOCAL)
+    key = KEYSPACE.key("written")
+    await other.set(key, {"v": 1}, expire=Cache.HOT_FEAT)
+    assert await worker.get(key) == {"v": 1}
+
+    await other.set(key, {"v": 2}, expire=Cache.HOT_FEAT)
+
+    assert await eventually(lambda: worker.get(key), {"v": 2}) == {"v": 2}
+
+
+async def test_invalidations_evict_other_workers(make_cache: MakeCache):
+    worker, other = await make_cache(LOCAL), await make_cache(LOCAL)
+    key = KEYSPACE.key("invalidated")
+    await other.set(key, {"v": 1}, expire=Cache.HOT_FEAT)
+    assert await worker.get(key) == {"v": 1}
+
+    await other.invalidate(key)
+
+    assert await eventually(lambda: worker.get(key), None) is None
@@ -0,0 +1,69 @@
+from prometheus_client import REGISTRY, generate_latest
+
+from backcat.services.cache import Cache, IDList, register
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-metrics")
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, {"keyspace": "test-metrics", **labels}) or 0
+
+
+async def test_hits_are_counted_by_tier(make_cache: MakeCache):
+    writer, cache = await make_cache(), await make_cache({"local": {"enabled": True}})
+    key = KEYSPACE.key("hit")
+    await writer.set(key, IDList(ids=[]), expire=Cache.HOT_FEAT)
+    cache_hits = sample("backcat_cache_hits_total", tier="redis"), sample("backcat_cache_hits_total", tier="local")
+
+    await cache.get(key)
+    await cache.get(key)
+
+    assert sample("backcat_cache_hits_total", tier="redis") == cache_hits[0] + 1
+    assert sample("backcat_cache_hits_total", tier="local") == cache_hits[1] + 1
+
+
+async def test_misses_are_counted(cache: Cache):
+    before = sample("backcat_cache_misses_total")
+
+    await cache.get_many([KEYSPACE.key("a"), KEYSPACE.key("b")], t=IDList)
+
+    assert sample("backcat_cache_misses_total") == before + 2
+
+
+async def test_swallowed_errors_are_counted(cache: Cache):
+    key = KEYSPACE.key("undecodable")
+    await cache.set(key, {"not": "an id list"}, expire=Cache.HOT_FEAT)
+    before = sample("backcat_cache_errors_total", op="decode")
+
+    assert await cache.get(key, t=IDList) is None
+
+    assert sample("backcat_cache_errors_total", op="decode") == before + 1
+
+
+async def test_local_evictions_are_counted_by_reason(make_cache: MakeCache):
+    writer, cache = await make_cache(), await make_cache({"local": {"enabled": True, "max_size": 1}})
+    first, second = KEYSPACE.key("first"), KEYSPACE.key("second")
+    await writer.set_many([(first, IDList(ids=[]), Cache.HOT_FEAT), (second, IDList(ids=[]), Cache.HOT_FEAT)])
+    before = sample("backcat_cache_local_evictions_total", reason="capacity")
+
+    await cache.get(first)
+    await cache.get(second)
+
+    assert sample("backcat_cache_local_evictions_total", reason="capacity") == before + 1
+
+
+async def test_operations_are_timed_and_sized(cache: Cache):
+    before = sample("backcat_cache_operation_duration_seconds_count", op="set")
+    written = sample("backcat_cache_payload_bytes_sum", op="write")
+
+    await cache.set(KEYSPACE.key("timed"), IDList(ids=["a" * 100]), expire=Cache.HOT_FEAT)
+
+    assert sample("backcat_cache_operation_duration_seconds_count", op="set") == before + 1
+    assert sample("backcat_cache_payload_bytes_sum", op="write") > written + 100
+
+
+async def test_metrics_are_exported_by_keyspace(cache: Cache):
+    await cache.get(KEYSPACE.key("exported"))
+
+    assert b'backcat_cache_misses_total{keyspace="test-metrics"}' in generate_latest()
@@ -0,0 +1,48 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from backcat.services.cache import register
+
+KEYSPACE = register("test-query")
+
+
+class Filter(BaseModel):
+    user_id: UUID | None = None
+    booked: bool | None = None
+    tags: list[str] = []
+
+
+USER = UUID("a3c2d2b8-5f3c-4bb6-9b1e-2f0a8b1e7c11")
+
+
+def test_equal_filters_share_a_key():
+    first = Filter(user_id=USER, booked=True)
+    second = Filter(booked=True, user_id=USER)
+
+    assert KEYSPACE.query(first).as_str() == KEYSPACE.query(second).as_str()
+
+
+def test_key_lists_every_field_sorted_by_name():
+    key = KEYSPACE.query(Filter(user_id=USER, tags=["b", "a"]))
+
+    assert key.as_str() == f'test-query:query:booked=null:tags=["b","a"]:user_id={USER}'
+
+
+def test_different_filters_get_different_keys():
+    keys = {
+        KEYSPACE.query(Filter()).as_str(),
+        KEYSPACE.query(Filter(booked=True)).as_str(),
+        KEYSPACE.query(Filter(booked=False)).as_str(),
+        KEYSPACE.query(Filter(user_id=USER)).as_str(),
+    }
+
+    assert len(keys) == 4
+
+
+def test_path_separates_queries_of_equal_filters():
+    first = KEYSPACE.query(Filter(booked=True), "actor-a")
+    second = KEYSPACE.query(Filter(booked=True), "actor-b")
+
+    assert first.as_str() != second.as_str()
+    assert first.path[:2] == ["query", "actor-a"]
@@ -0,0 +1,67 @@
+import pydantic
+import pytest
+
+from backcat.services.cache import Cache, IDList, RegistryError, codec, register, registry
+from tests.servers import MakeCache
+
+
+class Old(pydantic.BaseModel):
+    name: str
+
+
+class New(pydantic.BaseModel):
+    name: str
+    rating: int = 0
+
+
+@pytest.fixture(autouse=True)
+def keyspaces(monkeypatch: pytest.MonkeyPatch):
+    """Keyspaces registered by a test are forgotten after it"""
+    monkeypatch.setattr(registry, "KEYSPACES", dict(registry.KEYSPACES))
+
+
+def test_names_are_registered_once():
+    register("test-registry", Old)
+
+    with pytest.raises(RegistryError, match="already registered for Old"):
+        register("test-registry", New)
+
+
+@pytest.mark.parametrize("name", ["a:b", "a@b", "a#b"])
+def test_names_must_not_contain_separators(name: str):
+    with pytest.raises(RegistryError, match="invalid"):
+        register(name)
+
+
+def test_typed_keys_carry_the_schema_fingerprint():
+    untyped = register("test-registry-untyped")
+    typed = register("test-registry-typed", Old)
+
+    assert untyped.key("1").as_str() == "test-registry-untyped:1"
+    assert typed.key("1").as_str() == f"test-registry-typed@{registry.fingerprint(Old)}:1"
+
+
+def test_fingerprints_change_with_the_schema():
+    assert registry.fingerprint(Old) == registry.fingerprint(Old)
+    assert registry.fingerprint(Old) != registry.fingerprint(New)
+
+
+async def test_values_of_other_types_are_refused(make_cache: MakeCache):
+    cache = await make_cache()
+    ks = register("test-registry-checked", Old)
+
+    with pytest.raises(codec.CodecError, match="does not belong"):
+        await cache.set(ks.key("1"), New(name="x"), expire=Cache.HOT_FEAT, silent=False)
+
+    await cache.set(ks.key("2"), IDList(ids=["1"]), expire=Cache.HOT_FEAT, silent=False)
+    assert await cache.get(ks.key("2"), t=IDList) == IDList(ids=["1"])
+
+
+async def test_keyspaces_may_pick_their_codec(make_cache: MakeCache):
+    cache = await make_cache({"codec": "msgpack"})
+    ks = register("test-registry-json", Old, codec="json")
+
+    await cache.set(ks.key("1"), Old(name="x"), expire=Cache.HOT_FEAT)
+
+    [stored] = await cache.peek_many([ks.key("1")])
+    assert stored is not None and codec.Envelope.unpack(stored).codec == codec.JsonCodec.id
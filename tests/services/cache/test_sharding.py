@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from backcat.services.cache import Cache, IDList, register
+from backcat.services.cache.sharding import Ring
+from tests.servers import MakeCache, RedisServer
+
+KEYSPACE = register("test-sharding")
+
+NODES = ["redis-a:6379/0", "redis-b:6379/0", "redis-c:6379/0"]
+KEYS = [f"test-sharding:{i}" for i in range(3000)]
+
+
+def owners(ring: Ring, nodes: list[str]) -> dict[str, str]:
+    return {key: nodes[ring.node(key)] for key in KEYS}
+
+
+def test_ring_spreads_keys_evenly():
+    placed = owners(Ring(NODES), NODES)
+
+    for node in NODES:
+        share = sum(owner == node for owner in placed.values()) / len(KEYS)
+        assert 0.25 < share < 0.42, node
+
+
+def test_ring_placement_does_not_depend_on_node_order():
+    reordered = list(reversed(NODES))
+
+    assert owners(Ring(NODES), NODES) == owners(Ring(reordered), reordered)
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    grown = [*NODES, "redis-d:6379/0"]
+    before = owners(Ring(NODES), NODES)
+    after = owners(Ring(grown), grown)
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert all(after[key] == "redis-d:6379/0" for key in moved)
+    assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+
+def test_removing_a_node_only_moves_its_keys():
+    shrunk = NODES[:2]
+    before = owners(Ring(NODES), NODES)
+    after = owners(Ring(shrunk), shrunk)
+
+    for key in KEYS:
+        if before[key] != "redis-c:6379/0":
+            assert after[key] == before[key]
+
+
+async def test_set_many_and_get_many_span_every_shard(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(shards=3)
+    keys = [KEYSPACE.key(str(i)) for i in range(60)]
+
+    await cache.set_many([(key, {"i": i}, Cache.HOT_FEAT) for i, key in enumerate(keys)])
+
+    stored = [server.size() for server in redis_servers]
+    assert all(count > 0 for count in stored)
+    assert sum(stored) == len(keys)
+    assert [await cache.get(key) for key in keys] == [{"i": i} for i in range(len(keys))]
+
+
+async def test_get_many_keeps_order_across_shards(make_cache: MakeCache):
+    cache = await make_cache(shards=3)
+    keys = [KEYSPACE.key(str(i)) for i in range(30)]
+    await cache.set_many([(key, IDList(ids=[str(i)]), Cache.HOT_FEAT) for i, key in enumerate(keys) if i % 3 != 0])
+
+    found = await cache.get_many(keys, t=IDList)
+
+    assert found == [None if i % 3 == 0 else IDList(ids=[str(i)]) for i in range(len(keys))]
+
+
+async def test_invalidate_tag_drops_members_on_every_shard(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(shards=3)
+    tagged = [KEYSPACE.key("tagged", str(i)) for i in range(30)]
+    other = KEYSPACE.key("other")
+    await cache.set_many([(key, {"i": i}, Cache.HOT_FEAT) for i, key in enumerate(tagged)], tags=["test-sharding:t"])
+    await cache.set(other, {"i": -1}, expire=Cache.HOT_FEAT)
+
+    await cache.invalidate_tag("test-sharding:t")
+
+    assert [await cache.get(key) for key in tagged] == [None] * len(tagged)
+    assert await cache.get(other) == {"i": -1}
+    assert sum(server.size() for server in redis_servers) == 1
+
+
+async def test_scan_walks_every_shard_once(make_cache: MakeCache):
+    cache = await make_cache(shards=3)
+    keys = {KEYSPACE.key(str(i)).as_str() for i in range(100)}
+    await cache.set_many([(KEYSPACE.key(str(i)), {"i": i}, Cache.HOT_FEAT) for i in range(100)])
+
+    found: list[str] = []
+    cursor = 0
+    while True:
+        cursor, page = await cache.scan(KEYSPACE, cursor=cursor, count=10)
+        found.extend(key.as_str() for key in page)
+        if cursor == 0:
+            break
+
+    assert len(found) == len(set(found))
+    assert set(found) == keys
+
+
+async def test_record_write_reaches_the_shard_adapt_reads(make_cache: MakeCache):
+    cache = await make_cache({"adaptive": {"enabled": True, "min": 1, "factor": 0.5}}, shards=3)
+    keys = [KEYSPACE.key("written", str(i)) for i in range(12)]
+
+    # two writes in quick succession make every key volatile, wherever its statistics live
+    await cache.record_write(*keys, silent=False)
+    await cache.record_write(*keys, silent=False)
+    await cache.set_many([(key, {"i": i}, Cache.COLD_FEAT) for i, key in enumerate(keys)])
+
+    for key in keys:
+        ttl = await cache.ttl(key)
+        assert ttl is not None and ttl <= timedelta(seconds=1)
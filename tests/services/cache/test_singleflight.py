@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from backcat.services.cache import Cache, IDList, SingleFlight, register
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-singleflight")
+
+
+class Loader:
+    """Counts its calls and keeps every one of them waiting until released"""
+
+    def __init__(self, value: IDList | None = None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self._value = value if value is not None else IDList(ids=["loaded"])
+
+    async def __call__(self) -> IDList | None:
+        self.calls += 1
+        await self.release.wait()
+        return self._value
+
+
+async def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    loader = Loader()
+
+    waiting = [asyncio.create_task(flights.do("key", loader)) for _ in range(10)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await asyncio.gather(*waiting) == [IDList(ids=["loaded"])] * 10
+    assert loader.calls == 1
+    assert len(flights) == 0
+
+
+async def test_errors_reach_every_caller():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+    assert [str(result) for result in results] == ["boom"] * 3
+
+
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+    loader = Loader()
+    cancelled = asyncio.create_task(flights.do("key", loader))
+    waiting = asyncio.create_task(flights.do("key", loader))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    loader.release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await waiting == IDList(ids=["loaded"])
+
+
+async def test_concurrent_misses_load_once(cache: Cache):
+    loader = Loader()
+    key = KEYSPACE.key("worker")
+
+    waiting = [asyncio.create_task(cache.get_or_load(key, loader, t=IDList)) for _ in range(10)]
+    await asyncio.sleep(0.05)
+    loader.release.set()
+
+    assert await asyncio.gather(*waiting) == [IDList(ids=["loaded"])] * 10
+    assert loader.calls == 1
+    assert await cache.get(key, t=IDList) == IDList(ids=["loaded"])
+
+
+async def test_misses_in_other_workers_wait_for_the_lock_holder(make_cache: MakeCache):
+    workers = [await make_cache() for _ in range(3)]
+    loader = Loader()
+    key = KEYSPACE.key("workers")
+
+    waiting = [asyncio.create_task(worker.get_or_load(key, loader, t=IDList)) for worker in workers]
+    await asyncio.sleep(0.05)
+    loader.release.set()
+
+    assert await asyncio.gather(*waiting) == [IDList(ids=["loaded"])] * 3
+    assert loader.calls == 1
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import timedelta
+
+from backcat import domain
+from backcat.services.cache import IDList, register
+from tests.helpers import eventually
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-stale", domain.Camping)
+
+SOFT_TTL = timedelta(milliseconds=200)
+
+STALE = {"stale": {"enabled": True, "grace": 5}, "expiry": {"jitter": 0, "beta": 0}}
+
+POLYGON = [domain.Point(lat=0, lon=0), domain.Point(lat=0, lon=1), domain.Point(lat=1, lon=1)]
+
+
+class Loader:
+    """Counts its calls and returns the value it was last given"""
+
+    def __init__(self, value: IDList):
+        self.calls = 0
+        self.value = value
+
+    async def __call__(self) -> IDList:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return self.value
+
+
+async def test_stale_values_are_served_while_refreshed(make_cache: MakeCache):
+    cache = await make_cache(STALE)
+    key = KEYSPACE.key("stale")
+    await cache.set(key, IDList(ids=["old"]), expire=SOFT_TTL)
+    await asyncio.sleep(SOFT_TTL.total_seconds() * 1.5)
+    loader = Loader(IDList(ids=["new"]))
+
+    served = await asyncio.gather(*(cache.get_or_load(key, loader, t=IDList, expire=SOFT_TTL) for _ in range(5)))
+
+    assert served == [IDList(ids=["old"])] * 5
+    assert await eventually(lambda: cache.get(key, t=IDList), IDList(ids=["new"])) == IDList(ids=["new"])
+    assert loader.calls == 1
+
+
+async def test_fresh_values_are_not_refreshed(make_cache: MakeCache):
+    cache = await make_cache(STALE)
+    key = KEYSPACE.key("fresh")
+    await cache.set(key, IDList(ids=["old"]), expire=timedelta(minutes=1))
+    loader = Loader(IDList(ids=["new"]))
+
+    assert await cache.get_or_load(key, loader, t=IDList) == IDList(ids=["old"])
+    await asyncio.sleep(0.1)
+    assert loader.calls == 0
+
+
+async def test_values_are_dropped_after_the_grace(make_cache: MakeCache):
+    cache = await make_cache({**STALE, "stale": {"enabled": True, "grace": 0.5}})
+    key = KEYSPACE.key("gone")
+    await cache.set(key, IDList(ids=["old"]), expire=SOFT_TTL)
+    await asyncio.sleep(SOFT_TTL.total_seconds() * 2)
+    loader = Loader(IDList(ids=["new"]))
+
+    assert await cache.get_or_load(key, loader, t=IDList, expire=SOFT_TTL) == IDList(ids=["new"])
+    assert loader.calls == 1
+
+
+async def test_without_stale_serving_values_expire_at_their_ttl(make_cache: MakeCache):
+    cache = await make_cache({"expiry": {"jitter": 0, "beta": 0}})
+    key = KEYSPACE.key("expired")
+    await cache.set(key, IDList(ids=["old"]), expire=SOFT_TTL)
+    await asyncio.sleep(SOFT_TTL.total_seconds() * 1.5)
+
+    assert await cache.get(key, t=IDList) is None
+
+
+async def test_stale_entities_are_refreshed_in_batches(make_cache: MakeCache):
+    cache = await make_cache(STALE)
+    campings = [
+        domain.Camping(**domain.Camping.new_defaults_kwargs(), polygon=POLYGON, title=str(i), description=None)
+        for i in range(3)
+    ]
+    await cache.set_many([(KEYSPACE.key(camping.id.hex), camping, SOFT_TTL) for camping in campings])
+    await asyncio.sleep(SOFT_TTL.total_seconds() * 1.5)
+    renamed = [camping.model_copy(update={"title": "renamed"}) for camping in campings]
+    asked: list[list[str]] = []
+
+    async def load(ids: list[str]) -> list[domain.Camping]:
+        asked.append(ids)
+        return [camping for camping in renamed if camping.id.hex in ids]
+
+    ids = [camping.id.hex for camping in campings]
+    assert await cache.hydrate(KEYSPACE, ids, load, t=domain.Camping, expire=SOFT_TTL) == campings
+
+    refreshed = await eventually(lambda: cache.hydrate(KEYSPACE, ids, load, t=domain.Camping), renamed)
+    assert refreshed == renamed
+    assert asked == [ids]
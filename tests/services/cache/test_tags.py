@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from backcat.services.cache import Cache, IDList, register
+from tests.servers import RedisServer
+
+KEYSPACE = register("test-tags")
+
+
+async def test_invalidate_tag_drops_only_its_members(cache: Cache):
+    tagged, other = KEYSPACE.key("tagged"), KEYSPACE.key("other")
+    await cache.set(tagged, IDList(ids=["a"]), expire=Cache.HOT_FEAT, tags=["test-tags:lists"])
+    await cache.set(other, IDList(ids=["b"]), expire=Cache.HOT_FEAT, tags=["test-tags:other"])
+
+    await cache.invalidate_tag("test-tags:lists")
+
+    assert await cache.get(tagged, t=IDList) is None
+    assert await cache.get(other, t=IDList) == IDList(ids=["b"])
+
+
+async def test_invalidate_tag_takes_several_tags(cache: Cache):
+    keys = [KEYSPACE.key(str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        await cache.set(key, IDList(ids=[str(i)]), expire=Cache.HOT_FEAT, tags=[f"test-tags:{i}"])
+
+    await cache.invalidate_tag("test-tags:0", "test-tags:2")
+
+    assert await cache.get_many(keys, t=IDList) == [None, IDList(ids=["1"]), None]
+
+
+async def test_keys_can_carry_several_tags(cache: Cache):
+    key = KEYSPACE.key("both")
+    await cache.set(key, IDList(ids=["a"]), expire=Cache.HOT_FEAT, tags=["test-tags:a", "test-tags:b"])
+
+    await cache.invalidate_tag("test-tags:b")
+
+    assert await cache.get(key, t=IDList) is None
+
+
+async def test_tag_sets_outlive_their_members(cache: Cache, redis_servers: list[RedisServer]):
+    await cache.set(KEYSPACE.key("long"), IDList(ids=[]), expire=Cache.COLD_FEAT, tags=["test-tags:t"], exact=True)
+    await cache.set(KEYSPACE.key("short"), IDList(ids=[]), expire=Cache.LIVE_FEAT, tags=["test-tags:t"], exact=True)
+
+    ttl = timedelta(milliseconds=redis_servers[0].client.pttl("tag:test-tags:t"))  # type: ignore
+
+    assert Cache.COLD_FEAT - timedelta(seconds=1) < ttl <= Cache.COLD_FEAT
+
+
+async def test_tag_sets_grow_with_longer_members(cache: Cache, redis_servers: list[RedisServer]):
+    await cache.set(KEYSPACE.key("short"), IDList(ids=[]), expire=Cache.LIVE_FEAT, tags=["test-tags:t"], exact=True)
+    await cache.set(KEYSPACE.key("long"), IDList(ids=[]), expire=Cache.COLD_FEAT, tags=["test-tags:t"], exact=True)
+
+    ttl = timedelta(milliseconds=redis_servers[0].client.pttl("tag:test-tags:t"))  # type: ignore
+
+    assert Cache.COLD_FEAT - timedelta(seconds=1) < ttl <= Cache.COLD_FEAT
+
+
+async def test_keys_tagged_after_an_invalidation_are_tracked_again(cache: Cache):
+    key = KEYSPACE.key("again")
+    await cache.set(key, IDList(ids=["a"]), expire=Cache.HOT_FEAT, tags=["test-tags:t"])
+    await cache.invalidate_tag("test-tags:t")
+    await cache.set(key, IDList(ids=["b"]), expire=Cache.HOT_FEAT, tags=["test-tags:t"])
+
+    await cache.invalidate_tag("test-tags:t")
+
+    assert await cache.get(key, t=IDList) is None
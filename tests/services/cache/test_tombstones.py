@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from backcat.services.cache import Cache, IDList, codec, register
+from tests.servers import MakeCache
+
+KEYSPACE = register("test-tombstones")
+
+
+async def test_missing_values_are_not_loaded_again(cache: Cache):
+    calls = 0
+
+    async def load() -> IDList | None:
+        nonlocal calls
+        calls += 1
+        return None
+
+    key = KEYSPACE.key("missing")
+    assert await cache.get_or_load(key, load, t=IDList) is None
+    assert await cache.get_or_load(key, load, t=IDList) is None
+
+    assert calls == 1
+    ttl = await cache.ttl(key)
+    assert ttl is not None and Cache.NEGATIVE_FEAT - timedelta(seconds=1) < ttl <= Cache.NEGATIVE_FEAT
+
+
+async def test_tombstones_read_as_missing(cache: Cache):
+    key = KEYSPACE.key("deleted")
+    await cache.set(key, IDList(ids=["a"]), expire=Cache.HOT_FEAT)
+
+    await cache.tombstone(key, expire=Cache.COLD_FEAT)
+
+    assert await cache.get(key, t=IDList) is None
+    assert await cache.get_many([key], t=IDList) == [None]
+    [stored] = await cache.peek_many([key])
+    assert stored is not None and codec.is_tombstone(stored)
+
+
+async def test_values_replace_tombstones(cache: Cache):
+    key = KEYSPACE.key("recreated")
+    await cache.tombstone(key)
+
+    await cache.set(key, IDList(ids=["a"]), expire=Cache.HOT_FEAT)
+
+    assert await cache.get(key, t=IDList) == IDList(ids=["a"])
+
+
+async def test_lifetime_is_the_ttl_without_extensions(cache: Cache):
+    assert cache.lifetime(KEYSPACE, Cache.HOT_FEAT) == Cache.HOT_FEAT
+
+
+async def test_lifetime_covers_everything_that_keeps_values_longer(make_cache: MakeCache):
+    cache = await make_cache({
+        "adaptive": {"enabled": True, "max": 3600},
+        "hotkeys": {"enabled": True, "extend": 2},
+        "stale": {"enabled": True, "grace": 0.5},
+    })
+
+    assert cache.lifetime(KEYSPACE, Cache.HOT_FEAT) == timedelta(hours=1) * 2 * 1.5
+    assert cache.lifetime(KEYSPACE, timedelta(hours=2)) == timedelta(hours=2) * 2 * 1.5
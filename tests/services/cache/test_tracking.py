@@ -0,0 +1,68 @@
+from redis.asyncio import BlockingConnectionPool
+
+from backcat import configs
+from backcat.services.cache import Cache, IDList, register
+from backcat.services.cache.core import TrackingPool, connect
+from tests.helpers import eventually
+from tests.servers import MakeCache, RedisServer
+
+KEYSPACE = register("test-tracking")
+
+TRACKING = {"tracking": True, "local": {"enabled": True, "ttl": 60}}
+
+
+def test_connect_applies_the_pool_options(redis_servers: list[RedisServer]):
+    cfg = configs.Redis(dsn=redis_servers[0].dsn, max_connections=7, pool_timeout=0.5, socket_timeout=2)
+
+    pool = connect(cfg, redis_servers[0].dsn, socket_timeout=None).connection_pool
+
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.timeout == 0.5
+    assert pool.connection_kwargs["socket_timeout"] is None
+    assert pool.connection_kwargs["health_check_interval"] == cfg.health_check_interval
+
+
+async def test_writes_of_other_workers_evict_tracked_keys(make_cache: MakeCache):
+    worker, other = await make_cache(TRACKING), await make_cache(TRACKING)
+    key = KEYSPACE.key("written")
+    await other.set(key, IDList(ids=["old"]), expire=Cache.HOT_FEAT)
+    assert await worker.get(key, t=IDList) == IDList(ids=["old"])
+
+    await other.set(key, IDList(ids=["new"]), expire=Cache.HOT_FEAT)
+
+    assert await eventually(lambda: worker.get(key, t=IDList), IDList(ids=["new"])) == IDList(ids=["new"])
+
+
+async def test_writes_outside_of_the_cache_evict_tracked_keys(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(TRACKING)
+    key = KEYSPACE.key("outside")
+    await cache.set(key, IDList(ids=["old"]), expire=Cache.HOT_FEAT)
+    assert await cache.get(key, t=IDList) == IDList(ids=["old"])
+
+    redis_servers[0].client.delete(key.as_str())
+
+    assert await eventually(lambda: cache.get(key, t=IDList), None) is None
+
+
+async def test_tracking_survives_a_lost_subscriber(make_cache: MakeCache, redis_servers: list[RedisServer]):
+    cache = await make_cache(TRACKING)
+    shard = cache._shards[0]
+    assert isinstance(shard.redis.connection_pool, TrackingPool)
+    key = KEYSPACE.key("reconnected")
+    await cache.set(key, IDList(ids=["old"]), expire=Cache.HOT_FEAT)
+    assert await cache.get(key, t=IDList) == IDList(ids=["old"])
+    lost = shard.tracking_id
+
+    redis_servers[0].client.client_kill_filter(_id=str(lost))
+
+    async def resubscribed() -> bool:
+        return shard.tracking_id != lost and shard.subscribed.is_set()
+
+    assert await eventually(resubscribed, True, timeout=5)
+    # the local tier was cleared on resubscribe, this read is tracked again through the new subscriber
+    assert await cache.get(key, t=IDList) == IDList(ids=["old"])
+
+    redis_servers[0].client.delete(key.as_str())
+
+    assert await eventually(lambda: cache.get(key, t=IDList), None) is None
@@ -0,0 +1,64 @@
+from datetime import UTC, datetime, timedelta
+
+from prometheus_client import REGISTRY
+
+from backcat import configs, database, domain
+from backcat.services import entities
+from backcat.services.audit import Auditor
+from backcat.services.cache import Cache, IDList
+
+POLYGON = [domain.Point(lat=0, lon=0), domain.Point(lat=0, lon=1), domain.Point(lat=1, lon=1)]
+
+RESULTS = ["consistent", "outdated", "deleted", "tombstoned", "undecodable"]
+
+
+def checks() -> dict[str, float]:
+    return {
+        result: REGISTRY.get_sample_value("backcat_cache_audit_checks_total", {"keyspace": "camping", "result": result})
+        or 0
+        for result in RESULTS
+    }
+
+
+async def cached_camping(cache: Cache, user: domain.User) -> domain.Camping:
+    camping = domain.Camping(**domain.Camping.new_defaults_kwargs(), polygon=POLYGON, title="audited", description=None)
+    await database.Camping.insert(database.projection(camping, user_id=user.id)).run()
+    await cache.set(entities.CAMPING.ks.key(camping.id.hex), camping, expire=Cache.HOT_FEAT)
+    return camping
+
+
+async def test_cached_entities_are_compared_with_the_database(cache: Cache, user: domain.User):
+    await cached_camping(cache, user)
+    outdated = await cached_camping(cache, user)
+    deleted = await cached_camping(cache, user)
+    tombstoned = await cached_camping(cache, user)
+    later = datetime.now(UTC) + timedelta(minutes=1)
+    await database.Camping.update({database.Camping.updated_at: later}).where(database.Camping.id == outdated.id).run()
+    await database.Camping.update({database.Camping.deleted_at: later}).where(database.Camping.id == deleted.id).run()
+    await cache.tombstone(entities.CAMPING.ks.key(tombstoned.id.hex))
+    # lists live in the same keyspace and are left out
+    await cache.set(entities.CAMPING.ks.key("query", "x"), IDList(ids=[]), expire=Cache.HOT_FEAT)
+    before = checks()
+
+    await Auditor(cache, configs.Cache()).audit(entities.CAMPING)
+
+    after = checks()
+    assert {result: after[result] - before[result] for result in RESULTS} == {
+        "consistent": 1,
+        "outdated": 1,
+        "deleted": 1,
+        "tombstoned": 1,
+        "undecodable": 0,
+    }
+
+
+async def test_rounds_resume_where_the_previous_one_stopped(cache: Cache, user: domain.User):
+    for _ in range(6):
+        await cached_camping(cache, user)
+    auditor = Auditor(cache, configs.Cache.model_validate({"audit": {"sample": 2}}))
+    before = checks()["consistent"]
+
+    for _ in range(3):
+        await auditor.audit(entities.CAMPING)
+
+    assert checks()["consistent"] - before == 6
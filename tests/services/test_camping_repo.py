@@ -0,0 +1,151 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from backcat import configs, database, domain
+from backcat.services import entities
+from backcat.services.area_repo import AreaRepoImpl
+from backcat.services.booking_repo import BookingRepoImpl
+from backcat.services.cache import Cache, IDList, codec
+from backcat.services.camping_repo import CampingRepoImpl, FilterCamping, UpdateCamping
+from backcat.services.filestorage import FileStorageImpl
+from tests.servers import MakeCache, RedisServer
+
+POLYGON = [domain.Point(lat=0, lon=0), domain.Point(lat=0, lon=1), domain.Point(lat=1, lon=1)]
+
+S3 = configs.S3.model_validate({"endpoint": "s3.example.com", "bucket": "backcat"})
+
+
+@pytest.fixture
+def camping_repo(cache: Cache) -> CampingRepoImpl:
+    return CampingRepoImpl(cache, FileStorageImpl(S3))
+
+
+def new_camping(title: str) -> domain.Camping:
+    return domain.Camping(**domain.Camping.new_defaults_kwargs(), polygon=POLYGON, title=title, description=None)
+
+
+def new_area() -> domain.Area:
+    price = domain.Price(amount=1000, currency="EUR")
+    return domain.Area(**domain.Area.new_defaults_kwargs(), polygon=POLYGON, description=None, price=price)
+
+
+def new_booking() -> domain.Booking:
+    since = datetime.now(UTC) + timedelta(days=1)
+    return domain.Booking(
+        **domain.Booking.new_defaults_kwargs(), booked_since=since, booked_till=since + timedelta(days=2)
+    )
+
+
+async def test_filter_results_are_cached_as_id_lists(camping_repo: CampingRepoImpl, cache: Cache, user: domain.User):
+    first = await camping_repo.create_camping(user.id, new_camping("first"))
+    second = await camping_repo.create_camping(user.id, new_camping("second"))
+    filter = FilterCamping(user_id=user.id)
+
+    found = await camping_repo.filter_camping(user.id, filter)
+
+    assert {camping.id for camping in found} == {first.id, second.id}
+    cached = await cache.get(entities.CAMPING.ks.query(filter), t=IDList)
+    assert cached is not None and cached.ids == [camping.id.hex for camping in found]
+
+
+async def test_cached_results_are_served_without_the_database(camping_repo: CampingRepoImpl, user: domain.User):
+    camping = await camping_repo.create_camping(user.id, new_camping("cached"))
+    filter = FilterCamping(user_id=user.id)
+    assert await camping_repo.filter_camping(user.id, filter) == [camping]
+
+    await database.Camping.delete().where(database.Camping.id == camping.id).run()
+
+    assert await camping_repo.filter_camping(user.id, filter) == [camping]
+
+
+async def test_new_campings_invalidate_cached_results(camping_repo: CampingRepoImpl, user: domain.User):
+    filter = FilterCamping(user_id=user.id)
+    assert await camping_repo.filter_camping(user.id, filter) == []
+
+    camping = await camping_repo.create_camping(user.id, new_camping("new"))
+
+    assert await camping_repo.filter_camping(user.id, filter) == [camping]
+
+
+async def test_bookings_invalidate_booked_campings(camping_repo: CampingRepoImpl, cache: Cache, user: domain.User):
+    area_repo, booking_repo = AreaRepoImpl(cache), BookingRepoImpl(cache)
+    camping = await camping_repo.create_camping(user.id, new_camping("booked"))
+    area = await area_repo.create_area(user.id, new_area(), camping.id)
+    filter = FilterCamping(booked=True)
+    assert await camping_repo.filter_camping(user.id, filter) == []
+
+    await booking_repo.create_booking(user.id, new_booking(), area.id)
+
+    assert await camping_repo.filter_camping(user.id, filter) == [camping]
+
+
+async def test_deleted_areas_invalidate_booked_campings(camping_repo: CampingRepoImpl, cache: Cache, user: domain.User):
+    area_repo, booking_repo = AreaRepoImpl(cache), BookingRepoImpl(cache)
+    camping = await camping_repo.create_camping(user.id, new_camping("booked"))
+    area = await area_repo.create_area(user.id, new_area(), camping.id)
+    await booking_repo.create_booking(user.id, new_booking(), area.id)
+    filter = FilterCamping(booked=True)
+    assert await camping_repo.filter_camping(user.id, filter) == [camping]
+
+    await area_repo.delete_area(user.id, area.id)
+
+    assert await camping_repo.filter_camping(user.id, filter) == []
+
+
+async def test_reads_fill_the_cache(camping_repo: CampingRepoImpl, cache: Cache, user: domain.User):
+    camping = new_camping("read")
+    await database.Camping.insert(database.projection(camping, user_id=user.id)).run()
+
+    assert await camping_repo.read_camping(user.id, camping.id) == camping
+    assert await cache.get(entities.CAMPING.ks.key(camping.id.hex), t=domain.Camping) == camping
+
+
+async def test_deleted_campings_leave_tombstones(camping_repo: CampingRepoImpl, cache: Cache, user: domain.User):
+    camping = await camping_repo.create_camping(user.id, new_camping("deleted"))
+    key = entities.CAMPING.ks.key(camping.id.hex)
+
+    await camping_repo.delete_camping(user.id, camping.id)
+
+    [stored] = await cache.peek_many([key])
+    assert stored is not None and codec.is_tombstone(stored)
+    ttl = await cache.ttl(key)
+    assert ttl is not None and ttl > Cache.HOT_FEAT - timedelta(seconds=1)
+    assert await camping_repo.read_camping(user.id, camping.id) is None
+
+
+async def test_updates_record_the_write_and_store_the_result(
+    make_cache: MakeCache, redis_servers: list[RedisServer], user: domain.User
+):
+    cache = await make_cache({"adaptive": {"enabled": True}})
+    camping_repo = CampingRepoImpl(cache, FileStorageImpl(S3))
+    camping = await camping_repo.create_camping(user.id, new_camping("before"))
+    key = entities.CAMPING.ks.key(camping.id.hex)
+
+    updated = await camping_repo.update_camping(user.id, camping.id, UpdateCamping.model_validate({"title": "after"}))
+
+    assert updated.title == "after"
+    assert await cache.get(key, t=domain.Camping) == updated
+    assert redis_servers[0].client.exists(f"writes:{key.as_str()}")
+
+
+async def test_created_entities_are_cached_after_the_commit(
+    camping_repo: CampingRepoImpl, cache: Cache, user: domain.User, monkeypatch: pytest.MonkeyPatch
+):
+    in_transaction: list[bool] = []
+    store = cache.set
+
+    async def set_outside_of_transactions(*args: Any, **kwargs: Any):
+        in_transaction.append(database.Camping._meta.db.transaction_exists())
+        await store(*args, **kwargs)
+
+    monkeypatch.setattr(cache, "set", set_outside_of_transactions)
+
+    camping = await camping_repo.create_camping(user.id, new_camping("committed"))
+    area = await AreaRepoImpl(cache).create_area(user.id, new_area(), camping.id)
+    booking = await BookingRepoImpl(cache).create_booking(user.id, new_booking(), area.id)
+
+    assert in_transaction == [False, False, False]
+    assert await cache.get(entities.CAMPING.ks.key(camping.id.hex), t=domain.Camping) == camping
+    assert await cache.get(entities.BOOKING.ks.key(booking.id.hex), t=domain.Booking) == booking
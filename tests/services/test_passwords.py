@@ -0,0 +1,69 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import pytest
+from argon2.exceptions import VerificationError
+
+from backcat import configs
+from backcat.services import errors
+from backcat.services.passwords import Passwords
+from tests.helpers import FAST_ARGON2
+
+type MakePasswords = Callable[..., Passwords]
+
+
+@pytest.fixture
+async def make_passwords() -> AsyncIterator[MakePasswords]:
+    """Build Passwords with FAST_ARGON2 and the given settings, `cfg` is validated into configs.Passwords"""
+    built: list[Passwords] = []
+
+    def make(**cfg: Any) -> Passwords:
+        passwords = Passwords(configs.Passwords.model_validate({"argon2": FAST_ARGON2, **cfg}))
+        built.append(passwords)
+        return passwords
+
+    yield make
+    for passwords in built:
+        await passwords.close()
+
+
+# the process pool forks the test process, which already runs the threads of other tests' pools
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+@pytest.mark.parametrize("executor", ["thread", "process", "inline"])
+async def test_hashes_verify(make_passwords: MakePasswords, executor: str):
+    passwords = make_passwords(executor=executor)
+
+    password_hash = await passwords.hash("correct horse")
+
+    assert password_hash != "correct horse"
+    assert await passwords.verify(password_hash, "correct horse") is True
+
+
+@pytest.mark.parametrize("executor", ["thread", "inline"])
+async def test_wrong_passwords_raise(make_passwords: MakePasswords, executor: str):
+    passwords = make_passwords(executor=executor)
+    password_hash = await passwords.hash("correct horse")
+
+    with pytest.raises(VerificationError):
+        await passwords.verify(password_hash, "battery staple")
+
+
+async def test_hashes_beyond_the_pending_limit_are_rejected(make_passwords: MakePasswords):
+    passwords = make_passwords(workers=1, max_pending=0)
+    running = asyncio.create_task(passwords.hash("first"))
+    await asyncio.sleep(0)  # the first hash takes the only slot
+
+    with pytest.raises(errors.UnavailableError):
+        await passwords.hash("second")
+
+    await running
+    assert await passwords.hash("third") != ""
+
+
+async def test_pending_hashes_wait_for_a_free_slot(make_passwords: MakePasswords):
+    passwords = make_passwords(workers=1, max_pending=4)
+
+    hashes = await asyncio.gather(*(passwords.hash(str(i)) for i in range(5)))
+
+    assert [await passwords.verify(password_hash, str(i)) for i, password_hash in enumerate(hashes)] == [True] * 5
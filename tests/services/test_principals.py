@@ -0,0 +1,146 @@
+from backcat import configs, database, domain
+from backcat.services import entities
+from backcat.services.cache import Cache
+from backcat.services.passwords import Passwords
+from backcat.services.principals import Principal, Principals
+from backcat.services.token import TokenRepoImpl
+from backcat.services.user_repo import UpdateUser, UserRepoImpl
+from tests.helpers import eventually
+from tests.servers import MakeCache
+
+CACHE = configs.Cache.model_validate({"principals": {"enabled": True, "ttl": 60}})
+JWT = configs.JWT(secret="test" * 8)
+
+
+async def make_principals(cache: Cache, passwords: Passwords, cache_cfg: configs.Cache = CACHE) -> Principals:
+    """Principals of one worker over `cache`, started as the server does"""
+    token_repo = TokenRepoImpl(cache, cache_cfg, JWT)
+    principals = Principals(cache, UserRepoImpl(cache, passwords, token_repo), token_repo, cache_cfg, JWT)
+    await principals.start()
+    return principals
+
+
+async def rename_behind_the_cache(user: domain.User, name: str):
+    await database.User.update({database.User.name: name}).where(database.User.id == user.id).run()
+
+
+async def test_users_are_kept_in_the_worker(cache: Cache, passwords: Passwords, user: domain.User):
+    principals = await make_principals(cache, passwords)
+    assert await principals.get(user.id) == user
+
+    # nothing reached the cache, the kept user keeps answering until its ttl
+    await rename_behind_the_cache(user, "renamed")
+
+    kept = await principals.get(user.id)
+    assert kept is not None and kept.name == "camper"
+
+
+async def test_kept_users_are_copies(cache: Cache, passwords: Passwords, user: domain.User):
+    principals = await make_principals(cache, passwords)
+    first = await principals.get(user.id)
+    assert first is not None
+
+    first.name = "changed by a handler"
+
+    second = await principals.get(user.id)
+    assert second is not None and second.name == "camper"
+
+
+async def test_updates_of_other_workers_evict_kept_users(
+    make_cache: MakeCache, passwords: Passwords, user: domain.User
+):
+    worker, other = await make_cache(), await make_cache()
+    principals = await make_principals(worker, passwords)
+    await make_principals(other, passwords)
+    user_repo = UserRepoImpl(other, passwords, TokenRepoImpl(other, CACHE, JWT))
+    assert await principals.get(user.id) == user
+
+    await user_repo.update_user(user.id, UpdateUser.model_validate({"name": "renamed"}))
+
+    async def name() -> str | None:
+        kept = await principals.get(user.id)
+        return kept.name if kept is not None else None
+
+    assert await eventually(name, "renamed") == "renamed"
+
+
+async def test_deletes_of_other_workers_evict_kept_users(
+    make_cache: MakeCache, passwords: Passwords, user: domain.User
+):
+    worker, other = await make_cache(), await make_cache()
+    principals = await make_principals(worker, passwords)
+    await make_principals(other, passwords)
+    user_repo = UserRepoImpl(other, passwords, TokenRepoImpl(other, CACHE, JWT))
+    assert await principals.get(user.id) == user
+
+    await user_repo.delete_user(user.id)
+
+    assert await eventually(lambda: principals.get(user.id), None) is None
+
+
+async def test_without_principals_users_are_read_from_the_repo(cache: Cache, passwords: Passwords, user: domain.User):
+    principals = await make_principals(cache, passwords, configs.Cache())
+    assert await principals.get(user.id) == user
+
+    await cache.invalidate(entities.USER.ks.key(user.id.hex))
+    await rename_behind_the_cache(user, "renamed")
+
+    read = await principals.get(user.id)
+    assert read is not None and read.name == "renamed"
+
+
+FAT = configs.JWT(secret="test" * 8, fat_tokens=True)
+
+
+async def make_fat_principals(cache: Cache, passwords: Passwords) -> tuple[Principals, TokenRepoImpl]:
+    """Principals of one worker issuing fat tokens, with its token repo following the stream"""
+    token_repo = TokenRepoImpl(cache, CACHE, FAT)
+    await token_repo.start()
+    principals = Principals(cache, UserRepoImpl(cache, passwords, token_repo), token_repo, CACHE, FAT)
+    await principals.start()
+    return principals, token_repo
+
+
+async def test_fat_claims_authenticate_without_a_lookup(cache: Cache, passwords: Passwords, user: domain.User):
+    principals, token_repo = await make_fat_principals(cache, passwords)
+    try:
+        claims = await principals.claims(user)
+        assert claims is not None
+        assert claims == {"name": "camper", "email": "camper@example.com", "ver": 0}
+
+        # the user is gone from the database, the claims alone answer
+        await database.User.delete().where(database.User.id == user.id).run()
+
+        assert await principals.authenticate(user.id, claims) == Principal(
+            id=user.id, name="camper", email="camper@example.com", version=0
+        )
+    finally:
+        await token_repo.close()
+
+
+async def test_revoke_all_rejects_fat_claims_on_other_workers(
+    make_cache: MakeCache, passwords: Passwords, user: domain.User
+):
+    principals, token_repo = await make_fat_principals(await make_cache(), passwords)
+    other = TokenRepoImpl(await make_cache(), CACHE, FAT)
+    try:
+        claims = await principals.claims(user)
+        assert claims is not None
+        assert await principals.authenticate(user.id, claims) is not None
+
+        await other.revoke_all(user.id.hex)
+
+        assert await eventually(lambda: principals.authenticate(user.id, claims), None) is None
+        # tokens issued after the bump carry the new version
+        renewed = await principals.claims(user)
+        assert renewed is not None and renewed["ver"] == 1
+        assert await principals.authenticate(user.id, renewed) is not None
+    finally:
+        await token_repo.close()
+
+
+async def test_thin_claims_are_resolved_to_users(cache: Cache, passwords: Passwords, user: domain.User):
+    principals = await make_principals(cache, passwords)
+
+    assert await principals.claims(user) is None
+    assert await principals.authenticate(user.id, {}) == user
@@ -0,0 +1,131 @@
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+
+from backcat import configs
+from backcat.services.cache import Cache
+from backcat.services.token import TokenRepoImpl
+from tests.helpers import eventually
+from tests.servers import MakeCache
+
+type MakeTokenRepo = Callable[..., Awaitable[TokenRepoImpl]]
+
+REVOCATIONS = configs.Cache.model_validate({"revocations": {"enabled": True}})
+JWT = configs.JWT(secret="test" * 8)
+
+
+@pytest.fixture
+async def make_token_repo(make_cache: MakeCache) -> AsyncIterator[MakeTokenRepo]:
+    """Token repos of separate workers sharing one redis, started unless `start` is false"""
+    repos: list[TokenRepoImpl] = []
+
+    async def make(
+        cache_cfg: configs.Cache = REVOCATIONS, jwt_cfg: configs.JWT = JWT, *, start: bool = True
+    ) -> TokenRepoImpl:
+        repo = TokenRepoImpl(await make_cache(), cache_cfg, jwt_cfg)
+        if start:
+            await repo.start()
+        repos.append(repo)
+        return repo
+
+    yield make
+    for repo in repos:
+        await repo.close()
+
+
+def checks(source: str) -> float:
+    return REGISTRY.get_sample_value("backcat_cache_revocations_total", {"source": source}) or 0.0
+
+
+def in_an_hour() -> datetime:
+    return datetime.now(UTC) + timedelta(hours=1)
+
+
+async def test_bans_reach_other_workers(make_token_repo: MakeTokenRepo):
+    worker, other = await make_token_repo(), await make_token_repo()
+
+    await other.ban("token", in_an_hour())
+
+    assert await eventually(lambda: worker.is_banned("token"), True) is True
+
+
+async def test_unbans_reach_other_workers(make_token_repo: MakeTokenRepo):
+    worker, other = await make_token_repo(), await make_token_repo()
+    await other.ban("token", in_an_hour())
+    assert await eventually(lambda: worker.is_banned("token"), True) is True
+
+    await other.unban("token")
+
+    assert await eventually(lambda: worker.is_banned("token"), False) is False
+
+
+async def test_late_workers_catch_up_with_the_stream(make_token_repo: MakeTokenRepo):
+    other = await make_token_repo()
+    await other.ban("banned", in_an_hour())
+    await other.ban("unbanned", in_an_hour())
+    await other.unban("unbanned")
+
+    worker = await make_token_repo()
+    local = checks("local")
+
+    assert await worker.is_banned("banned") is True
+    assert await worker.is_banned("unbanned") is False
+    assert checks("local") == local + 2
+
+
+async def test_tokens_are_checked_in_redis_until_the_stream_is_read(make_token_repo: MakeTokenRepo):
+    other = await make_token_repo()
+    await other.ban("token", in_an_hour())
+
+    worker = await make_token_repo(start=False)
+    in_redis = checks("redis")
+
+    assert await worker.is_banned("token") is True
+    assert await worker.is_banned("other") is False
+    assert checks("redis") == in_redis + 2
+
+
+async def test_without_revocations_tokens_are_checked_in_redis(make_token_repo: MakeTokenRepo):
+    worker = await make_token_repo(configs.Cache())
+    in_redis = checks("redis")
+
+    await worker.ban("token", in_an_hour())
+
+    assert await worker.is_banned("token") is True
+    assert checks("redis") == in_redis + 1
+
+
+async def test_expired_tokens_are_not_banned(make_token_repo: MakeTokenRepo, cache: Cache):
+    worker = await make_token_repo()
+
+    await worker.ban("token", datetime.now(UTC) - timedelta(seconds=1))
+
+    assert await worker.is_banned("token") is False
+    assert await cache.read(REVOCATIONS.revocations.stream, "0") == []
+
+
+async def test_fat_tokens_follow_the_stream_without_revocations(make_token_repo: MakeTokenRepo):
+    fat = configs.JWT(secret="test" * 8, fat_tokens=True)
+    worker, other = await make_token_repo(configs.Cache(), fat), await make_token_repo(configs.Cache(), fat)
+
+    await other.ban("token", in_an_hour())
+
+    assert await eventually(lambda: worker.is_banned("token"), True) is True
+    local = checks("local")
+    assert await worker.is_banned("token") is True
+    assert checks("local") == local + 1
+
+
+async def test_revoke_all_outdates_the_versions_of_other_workers(make_token_repo: MakeTokenRepo):
+    fat = configs.JWT(secret="test" * 8, fat_tokens=True)
+    worker, other = await make_token_repo(configs.Cache(), fat), await make_token_repo(configs.Cache(), fat)
+    issued = await worker.version("user")
+    assert await worker.is_outdated("user", issued) is False
+
+    assert await other.revoke_all("user") == issued + 1
+
+    assert await eventually(lambda: worker.is_outdated("user", issued), True) is True
+    assert await worker.is_outdated("user", issued + 1) is False
+    assert await worker.is_outdated("other", issued) is False
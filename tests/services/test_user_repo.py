@@ -0,0 +1,100 @@
+from uuid import uuid4
+
+import pytest
+
+from backcat import configs, database, domain
+from backcat.services import entities, errors
+from backcat.services.cache import Cache
+from backcat.services.passwords import Passwords
+from backcat.services.token import TokenRepoImpl
+from backcat.services.user_repo import UserRepoImpl
+from tests.helpers import FAST_ARGON2, eventually
+
+
+async def test_reads_fill_the_cache(user_repo: UserRepoImpl, cache: Cache, user: domain.User):
+    assert await user_repo.read_user(user.id) == user
+
+    assert await cache.get(entities.USER.ks.key(user.id.hex), t=domain.User) == user
+
+
+async def test_missing_users_are_remembered(user_repo: UserRepoImpl, cache: Cache, db: None):
+    user_id = uuid4()
+    assert await user_repo.read_user(user_id) is None
+
+    # the row appears behind the cache's back, the tombstone keeps answering until it expires
+    user = domain.User(**domain.User.new_defaults_kwargs(), email="late@example.com", name="late", password="x" * 8)
+    user.id = user_id
+    await database.User.insert(database.projection(user)).run()
+
+    assert await user_repo.read_user(user_id) is None
+    assert await cache.ttl(entities.USER.ks.key(user_id.hex)) is not None
+
+
+STRONGER_ARGON2 = {**FAST_ARGON2, "time_cost": 2}
+
+
+async def stored_hash(user_id: domain.UserID) -> str:
+    rows = await database.User.select(database.User.password).where(database.User.id == user_id).run()
+    return rows[0]["password"]
+
+
+@pytest.mark.parametrize(
+    ("argon2", "rehash", "needed"),
+    [(FAST_ARGON2, True, False), (STRONGER_ARGON2, True, True), (STRONGER_ARGON2, False, False)],
+)
+async def test_hashes_of_other_parameters_need_a_rehash(
+    passwords: Passwords, argon2: dict[str, int], rehash: bool, needed: bool
+):
+    current = Passwords(configs.Passwords.model_validate({"argon2": argon2, "rehash": rehash}))
+    try:
+        assert current.needs_rehash(await passwords.hash("correct horse")) is needed
+    finally:
+        await current.close()
+
+
+async def test_sign_ins_upgrade_outdated_hashes(user_repo: UserRepoImpl, cache: Cache, passwords: Passwords, db: None):
+    user = domain.User(
+        **domain.User.new_defaults_kwargs(), email="old@example.com", name="old", password="correct horse"
+    )
+    user = await user_repo.create_user(user)
+    outdated = await stored_hash(user.id)
+
+    stronger = Passwords(configs.Passwords.model_validate({"argon2": STRONGER_ARGON2}))
+    try:
+        upgrading = UserRepoImpl(cache, stronger, TokenRepoImpl(cache, configs.Cache(), configs.JWT(secret="test" * 8)))
+        signed_in = await upgrading.retrieve_verify_user("old@example.com", "correct horse")
+        assert signed_in.id == user.id
+
+        async def needs_rehash() -> bool:
+            return stronger.needs_rehash(await stored_hash(user.id))
+
+        assert await eventually(needs_rehash, False) is False
+        assert await stored_hash(user.id) != outdated
+        assert await stronger.verify(await stored_hash(user.id), "correct horse") is True
+        assert await cache.get(entities.USER.ks.key(user.id.hex)) is None
+
+        # the upgraded hash is left as is by later sign-ins
+        upgraded = await stored_hash(user.id)
+        await upgrading.retrieve_verify_user("old@example.com", "correct horse")
+        assert await stored_hash(user.id) == upgraded
+    finally:
+        await stronger.close()
+
+
+async def test_wrong_passwords_do_not_upgrade_hashes(user_repo: UserRepoImpl, cache: Cache, db: None):
+    user = domain.User(
+        **domain.User.new_defaults_kwargs(), email="old@example.com", name="old", password="correct horse"
+    )
+    user = await user_repo.create_user(user)
+    outdated = await stored_hash(user.id)
+
+    stronger = Passwords(configs.Passwords.model_validate({"argon2": STRONGER_ARGON2}))
+    try:
+        upgrading = UserRepoImpl(cache, stronger, TokenRepoImpl(cache, configs.Cache(), configs.JWT(secret="test" * 8)))
+        with pytest.raises(errors.AcccessDeniedError):
+            await upgrading.retrieve_verify_user("old@example.com", "battery staple")
+
+        # verification fails before any upgrade is scheduled
+        assert await stored_hash(user.id) == outdated
+    finally:
+        await stronger.close()
@@ -0,0 +1,72 @@
+from datetime import UTC, datetime, timedelta
+
+from backcat import configs, database, domain
+from backcat.services import entities
+from backcat.services.cache import Cache, IDList
+from backcat.services.warmup import KEYSPACE, WarmUp
+from tests.servers import MakeCache
+
+POLYGON = [domain.Point(lat=0, lon=0), domain.Point(lat=0, lon=1), domain.Point(lat=1, lon=1)]
+
+
+async def insert_campings(user: domain.User, count: int) -> list[domain.Camping]:
+    """Campings straight in the database, the newest one last"""
+    campings: list[domain.Camping] = []
+    for i in range(count):
+        camping = domain.Camping(
+            **domain.Camping.new_defaults_kwargs(), polygon=POLYGON, title=str(i), description=None
+        )
+        camping.updated_at = datetime.now(UTC) + timedelta(seconds=i)
+        await database.Camping.insert(database.projection(camping, user_id=user.id)).run()
+        campings.append(camping)
+
+    return campings
+
+
+def warmup_cfg(**warmup: object) -> configs.Cache:
+    return configs.Cache.model_validate({"warmup": {"enabled": True, **warmup}})
+
+
+async def cached(cache: Cache, campings: list[domain.Camping]) -> list[domain.Camping | None]:
+    return await cache.get_many([entities.CAMPING.ks.key(camping.id.hex) for camping in campings], t=domain.Camping)
+
+
+async def test_disabled_warm_up_loads_nothing(cache: Cache, user: domain.User):
+    campings = await insert_campings(user, 2)
+
+    await WarmUp(cache, configs.Cache()).run()
+
+    assert await cached(cache, campings) == [None, None]
+
+
+async def test_recently_updated_entities_are_loaded(cache: Cache, user: domain.User):
+    campings = await insert_campings(user, 3)
+
+    await WarmUp(cache, warmup_cfg(limit=2)).run()
+
+    assert await cached(cache, campings) == [None, *campings[1:]]
+    recent = await cache.get(KEYSPACE.key(entities.CAMPING.ks.name), t=IDList)
+    assert recent == IDList(ids=[campings[2].id.hex, campings[1].id.hex])
+    assert await cache.get(KEYSPACE.key(WarmUp.WARMED), t=IDList) is not None
+
+
+async def test_workers_of_the_same_deploy_do_not_warm_up_again(make_cache: MakeCache, user: domain.User):
+    first, second = await make_cache(), await make_cache()
+    await insert_campings(user, 1)
+    await WarmUp(first, warmup_cfg()).run()
+    late = await insert_campings(user, 1)
+
+    await WarmUp(second, warmup_cfg()).run()
+
+    assert await cached(second, late) == [None]
+
+
+async def test_workers_with_a_local_tier_fill_it_from_redis(make_cache: MakeCache, user: domain.User):
+    first = await make_cache()
+    campings = await insert_campings(user, 2)
+    await WarmUp(first, warmup_cfg()).run()
+    second = await make_cache({"local": {"enabled": True}})
+
+    await WarmUp(second, warmup_cfg()).run()
+
+    assert second.local_stats()[entities.CAMPING.ks.name].entries == len(campings)
@@ -0,0 +1,136 @@
+"""Measure the per-request overhead of the oauth2 middleware with and without the per-worker principal cache,
+revoked token set and fat tokens.
+
+Requests go through the ASGI stack in-process, to a protected and to an excluded route, the difference between
+the two is what authentication costs. The user is seeded into the cache, so a lookup is a redis round trip and
+no database is needed. Tokens carry a jti, so they are checked for revocation too. Importing backcat loads the
+server config, so run it with the same config.toml / BACKCAT_* env as the server:
+
+    redis-server --port 6379 --save '' &
+    uv run python tools/bench_auth.py redis://localhost:6379/0
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from typing import Any
+from uuid import uuid4
+
+import httpx
+import litestar
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.litestar import LitestarProvider, setup_dishka
+from litestar import Litestar
+from litestar.security.jwt import OAuth2PasswordBearerAuth
+from pydantic import RedisDsn
+
+from backcat import configs, domain, services
+from backcat.cmd.server import authorization
+
+REQUESTS = 5_000
+SECRET = "bench" * 8
+
+MODES = {
+    "lookup": ({"principals": {"enabled": False}}, {}),
+    "principals": ({"principals": {"enabled": True}}, {}),
+    "revocations": ({"principals": {"enabled": True}, "revocations": {"enabled": True}}, {}),
+    "fat": ({"principals": {"enabled": True}, "revocations": {"enabled": True}}, {"fat_tokens": True}),
+}
+
+
+@litestar.get("/private")
+async def private(request: litestar.Request[domain.User | services.Principal, Any, Any]) -> str:
+    return request.user.name
+
+
+@litestar.get("/public")
+async def public() -> str:
+    return "ok"
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict[str, str]) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+
+    return latencies
+
+
+async def run(dsn: str, mode: str) -> tuple[float, float]:
+    cache_overrides, jwt_overrides = MODES[mode]
+    cache_cfg = configs.Cache.model_validate(cache_overrides)
+    jwt_cfg = configs.JWT.model_validate({"secret": SECRET, **jwt_overrides})
+    cache = services.Cache(configs.Redis(dsn=RedisDsn(dsn)), cache_cfg)
+    await cache.start()
+
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: cache, provides=services.Cache)
+    provider.provide(lambda: cache_cfg, provides=configs.Cache)
+    provider.provide(lambda: jwt_cfg, provides=configs.JWT)
+    provider.provide(lambda: configs.Passwords(), provides=configs.Passwords)
+    provider.provide(services.Passwords, provides=services.Passwords)
+    provider.provide(services.UserRepoImpl, provides=services.UserRepo)
+    provider.provide(services.TokenRepoImpl, provides=services.TokenRepo)
+    provider.provide(services.Principals, provides=services.Principals)
+    container = make_async_container(provider, LitestarProvider())
+
+    oauth2 = OAuth2PasswordBearerAuth[domain.User](
+        retrieve_user_handler=authorization.retrieve_user_factory(container),
+        revoked_token_handler=authorization.revoked_token_factory(container),
+        token_secret=SECRET,
+        token_url="/token",
+        exclude=["/public"],
+        accepted_audiences=["backcat"],
+        accepted_issuers=["backcat"],
+        strict_audience=True,
+    )
+    app = Litestar(route_handlers=[private, public], on_app_init=[oauth2.on_app_init])
+    setup_dishka(container, app)
+
+    user = domain.User(**domain.User.new_defaults_kwargs(), email="bench@example.com", name="bench", password="x" * 8)
+    await cache.set(services.entities.USER.ks.key(user.id.hex), user, expire=cache.COLD_FEAT)
+    principals = await container.get(services.Principals)
+    await principals.start()
+    token_repo = await container.get(services.TokenRepo)
+    await token_repo.start()
+
+    token = oauth2.create_token(
+        identifier=user.id.hex,
+        token_issuer="backcat",
+        token_audience="backcat",
+        token_unique_jwt_id=uuid4().hex,
+        token_extras=await principals.claims(user),
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # httpx types the asgi messages as plain dicts, litestar as typed dicts, the app speaks the same protocol
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await measure(client, "/private", headers)  # warm up
+        private_us = statistics.median(await measure(client, "/private", headers)) * 1e6
+        public_us = statistics.median(await measure(client, "/public", {})) * 1e6
+
+    await token_repo.close()
+    await container.close()
+    await cache.close()
+    return private_us, public_us
+
+
+async def main():
+    dsn = sys.argv[1] if len(sys.argv) > 1 else "redis://localhost:6379/0"
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{REQUESTS} sequential requests per route, medians")
+    print(f"{'mode':>12} {'protected, us':>14} {'excluded, us':>14} {'auth, us':>10}")
+    for mode in MODES:
+        private_us, public_us = await run(dsn, mode)
+        print(f"{mode:>12} {private_us:>14.1f} {public_us:>14.1f} {private_us - public_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
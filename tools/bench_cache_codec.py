@@ -0,0 +1,45 @@
+"""Compare cache codecs on domain.Camping values of different polygon sizes.
+
+Importing backcat loads the server config, so run it with the same config.toml / BACKCAT_* env as the server:
+
+    uv run python tools/bench_cache_codec.py
+"""
+
+import timeit
+
+from backcat import domain
+from backcat.services.cache import codec
+
+POLYGON_SIZES = [10, 1_000, 10_000]
+
+
+def make_camping(points: int) -> domain.Camping:
+    return domain.Camping(
+        **domain.Camping.new_defaults_kwargs(),
+        polygon=[domain.Point(lat=55.7558 + i * 1e-4, lon=37.6173 + i * 2e-4) for i in range(points)],
+        title="camping",
+        description="description " * 100,
+        thumbnails=["https://example.com/thumbnail.png"],
+    )
+
+
+def measure(fn, points: int) -> float:
+    number = max(10, 20_000 // points)
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print(f"{'points':>8} {'codec':>8} {'encode, us':>12} {'decode, us':>12} {'size, bytes':>12}")
+    for points in POLYGON_SIZES:
+        camping = make_camping(points)
+        for c in codec.CODECS.values():
+            data = codec.encode(camping, c)
+            assert codec.decode(data, domain.Camping) == camping
+
+            encode_us = measure(lambda c=c, camping=camping: codec.encode(camping, c), points)
+            decode_us = measure(lambda data=data: codec.decode(data, domain.Camping), points)
+            print(f"{points:>8} {c.name:>8} {encode_us:>12.1f} {decode_us:>12.1f} {len(data):>12}")
+
+
+if __name__ == "__main__":
+    main()
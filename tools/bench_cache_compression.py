@@ -0,0 +1,112 @@
+"""Report how much redis memory cache compression saves on a seeded dataset of campings and areas.
+
+Polygon sizes and description lengths follow the domain limits (up to thousands of points, up to 5000 chars).
+A dictionary is trained on a separate seeded sample, the way tools/train_cache_dictionary.py trains one on
+live values. Importing backcat loads the server config, so run it with the same config.toml / BACKCAT_* env
+as the server:
+
+    uv run python tools/bench_cache_compression.py
+"""
+
+import random
+import tempfile
+import timeit
+from collections.abc import ByteString
+from pathlib import Path
+
+import pydantic
+import zstandard
+
+from backcat import configs, domain
+from backcat.services.cache import codec, compression
+
+SEED = 42
+ENTITIES = 1_000
+TRAINING = 1_000
+THRESHOLD = 1024
+LEVEL = 3
+
+WORDS = "camping lake forest river tent fire pit shower parking view quiet family dogs allowed near trail".split()
+
+
+def make_polygon(rnd: random.Random) -> list[domain.Point]:
+    points = rnd.choice([rnd.randint(3, 20), rnd.randint(20, 500), rnd.randint(500, 3_000)])
+    lat, lon = rnd.uniform(41, 70), rnd.uniform(27, 180)
+    return [domain.Point(lat=lat + rnd.uniform(-0.01, 0.01), lon=lon + rnd.uniform(-0.01, 0.01)) for _ in range(points)]
+
+
+def make_description(rnd: random.Random) -> str | None:
+    if rnd.random() < 0.2:
+        return None
+
+    words = [rnd.choice(WORDS) for _ in range(rnd.randint(5, 700))]
+    return " ".join(words)[:5000]
+
+
+def make_camping(rnd: random.Random) -> domain.Camping:
+    return domain.Camping(
+        **domain.Camping.new_defaults_kwargs(),
+        polygon=make_polygon(rnd),
+        title=" ".join(rnd.choice(WORDS) for _ in range(3)),
+        description=make_description(rnd),
+        thumbnails=[f"https://storage.example.com/thumbnails/{rnd.getrandbits(128):032x}.png"],
+    )
+
+
+def make_area(rnd: random.Random) -> domain.Area:
+    return domain.Area(
+        **domain.Area.new_defaults_kwargs(),
+        polygon=make_polygon(rnd),
+        description=make_description(rnd),
+        price=domain.Price(amount=rnd.randint(100, 100_000), currency="RUB"),
+    )
+
+
+def make_dataset(seed: int, n: int) -> list[pydantic.BaseModel]:
+    rnd = random.Random(seed)
+    return [make_camping(rnd) if i % 2 == 0 else make_area(rnd) for i in range(n)]
+
+
+def main():
+    dataset = make_dataset(SEED, ENTITIES)
+    msgpack = codec.codec_by_name("msgpack")
+
+    samples: list[ByteString] = [msgpack.encode(value) for value in make_dataset(SEED + 1, TRAINING)]
+    with tempfile.TemporaryDirectory() as tmp:
+        dictionary_path = Path(tmp) / "cache.zdict"
+        dictionary_path.write_bytes(zstandard.train_dictionary(112_640, samples, level=LEVEL).as_bytes())
+
+        compressors = {
+            "none": None,
+            "zstd": compression.Compressor(configs.cache.Compression(enabled=True, threshold=THRESHOLD, level=LEVEL)),
+            "zstd+dict": compression.Compressor(
+                configs.cache.Compression(enabled=True, threshold=THRESHOLD, level=LEVEL, dictionary=dictionary_path)
+            ),
+        }
+
+        print(f"{ENTITIES} values (seed {SEED}), threshold {THRESHOLD} bytes, zstd level {LEVEL}")
+        print(f"{'mode':>10} {'total, bytes':>14} {'saved':>8} {'encode, us':>12} {'decode, us':>12}")
+        baseline = None
+        for name, compressor in compressors.items():
+            encoded = [codec.encode(value, msgpack, compressor=compressor) for value in dataset]
+            for value, data in zip(dataset, encoded, strict=True):
+                assert codec.decode(data, type(value)) == value
+
+            total = sum(len(data) for data in encoded)
+            baseline = baseline or total
+            encode_us = min(
+                timeit.repeat(lambda c=compressor: [codec.encode(v, msgpack, compressor=c) for v in dataset], number=1)
+            )
+            decode_us = min(
+                timeit.repeat(
+                    lambda e=encoded: [codec.decode(d, type(v)) for v, d in zip(dataset, e, strict=True)], number=1
+                )
+            )
+            print(
+                f"{name:>10} {total:>14} {1 - total / baseline:>8.1%}"
+                f" {encode_us / ENTITIES * 1e6:>12.1f} {decode_us / ENTITIES * 1e6:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Measure services.Cache read latency against a local redis-server from several worker processes.
+
+Every worker reads a small set of hot keys in a loop, the way concurrent requests read popular campings. Modes:
+
+- redis: no in-process tier, every read is a network hop
+- pubsub: in-process tier invalidated through the cache channel
+- tracking: in-process tier invalidated by redis itself (CLIENT TRACKING)
+
+A writer in the first worker rewrites one hot key every few milliseconds, so invalidations are part of the picture.
+Several DSNs shard the cache over the given nodes, the same way several `redis.dsn` do in the server config.
+Importing backcat loads the server config, so run it with the same config.toml / BACKCAT_* env as the server:
+
+    redis-server --port 6379 --save '' &
+    uv run python tools/bench_cache_redis.py redis://localhost:6379/0
+
+    redis-server --port 6380 --save '' &
+    redis-server --port 6381 --save '' &
+    uv run python tools/bench_cache_redis.py redis://localhost:6379/0 redis://localhost:6380/0 redis://localhost:6381/0
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import time
+
+from backcat import configs
+from backcat.services.cache import Cache, register
+
+WORKERS = 4
+CONCURRENCY = 16
+DURATION = 5.0
+HOT_KEYS = 64
+WRITE_INTERVAL = 0.005
+
+KEYSPACE = register("bench")
+
+MODES = {
+    "redis": {"local": {"enabled": False}},
+    "pubsub": {"local": {"enabled": True, "ttl": 60}},
+    "tracking": {"local": {"enabled": True, "ttl": 60}, "tracking": True},
+}
+
+
+async def run_worker(dsns: list[str], mode: str, worker: int) -> list[float]:
+    redis_cfg = configs.Redis.model_validate({"dsn": dsns})
+    cache = Cache(redis_cfg, configs.Cache.model_validate(MODES[mode]))
+    await cache.start()
+    await asyncio.sleep(0.5)  # let the listener subscribe
+
+    keys = [KEYSPACE.key(str(i)) for i in range(HOT_KEYS)]
+    if worker == 0:
+        await cache.set_many([(key, {"value": i}, Cache.HOT_FEAT) for i, key in enumerate(keys)])
+    await asyncio.sleep(0.5)
+
+    latencies: list[float] = []
+    deadline = time.monotonic() + DURATION
+
+    async def read(offset: int):
+        i = offset
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            await cache.get(keys[i % HOT_KEYS])
+            latencies.append(time.perf_counter() - started)
+            i += 1
+
+    async def write():
+        i = 0
+        while time.monotonic() < deadline:
+            await cache.set(keys[i % HOT_KEYS], {"value": i}, expire=Cache.HOT_FEAT)
+            await asyncio.sleep(WRITE_INTERVAL)
+            i += 1
+
+    tasks = [read(offset) for offset in range(CONCURRENCY)]
+    if worker == 0:
+        tasks.append(write())
+    await asyncio.gather(*tasks)
+
+    await cache.close()
+    return latencies
+
+
+def worker_main(dsns: list[str], mode: str, worker: int) -> list[float]:
+    return asyncio.run(run_worker(dsns, mode, worker))
+
+
+def percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    dsns = sys.argv[1:] or ["redis://localhost:6379/0"]
+
+    print(f"{'mode':>10} {'reads/s':>10} {'p50, us':>10} {'p99, us':>10}")
+    with multiprocessing.get_context("spawn").Pool(WORKERS) as pool:
+        for mode in MODES:
+            results = pool.starmap(worker_main, [(dsns, mode, worker) for worker in range(WORKERS)])
+            latencies = sorted(latency for result in results for latency in result)
+
+            p50 = percentile(latencies, 0.5) * 1e6
+            p99 = percentile(latencies, 0.99) * 1e6
+            print(f"{mode:>10} {len(latencies) / DURATION:>10.0f} {p50:>10.1f} {p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure /camping read latency of a running server before and during a storm of sign-ins.
+
+Readers list campings in a loop for a while, then keep reading while other clients sign in as fast as they can.
+Each sign-in verifies an argon2 hash, so with `passwords.executor = "inline"` the storm stalls the event loop and
+the p99 of the reads jumps, with the thread or process pool it should stay where it was. Run the server with a
+single worker, so every request lands on the same event loop, once per executor and compare. With CSRF protection
+on (the default), the token cookie is fetched first and sent back in the `x-csrftoken` header:
+
+    BACKCAT_PASSWORDS__EXECUTOR=inline uv run granian --interface asgi --workers 1 backcat.cmd.server.app:app &
+    uv run python tools/load_signin_storm.py http://localhost:8000
+
+    BACKCAT_PASSWORDS__EXECUTOR=thread uv run granian --interface asgi --workers 1 backcat.cmd.server.app:app &
+    uv run python tools/load_signin_storm.py http://localhost:8000
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+import httpx
+
+READERS = 8
+SIGNERS = 32
+DURATION = 10.0
+PASSWORD = "storm-password"
+CSRF_COOKIE = "csrftoken"
+"""`csrf.cookie_name` of the server"""
+
+
+async def csrf(client: httpx.AsyncClient):
+    """Send the CSRF token of the server along with every unsafe request, no-op when CSRF protection is off"""
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 200, response.text
+    token = client.cookies.get(CSRF_COOKIE)
+    if token is not None:
+        client.headers["x-csrftoken"] = token
+
+
+async def sign_up(client: httpx.AsyncClient) -> tuple[str, str]:
+    email = f"storm-{uuid4().hex[:12]}@example.com"
+    response = await client.post(
+        "/api/v1/user/sign-up",
+        json={"email": email, "name": "storm", "password": PASSWORD},
+    )
+    assert response.status_code == 201, response.text
+    return email, response.headers["authorization"]
+
+
+async def read(client: httpx.AsyncClient, authorization: str, until: float) -> list[float]:
+    latencies: list[float] = []
+    while time.perf_counter() < until:
+        started = time.perf_counter()
+        response = await client.get(
+            "/api/v1/camping",
+            params={"group": "all"},
+            headers={"Authorization": authorization},
+        )
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+
+    return latencies
+
+
+async def sign_in(client: httpx.AsyncClient, email: str, until: float) -> tuple[int, int]:
+    ok = rejected = 0
+    while time.perf_counter() < until:
+        response = await client.post("/api/v1/user/sign-in", json={"email": email, "password": PASSWORD})
+        if response.status_code == 503:
+            rejected += 1
+            continue
+
+        assert response.status_code == 201, response.text
+        ok += 1
+
+    return ok, rejected
+
+
+async def phase(client: httpx.AsyncClient, authorization: str, email: str, *, storm: bool) -> None:
+    until = time.perf_counter() + DURATION
+    readers = [read(client, authorization, until) for _ in range(READERS)]
+    signers = [sign_in(client, email, until) for _ in range(SIGNERS if storm else 0)]
+    results = await asyncio.gather(asyncio.gather(*readers), asyncio.gather(*signers))
+
+    latencies = sorted(latency for reader in results[0] for latency in reader)
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    ok = sum(ok for ok, _ in results[1])
+    rejected = sum(rejected for _, rejected in results[1])
+    name = "storm" if storm else "quiet"
+    print(f"{name:>6} {len(latencies):>8} {p50:>10.1f} {p99:>10.1f} {ok / DURATION:>12.1f} {rejected:>9}")
+
+
+async def main():
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
+    limits = httpx.Limits(max_connections=READERS + SIGNERS)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await csrf(client)
+        email, authorization = await sign_up(client)
+
+        print(f"{READERS} camping readers, {SIGNERS} sign-in clients, {DURATION:.0f}s per phase")
+        print(f"{'phase':>6} {'reads':>8} {'p50, ms':>10} {'p99, ms':>10} {'sign-ins/s':>12} {'rejected':>9}")
+        await phase(client, authorization, email, storm=False)
+        await phase(client, authorization, email, storm=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
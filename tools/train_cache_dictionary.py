@@ -0,0 +1,76 @@
+"""Train a zstd dictionary for cache compression on values currently stored in redis.
+
+Values are sampled from every node in `redis.dsn`. Point `cache.compression.dictionary` at the output file
+afterwards. Frames carry the id of their dictionary, so keep the previous file loadable (or let those values
+expire) when replacing it.
+Importing backcat loads the server config, so run it with the same config.toml / BACKCAT_* env as the server:
+
+    uv run python tools/train_cache_dictionary.py camping area --output cache.zdict
+"""
+
+import argparse
+import asyncio
+from collections.abc import ByteString
+from pathlib import Path
+
+import zstandard
+
+from backcat.cmd.server.app import config
+from backcat.services.cache import codec, compression, core
+
+
+async def collect(keyspaces: list[str], limit: int) -> list[ByteString]:
+    samples: list[ByteString] = []
+    for dsn in config.redis.dsns:
+        redis = core.connect(config.redis, dsn)
+        try:
+            for ks in keyspaces:
+                async for key in redis.scan_iter(match=f"{ks}:*", count=1000):
+                    data = await redis.get(key)
+                    if data is None or codec.is_tombstone(data):
+                        continue
+
+                    envelope = codec.Envelope.unpack(data)
+                    payload = envelope.payload
+                    if envelope.flags & codec.Envelope.FLAG_COMPRESSED:
+                        payload = compression.decompress(payload)
+                    samples.append(payload)
+
+                    if len(samples) >= limit:
+                        return samples
+        finally:
+            await redis.aclose()
+
+    return samples
+
+
+def total_size(samples: list[ByteString], compressor: zstandard.ZstdCompressor) -> int:
+    return sum(len(compressor.compress(sample)) for sample in samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("keyspaces", nargs="+", help="keyspaces to sample values from")
+    parser.add_argument("--output", type=Path, required=True, help="where to write the dictionary")
+    parser.add_argument("--size", type=int, default=112_640, help="dictionary size in bytes")
+    parser.add_argument("--limit", type=int, default=10_000, help="maximum number of sampled values")
+    parser.add_argument("--level", type=int, default=config.cache.compression.level, help="zstd compression level")
+    args = parser.parse_args()
+
+    samples = asyncio.run(collect(args.keyspaces, args.limit))
+    if len(samples) == 0:
+        raise SystemExit("no values found, warm the cache up first")
+
+    dictionary = zstandard.train_dictionary(args.size, samples, level=args.level)
+    args.output.write_bytes(dictionary.as_bytes())
+
+    raw = sum(len(sample) for sample in samples)
+    plain = total_size(samples, zstandard.ZstdCompressor(level=args.level))
+    trained = total_size(samples, zstandard.ZstdCompressor(level=args.level, dict_data=dictionary))
+    print(f"dictionary {dictionary.dict_id()} trained on {len(samples)} values, written to {args.output}")
+    print(f"{'raw':>12} {'zstd':>12} {'zstd+dict':>12}")
+    print(f"{raw:>12} {plain:>12} {trained:>12}")
+
+
+if __name__ == "__main__":
+    main()